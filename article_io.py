@@ -0,0 +1,225 @@
+"""
+Reading and writing scraped article files.
+The scraper can write newline-delimited JSON: one article object per line,
+framed by a header and a footer line carrying run metadata (marked with a
+"_meta" key). Files are append-only, optionally gzip-compressed (each run
+appends a new gzip member), and can be read article by article while they
+are still being written. iter_articles() reads the latest complete run by
+default, and also reads the legacy single-document JSON files, so consumers
+don't need to care which format they get. Articles are read and written as
+article_schema.Article records.
+"""
+
+import gzip
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from article_schema import Article
+
+# Scraper output files, most preferred first
+ARTICLE_FILE_NAMES = ("scraped_articles.ndjson.gz", "scraped_articles.ndjson", "scraped_articles.json")
+
+# Marker key for header/footer lines, and how those lines start
+META_KEY = "_meta"
+META_PREFIX = '{"%s": ' % META_KEY
+
+# Which runs of an NDJSON file iter_articles() reads
+LATEST_RUN = "latest"
+ALL_RUNS = "all"
+
+# How often follow mode polls a file that is still being written (seconds)
+FOLLOW_POLL_INTERVAL = 0.5
+
+
+def latest_articles_file(directory: Path) -> Path:
+    """
+    Most recently written scraper output in a directory.
+
+    Falls back to scraped_articles.json when none exist yet.
+    """
+    candidates = [Path(directory) / name for name in ARTICLE_FILE_NAMES]
+    existing = [path for path in candidates if path.exists()]
+    if not existing:
+        return candidates[-1]
+    return max(existing, key=lambda path: path.stat().st_mtime)
+
+
+def _open_text(path: Path, mode: str):
+    """Open a plain or gzip-compressed file in text mode."""
+    if path.suffix == '.gz':
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+class NdjsonWriter:
+    """
+    Append-only NDJSON article writer.
+
+    Usage:
+        with NdjsonWriter(path, metadata={"feeds_scraped": 50}) as writer:
+            for article in articles:
+                writer.write(article)
+            writer.footer["category_counts"] = counts
+    """
+
+    def __init__(self, path: Path, metadata: dict | None = None):
+        self.path = Path(path)
+        self.metadata = metadata or {}
+        self.footer = {}
+        self.count = 0
+        self._file = None
+
+    def __enter__(self) -> 'NdjsonWriter':
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = _open_text(self.path, 'a')
+        self._write_line({META_KEY: "header", "started_at": datetime.now().isoformat(), **self.metadata})
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        footer = {
+            META_KEY: "footer",
+            "finished_at": datetime.now().isoformat(),
+            "total_articles": self.count,
+            "complete": exc_type is None,
+            **self.footer,
+        }
+        self._write_line(footer)
+        self._file.close()
+        return False
+
+    def _write_line(self, record: dict):
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self._file.write('\n')
+
+    def write(self, article: Article):
+        """Append one article."""
+        self._write_line(article.to_dict())
+        self.count += 1
+
+    def write_many(self, articles: Iterable[Article]) -> int:
+        """Append articles and flush so readers see them. Returns the count written."""
+        written = 0
+        for article in articles:
+            self.write(article)
+            written += 1
+        self._file.flush()
+        return written
+
+
+def write_articles_json(path: Path, articles: list[Article], metadata: dict | None = None):
+    """Write articles as a single JSON document: {**metadata, "articles": [...]}."""
+    output = {**(metadata or {}), "articles": [article.to_dict() for article in articles]}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2, ensure_ascii=False)
+
+
+def _iter_ndjson(lines: Iterator[str], one_run: bool = False) -> Iterator[Article]:
+    """Articles from NDJSON lines, skipping header/footer lines (or stopping at a footer)."""
+    from_dict = Article.from_dict
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if META_KEY not in record:
+            yield from_dict(record)
+        elif one_run and record[META_KEY] == "footer":
+            return
+
+
+def _run_starts(f) -> tuple[int | None, int | None]:
+    """
+    Line numbers of the header of the latest complete run, and of the last
+    run started, in an NDJSON file (None where there is no such run).
+    """
+    started = complete = None
+    for number, line in enumerate(f):
+        # A footer still being written has no newline yet
+        if not line.startswith(META_PREFIX) or not line.endswith('\n'):
+            continue
+        record = json.loads(line)
+        if record[META_KEY] == "header":
+            started = number
+        elif record.get("complete") and started is not None:
+            complete = started
+    return complete, started
+
+
+def _follow_lines(f) -> Iterator[str]:
+    """
+    Lines from a file that is still being written. Stops at end of file
+    once the last complete line read was a footer.
+    """
+    partial = ''
+    after_footer = False
+    while True:
+        line = f.readline()
+        if not line:
+            if after_footer:
+                return
+            time.sleep(FOLLOW_POLL_INTERVAL)
+            continue
+        partial += line
+        if not partial.endswith('\n'):
+            continue
+        line, partial = partial, ''
+        after_footer = line.startswith(META_PREFIX) and f'"{META_KEY}": "footer"' in line
+        yield line
+
+
+def iter_articles(path: Path, run: str = LATEST_RUN, follow: bool = False) -> Iterator[Article]:
+    """
+    Stream articles from a scraper output file.
+
+    Handles NDJSON (plain or .gz) and the legacy JSON formats: a
+    {"articles": [...]} document or a bare list. NDJSON files hold one run
+    after another; by default only the latest run whose footer marks it
+    complete is read (the last run started, if none has completed).
+
+    Args:
+        path: Output file to read
+        run: LATEST_RUN, or ALL_RUNS for every run in the file
+        follow: For an uncompressed NDJSON file still being written, read
+            the run in progress (or every run, with ALL_RUNS) and keep
+            waiting for new lines until its footer is written
+
+    Yields:
+        Article records, in file order
+    """
+    if run not in (LATEST_RUN, ALL_RUNS):
+        raise ValueError(f"run must be {LATEST_RUN!r} or {ALL_RUNS!r}, not {run!r}")
+    path = Path(path)
+    follow = follow and path.suffix != '.gz'
+    with _open_text(path, 'r') as f:
+        first = f.readline()
+        if not first.strip():
+            return
+        try:
+            record = json.loads(first)
+        except ValueError:
+            record = None
+
+        # Legacy JSON: a pretty-printed document, or a single-line one
+        if not isinstance(record, dict) or (META_KEY not in record and 'articles' in record):
+            f.seek(0)
+            data = json.load(f)
+            records = data.get('articles', []) if isinstance(data, dict) else data
+            yield from map(Article.from_dict, records)
+            return
+
+        if run == ALL_RUNS:
+            if META_KEY not in record:
+                yield Article.from_dict(record)
+            yield from _iter_ndjson(_follow_lines(f) if follow else f)
+            return
+
+        # A first pass finds where the run starts; the second reads it
+        f.seek(0)
+        complete, started = _run_starts(f)
+        start = started if follow or complete is None else complete
+        f.seek(0)
+        for _ in range(start or 0):
+            f.readline()
+        yield from _iter_ndjson(_follow_lines(f) if follow else f, one_run=True)
@@ -0,0 +1,67 @@
+"""
+Article record shared by the scrapers and every script that reads their output.
+scrape_rss.py and scrape_news.py historically wrote different field names
+(link/image/description/source vs url/image_url/summary/source_name);
+Article.from_dict() accepts either, so older files and caches still load.
+"""
+
+from dataclasses import dataclass, field, fields
+
+# Field names used by scrape_news.py output, mapped to Article fields
+FIELD_ALIASES = {
+    "url": "link",
+    "image_url": "image",
+    "summary": "description",
+    "source_name": "source",
+    "published_at": "published",
+    "created_at": "scraped_at",
+}
+
+
+@dataclass(slots=True)
+class Article:
+    """One scraped article."""
+
+    title: str
+    link: str = ""
+    source: str = ""
+    category: str | None = None
+    image: str | None = None
+    description: str = ""
+    content: str = ""
+    author: str | None = None
+    published: str | None = None
+    scraped_at: str | None = None
+    # {"source", "title", "link"} of near-duplicates merged into this article
+    alternate_sources: list[dict] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Article':
+        """
+        Build an Article from either output shape.
+
+        Canonical names win over aliases; unknown keys (e.g. "status") are
+        dropped. A null description or content (written by older scrapers)
+        loads as "".
+        """
+        values = {}
+        for key, value in data.items():
+            name = FIELD_ALIASES.get(key, key)
+            if name in FIELD_NAMES and (name == key or name not in values):
+                values[name] = value
+        values.setdefault('title', '')
+        for name in ('description', 'content'):
+            if values.get(name, '') is None:
+                values[name] = ''
+        return cls(**values)
+
+    def to_dict(self) -> dict:
+        """Serializable dictionary; alternate_sources only when present."""
+        data = {name: getattr(self, name) for name in SCALAR_FIELD_NAMES}
+        if self.alternate_sources:
+            data['alternate_sources'] = self.alternate_sources
+        return data
+
+
+FIELD_NAMES = frozenset(f.name for f in fields(Article))
+SCALAR_FIELD_NAMES = tuple(f.name for f in fields(Article) if f.name != 'alternate_sources')
@@ -0,0 +1,149 @@
+"""
+Content-mix balancer.
+Python counterpart of the scrape-news edge function's balancer.ts. Given a
+target article count, each category gets a quota from the target ratios.
+While feeds are fetched, the next feed comes from the category furthest
+below its fetch goal, and a category stops fetching once it has collected
+enough. The final output is then trimmed to the quotas.
+"""
+
+from collections import Counter, defaultdict
+
+# Target mix from the FEEDS comments in scrape_rss.py (normalized; they add up to 110)
+TARGET_RATIOS = {
+    'tech': 68,
+    'finance': 16,
+    'video_games': 10,
+    'politics': 8,
+    'climate': 8,
+}
+
+# Articles a category collects before it stops fetching, as a multiple of its
+# quota: deduplication, classification and the seen index all drop some later
+FETCH_HEADROOM = 2.0
+
+# Expected articles per feed until real yields are known
+DEFAULT_FEED_YIELD = 20
+
+
+def normalize_ratios(weights: dict[str, float]) -> dict[str, float]:
+    """Scale weights so they add up to 1."""
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("target ratios must add up to more than zero")
+    return {category: weight / total for category, weight in weights.items()}
+
+
+def allocate(total: int, ratios: dict[str, float]) -> dict[str, int]:
+    """
+    Split a total across categories by ratio (largest remainder), so the
+    quotas add up to exactly the total.
+    """
+    exact = {category: total * ratio for category, ratio in ratios.items()}
+    quotas = {category: int(share) for category, share in exact.items()}
+    leftover = total - sum(quotas.values())
+    by_remainder = sorted(exact, key=lambda category: exact[category] - quotas[category], reverse=True)
+    for category in by_remainder[:leftover]:
+        quotas[category] += 1
+    return quotas
+
+
+class QuotaBalancer:
+    """Per-category quotas for one run, with fetch scheduling and output trimming."""
+
+    def __init__(self, target: int, ratios: dict[str, float] = TARGET_RATIOS,
+                 headroom: float = FETCH_HEADROOM):
+        """
+        Args:
+            target: Articles wanted in the output
+            ratios: Category weights (normalized here)
+            headroom: Fetch goal as a multiple of each quota
+        """
+        self.ratios = normalize_ratios(ratios)
+        self.quotas = allocate(target, self.ratios)
+        self.goals = {category: quota * headroom for category, quota in self.quotas.items()}
+        self.fetched = Counter()
+        self.in_flight = Counter()
+        self.feeds_done = 0
+        self.articles_done = 0
+
+    def expected_yield(self) -> float:
+        """Mean articles per completed feed (a default before any complete)."""
+        if not self.feeds_done:
+            return DEFAULT_FEED_YIELD
+        return self.articles_done / self.feeds_done
+
+    def deficit(self, category: str) -> float:
+        """
+        Share of a category's fetch goal still missing, counting feeds in
+        flight at the expected yield. Categories without a quota are never
+        short.
+        """
+        goal = self.goals.get(category)
+        if not goal:
+            return 0.0
+        projected = self.fetched[category] + self.in_flight[category] * self.expected_yield()
+        return 1.0 - projected / goal
+
+    def next_feed(self, pending: list) -> int | None:
+        """
+        Index into pending (name, url, category) feeds of the one to fetch
+        next: the first feed of the category with the largest deficit.
+
+        Returns:
+            An index, or None if no category is short (in-flight feeds may
+            still change that when they complete)
+        """
+        best = None
+        best_deficit = 0.0
+        for index, (_, _, category) in enumerate(pending):
+            deficit = self.deficit(category)
+            if deficit > best_deficit:
+                best, best_deficit = index, deficit
+        return best
+
+    def started(self, category: str):
+        self.in_flight[category] += 1
+
+    def finished(self, category: str, count: int):
+        """Record a completed feed and the number of articles it produced."""
+        self.in_flight[category] -= 1
+        self.fetched[category] += count
+        self.feeds_done += 1
+        self.articles_done += count
+
+    def trim(self, articles: list) -> tuple[list, list]:
+        """
+        Cut articles down to the category quotas.
+
+        Within a category, articles are taken round-robin across sources (each
+        source's first article, then each one's second, ...) so a single busy
+        feed can't fill the quota. Categories short of their quota keep
+        everything; articles in categories without a quota are dropped.
+
+        Returns:
+            (kept articles in their original order, dropped articles)
+        """
+        ranks = {}
+        positions = defaultdict(int)
+        for index, article in enumerate(articles):
+            source_key = (article.category, article.source)
+            ranks[index] = (positions[source_key], index)
+            positions[source_key] += 1
+
+        taken = Counter()
+        keep = set()
+        for index in sorted(ranks, key=ranks.get):
+            category = articles[index].category
+            if taken[category] < self.quotas.get(category, 0):
+                taken[category] += 1
+                keep.add(index)
+
+        kept = [article for index, article in enumerate(articles) if index in keep]
+        dropped = [article for index, article in enumerate(articles) if index not in keep]
+        return kept, dropped
+
+    def summary(self) -> str:
+        """One-line report of quotas and articles fetched per category."""
+        return ", ".join(f"{category} {quota} (fetched {self.fetched[category]})"
+                         for category, quota in self.quotas.items())
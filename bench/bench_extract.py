@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: single-pass extract_fields() vs the per-field extract_* functions it replaced.
+Runs both over every item in bench/fixtures/*.xml, checks they agree, and
+reports microseconds per item.
+
+Usage: python bench/bench_extract.py [--repeat N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from xml.etree import ElementTree
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import scrape_rss  # noqa: E402
+from text_utils import find_image_src, html_to_text  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+# The per-field functions scrape_rss used before extract_fields(), kept here
+# as the comparison baseline
+
+def extract_image_url(entry: ElementTree.Element) -> str | None:
+    """
+    Extract featured image URL from RSS entry using multiple methods.
+
+    Priority:
+    1. media:content tag (Media RSS)
+    2. media:thumbnail tag
+    3. enclosure with image type
+    4. img tag in description HTML
+    """
+
+    # Method 1: <media:content> tag
+    media_content = entry.find('.//{http://search.yahoo.com/mrss/}content')
+    if media_content is not None:
+        url = media_content.get('url')
+        medium = media_content.get('medium', '')
+        mime_type = media_content.get('type', '')
+        if url and (medium == 'image' or 'image' in mime_type or not medium):
+            return url
+
+    # Method 2: <media:thumbnail> tag
+    media_thumb = entry.find('.//{http://search.yahoo.com/mrss/}thumbnail')
+    if media_thumb is not None:
+        url = media_thumb.get('url')
+        if url:
+            return url
+
+    # Method 3: <enclosure> with image type
+    enclosure = entry.find('enclosure')
+    if enclosure is not None:
+        url = enclosure.get('url')
+        mime_type = enclosure.get('type', '')
+        if url and 'image' in mime_type.lower():
+            return url
+
+    # Method 4: Look in description for <img> tag
+    # Try different description element names
+    for desc_tag in ['description', 'summary', '{http://purl.org/rss/1.0/modules/content/}encoded']:
+        desc_elem = entry.find(desc_tag)
+        if desc_elem is not None and desc_elem.text:
+            # Extract first img src
+            src = find_image_src(desc_elem.text)
+            if src:
+                return src
+
+    # Method 5: Check for image in content:encoded
+    content_encoded = entry.find('.//{http://purl.org/rss/1.0/modules/content/}encoded')
+    if content_encoded is not None and content_encoded.text:
+        src = find_image_src(content_encoded.text)
+        if src:
+            return src
+
+    return None
+
+
+def extract_link(entry: ElementTree.Element) -> str | None:
+    """Extract article link from RSS entry."""
+    # Standard RSS <link> tag
+    link = entry.find('link')
+    if link is not None:
+        if link.text:
+            return link.text.strip()
+        # Atom-style link with href attribute
+        href = link.get('href')
+        if href:
+            return href.strip()
+
+    # Atom feed link with rel="alternate"
+    for link_elem in entry.findall('{http://www.w3.org/2005/Atom}link'):
+        rel = link_elem.get('rel', 'alternate')
+        if rel == 'alternate':
+            href = link_elem.get('href')
+            if href:
+                return href.strip()
+
+    # guid as fallback (sometimes it's the URL)
+    guid = entry.find('guid')
+    if guid is not None and guid.text and guid.text.startswith('http'):
+        return guid.text.strip()
+
+    return None
+
+
+def extract_description(entry: ElementTree.Element) -> str | None:
+    """Extract description/summary from RSS entry."""
+    # Try different description element names
+    for desc_tag in ['description', 'summary', '{http://www.w3.org/2005/Atom}summary', 
+                     '{http://www.w3.org/2005/Atom}content']:
+        desc_elem = entry.find(desc_tag)
+        if desc_elem is not None and desc_elem.text:
+            # Convert HTML to clean text, stopping at 1000 chars
+            text = html_to_text(desc_elem.text, limit=scrape_rss.DESCRIPTION_LIMIT)
+            if text:
+                return text
+
+    return None
+
+
+def extract_published_date(entry: ElementTree.Element) -> str | None:
+    """Extract publication date from RSS entry."""
+    for date_tag in ['pubDate', 'published', '{http://www.w3.org/2005/Atom}published', 
+                     '{http://www.w3.org/2005/Atom}updated', '{http://purl.org/dc/elements/1.1/}date']:
+        date_elem = entry.find(date_tag)
+        if date_elem is not None and date_elem.text:
+            return date_elem.text.strip()
+
+    return None
+
+
+def extract_author(entry: ElementTree.Element) -> str | None:
+    """Extract author from RSS entry."""
+    # Standard author tag
+    author = entry.find('author')
+    if author is not None:
+        if author.text:
+            return author.text.strip()
+        # Atom-style with nested name
+        name = author.find('{http://www.w3.org/2005/Atom}name')
+        if name is not None and name.text:
+            return name.text.strip()
+
+    # dc:creator
+    creator = entry.find('{http://purl.org/dc/elements/1.1/}creator')
+    if creator is not None and creator.text:
+        return creator.text.strip()
+
+    return None
+
+
+def extract_separately(entry: ElementTree.Element) -> dict:
+    """Field extraction the way fetch_feed did it before extract_fields()."""
+    title_elem = entry.find('title')
+    if title_elem is None:
+        title_elem = entry.find('{http://www.w3.org/2005/Atom}title')
+    return {
+        "title": title_elem.text.strip() if title_elem is not None and title_elem.text else None,
+        "link": extract_link(entry),
+        "image": extract_image_url(entry),
+        "description": extract_description(entry),
+        "author": extract_author(entry),
+        "published": extract_published_date(entry),
+    }
+
+
+def load_items(path: Path) -> list[ElementTree.Element]:
+    """Parse a fixture and return its item/entry elements."""
+    root = ElementTree.parse(path).getroot()
+    return [elem for elem in root.iter() if elem.tag in scrape_rss.ITEM_TAGS]
+
+
+def time_per_item(funcs: list, items: list[ElementTree.Element], repeat: int, rounds: int = 7) -> list[float]:
+    """
+    Best-of-rounds microseconds per item for each function over items.
+    The functions take turns within each round, so a slow patch on the
+    machine hits all of them rather than one.
+    """
+    best = [float('inf')] * len(funcs)
+    for _ in range(rounds):
+        for index, func in enumerate(funcs):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                for item in items:
+                    func(item)
+            best[index] = min(best[index], time.perf_counter() - start)
+    return [seconds / (repeat * len(items)) * 1e6 for seconds in best]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=100, help="Passes over each fixture per round")
+    args = parser.parse_args(argv)
+
+    print(f"{'fixture':<18} {'items':>5} {'separate us':>12} {'single us':>10} {'speedup':>8}")
+    mismatches = 0
+    for path in sorted(FIXTURES_DIR.glob("*.xml")):
+        items = load_items(path)
+        for item in items:
+            if extract_separately(item) != scrape_rss.extract_fields(item):
+                mismatches += 1
+
+        separate, single = time_per_item([extract_separately, scrape_rss.extract_fields], items, args.repeat)
+        print(f"{path.stem:<18} {len(items):>5} {separate:>12.2f} {single:>10.2f} {separate / single:>7.2f}x")
+
+    if mismatches:
+        print(f"\nMISMATCH: {mismatches} items differ between implementations")
+        return 1
+    print("\nAll items match.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
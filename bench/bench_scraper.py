@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: the scraper hot paths over recorded feeds.
+Serves bench/fixtures/*.xml (Media RSS, Atom, feedburner and Google News
+styles) from a local HTTP stand-in and times fetch_feed parsing per feed
+style, normalize_title, deduplicate and a full scrape_rss run. Each case
+runs in its own process so its peak RSS is its own. Results are compared
+with bench/baseline.json.
+
+Usage: python bench/bench_scraper.py [--case NAME ...] [--save-baseline] [--tolerance PCT]
+"""
+
+import argparse
+import contextlib
+import http.server
+import io
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import scrape_rss  # noqa: E402
+from feed_parsers import AVAILABLE_PARSERS, FEEDPARSER, parse_with_feedparser  # noqa: E402
+from text_utils import normalize_title  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+BASELINE_FILE = Path(__file__).parent / "baseline.json"
+
+# Feed style of each fixture, and the category it is served under in the full run
+FIXTURE_STYLES = {
+    "media_rss": "tech",
+    "atom": "tech",
+    "feedburner": "video_games",
+    "google_news": "tech",
+}
+
+# Slowdown (percent) beyond which a case counts as a regression
+DEFAULT_TOLERANCE = 15.0
+
+
+class FixtureHandler(http.server.BaseHTTPRequestHandler):
+    """Serves any path ending in <fixture>.xml; the rest of the path only makes URLs distinct."""
+
+    protocol_version = "HTTP/1.1"
+    # Send the body without waiting for the headers' ACK (like real servers):
+    # with Nagle on, a kept-alive connection stalls on the client's delayed ACK
+    disable_nagle_algorithm = True
+    bodies = {path.name: path.read_bytes() for path in FIXTURES_DIR.glob("*.xml")}
+
+    def do_GET(self):
+        body = self.bodies.get(self.path.rsplit('/', 1)[-1])
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@contextlib.contextmanager
+def fixture_server():
+    """Run the stand-in server on a free local port; yields its base URL."""
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def corpus_articles() -> list:
+    """Every article in the fixtures, parsed the way fetch_feed does."""
+    articles = []
+    for path in sorted(FIXTURES_DIR.glob("*.xml")):
+        category = FIXTURE_STYLES.get(path.stem, "tech")
+        for item in scrape_rss.iter_feed_items([path.read_bytes()]):
+            article = scrape_rss.parse_item(item, path.stem, category)
+            if article is not None:
+                articles.append(article)
+    return articles
+
+
+def best_of(func, rounds: int) -> float:
+    """Fastest of several timed calls, in seconds."""
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def case_fetch(style: str, repeat: int) -> dict:
+    """fetch_feed over HTTP for one feed style: request, stream and parse."""
+    with fixture_server() as base:
+        url = f"{base}/{style}.xml"
+        items = len(scrape_rss.fetch_feed(style, url, "tech"))
+
+        def run():
+            for _ in range(repeat):
+                scrape_rss.fetch_feed(style, url, "tech")
+
+        seconds = best_of(run, 3)
+    return {"items_per_sec": items * repeat / seconds, "seconds": seconds}
+
+
+def case_parse(parser: str, repeat: int) -> dict:
+    """One parser backend over every fixture body, without HTTP (feed_parsers.PARSER_ORDER follows this)."""
+    bodies = {path.stem: path.read_bytes() for path in sorted(FIXTURES_DIR.glob("*.xml"))}
+
+    def parse(name: str, body: bytes) -> int:
+        if parser == FEEDPARSER:
+            return parse_with_feedparser(body, name, "tech", scrape_rss.DESCRIPTION_LIMIT)[1]
+        count = 0
+        for item in scrape_rss.iter_feed_items([body]):
+            scrape_rss.parse_item(item, name, "tech")
+            count += 1
+        return count
+
+    items = sum(parse(name, body) for name, body in bodies.items())
+
+    def run():
+        for _ in range(repeat):
+            for name, body in bodies.items():
+                parse(name, body)
+
+    seconds = best_of(run, 3)
+    return {"items_per_sec": items * repeat / seconds, "seconds": seconds}
+
+
+def case_normalize_title(repeat: int) -> dict:
+    titles = [article.title for article in corpus_articles()]
+
+    def run():
+        for _ in range(repeat):
+            for title in titles:
+                normalize_title(title)
+
+    seconds = best_of(run, 3)
+    return {"items_per_sec": len(titles) * repeat / seconds, "seconds": seconds}
+
+
+def case_deduplicate(repeat: int, near_duplicates: bool) -> dict:
+    """deduplicate over the corpus copied repeat times (every copy after the first is a duplicate)."""
+    articles = corpus_articles() * repeat
+    seconds = best_of(lambda: scrape_rss.deduplicate(articles, near_duplicates=near_duplicates), 3)
+    return {"items_per_sec": len(articles) / seconds, "seconds": seconds}
+
+
+def case_full_run(feeds_per_style: int) -> dict:
+    """scrape_rss.main() end to end against the stand-in, feeds_per_style copies of each fixture."""
+    with fixture_server() as base, tempfile.TemporaryDirectory() as tmp:
+        scrape_rss.ALL_FEEDS[:] = [
+            (f"{style} {copy}", f"{base}/{copy}/{style}.xml", category)
+            for copy in range(feeds_per_style) for style, category in FIXTURE_STYLES.items()
+        ]
+        scrape_rss.PARSER_CHOICES_FILE = Path(tmp, "feed_parsers.json")
+        argv = ["--no-cache", "--output", f"{tmp}/out.json", "--metrics-dir", tmp]
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            scrape_rss.main(argv)
+        seconds = time.perf_counter() - started
+        report = json.loads(Path(tmp, "scrape_rss.json").read_text())
+    items = sum(feed["items"] for feed in report["feeds"])
+    return {"items_per_sec": items / seconds, "seconds": seconds}
+
+
+# name -> (function, arguments)
+CASES = {
+    **{f"fetch_{style}": (case_fetch, (style, 20)) for style in FIXTURE_STYLES},
+    **{f"parse_{parser}": (case_parse, (parser, 20 if parser == FEEDPARSER else 200))
+       for parser in AVAILABLE_PARSERS},
+    "normalize_title": (case_normalize_title, (200,)),
+    "deduplicate": (case_deduplicate, (50, False)),
+    "deduplicate_near": (case_deduplicate, (50, True)),
+    "full_run": (case_full_run, (10,)),
+}
+
+
+def run_case(name: str) -> dict:
+    """Run one case in this process and add its peak RSS."""
+    func, case_args = CASES[name]
+    result = func(*case_args)
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 1024 / 1024
+    return result
+
+
+def run_isolated(name: str) -> dict:
+    """Run one case in a fresh interpreter."""
+    output = subprocess.run([sys.executable, __file__, "--run-case", name],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def compare(name: str, result: dict, baseline: dict | None, tolerance: float) -> bool:
+    """Print one result row against the baseline. Returns True if it regressed."""
+    row = (f"{name:<20} {result['items_per_sec']:>12,.0f} {result['seconds'] * 1000:>10.1f} "
+           f"{result['peak_rss_mb']:>8.1f}")
+    if baseline is None:
+        print(row)
+        return False
+    change = (result['items_per_sec'] / baseline['items_per_sec'] - 1) * 100
+    regressed = change < -tolerance
+    print(f"{row} {baseline['items_per_sec']:>12,.0f} {change:>+7.1f}%{'  REGRESSION' if regressed else ''}")
+    return regressed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--case", action="append", choices=sorted(CASES),
+                        help="Run only this case (repeatable; default: all)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help=f"Store these results as the baseline ({BASELINE_FILE.name})")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Throughput drop (%%) that counts as a regression (default: {DEFAULT_TOLERANCE:g})")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_case:
+        print(json.dumps(run_case(args.run_case)))
+        return 0
+
+    try:
+        baseline = json.loads(BASELINE_FILE.read_text())
+    except (OSError, ValueError):
+        baseline = None
+    if baseline and not args.save_baseline:
+        print(f"Baseline: {baseline['recorded_at']} on {baseline['machine']}\n")
+
+    header = f"{'case':<20} {'items/s':>12} {'ms':>10} {'peak MB':>8}"
+    if baseline and not args.save_baseline:
+        header += f" {'baseline/s':>12} {'change':>8}"
+    print(header)
+
+    results = {}
+    regressions = 0
+    for name in args.case or CASES:
+        results[name] = run_isolated(name)
+        previous = baseline['cases'].get(name) if baseline and not args.save_baseline else None
+        regressions += compare(name, results[name], previous, args.tolerance)
+
+    if args.save_baseline:
+        cases = {**(baseline or {}).get('cases', {}), **results}
+        BASELINE_FILE.write_text(json.dumps({
+            "recorded_at": time.strftime("%Y-%m-%d %H:%M"),
+            "machine": f"{platform.python_implementation()} {platform.python_version()}, "
+                       f"{platform.machine()}, {platform.system()}",
+            "cases": cases,
+        }, indent=2) + '\n')
+        print(f"\nBaseline saved to {BASELINE_FILE}")
+        return 0
+
+    if regressions:
+        print(f"\n{regressions} case(s) slower than baseline by more than {args.tolerance:g}%")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
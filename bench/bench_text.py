@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: text_utils vs the inline regex code it replaced.
+Times normalize_title, <img> lookup and description cleanup over the titles
+and HTML bodies in bench/fixtures/*.xml.
+
+Usage: python bench/bench_text.py [--repeat N]
+"""
+
+import argparse
+import html
+import re
+import sys
+import time
+from pathlib import Path
+from xml.etree import ElementTree
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import text_utils  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+HTML_TAGS = {
+    'description',
+    'summary',
+    '{http://www.w3.org/2005/Atom}summary',
+    '{http://www.w3.org/2005/Atom}content',
+    '{http://purl.org/rss/1.0/modules/content/}encoded',
+}
+
+
+def inline_normalize_title(title: str) -> str:
+    """normalize_title as it was written in scrape_rss.py."""
+    if not title:
+        return ""
+    title = title.lower().strip()
+    title = re.sub(r'[^a-z0-9\s]', '', title)
+    title = re.sub(r'\s+', ' ', title)
+    return title.strip()
+
+
+def inline_find_image(markup: str) -> str | None:
+    """<img> lookup as it was written in both scrapers."""
+    img_match = re.search(r'<img[^>]+src=["\']([^"\']+)["\']', markup, re.IGNORECASE)
+    return img_match.group(1) if img_match else None
+
+
+def inline_description(markup: str) -> str:
+    """Description cleanup as it was written in extract_description()."""
+    return re.sub(r'<[^>]+>', '', markup).strip()[:1000]
+
+
+def inline_description_decoded(markup: str) -> str:
+    """The inline cleanup plus the entity decoding and whitespace collapse it lacked."""
+    return ' '.join(html.unescape(re.sub(r'<[^>]+>', '', markup)).split())[:1000]
+
+
+def load_corpus() -> tuple[list[str], list[str]]:
+    """Collect every title and HTML body from the fixtures."""
+    titles, bodies = [], []
+    for path in sorted(FIXTURES_DIR.glob("*.xml")):
+        for elem in ElementTree.parse(path).getroot().iter():
+            if not elem.text:
+                continue
+            tag = elem.tag if isinstance(elem.tag, str) else ''
+            if tag.endswith('title'):
+                titles.append(elem.text)
+            elif tag in HTML_TAGS:
+                bodies.append(elem.text)
+    return titles, bodies
+
+
+def time_per_call(func, inputs: list[str], repeat: int) -> float:
+    """Best-of-3 microseconds per call of func over inputs."""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for value in inputs:
+                func(value)
+        best = min(best, time.perf_counter() - start)
+    return best / (repeat * len(inputs)) * 1e6
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=100, help="Passes over the corpus")
+    args = parser.parse_args(argv)
+
+    titles, bodies = load_corpus()
+    long_bodies = [''.join(bodies[i:i + 20]) for i in range(0, len(bodies), 20)]
+    print(f"Corpus: {len(titles)} titles, {len(bodies)} HTML bodies, "
+          f"{len(long_bodies)} long bodies (~{sum(map(len, long_bodies)) // len(long_bodies)} chars)\n")
+
+    def to_text(markup: str) -> str:
+        return text_utils.html_to_text(markup, limit=1000)
+
+    cases = [
+        ("normalize_title", titles, inline_normalize_title, text_utils.normalize_title),
+        ("find_image_src", bodies, inline_find_image, text_utils.find_image_src),
+        ("strip[:1000]", bodies, inline_description, to_text),
+        ("strip+decode[:1000]", bodies, inline_description_decoded, to_text),
+        ("long strip[:1000]", long_bodies, inline_description, to_text),
+        ("long strip+decode", long_bodies, inline_description_decoded, to_text),
+    ]
+
+    print(f"{'case':<22} {'inline us':>10} {'text_utils us':>14} {'speedup':>8}")
+    for label, inputs, before, after in cases:
+        old = time_per_call(before, inputs, args.repeat)
+        new = time_per_call(after, inputs, args.repeat)
+        print(f"{label:<22} {old:>10.2f} {new:>14.2f} {old / new:>7.2f}x")
+
+    undecoded = sum(html.unescape(text) != text for text in map(inline_description, bodies))
+    print("\n'strip' is the old tag-only regex, kept for reference: it is cheaper because it")
+    print(f"does less, and left character references in {undecoded} of {len(bodies)} descriptions.")
+    print("'strip+decode' adds the entity decoding and whitespace collapse html_to_text()")
+    print("does, so its output is comparable; that is the row to compare.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,86 @@
-import json
+import argparse
+import sys
+import time
 from collections import defaultdict
+from pathlib import Path
 
-with open('scraped_articles.json') as f:
-    d = json.load(f)
-print(f'Total: {len(d)} articles')
-print(f'With images: {sum(1 for a in d if a.get("image_url"))}')
-print()
-
-# Stats by source
-stats = defaultdict(lambda: {'total': 0, 'with_img': 0})
-for a in d:
-    stats[a['source_name']]['total'] += 1
-    if a.get('image_url'):
-        stats[a['source_name']]['with_img'] += 1
-
-print('Images by source:')
-for src, s in sorted(stats.items()):
-    print(f'  {src}: {s["with_img"]}/{s["total"]}')
-
-print('\nAll articles:')
-for a in d:
-    img = a.get('image_url', '')[:50]
-    print(f'{a["source_name"]:18} | {img}')
+from article_io import iter_articles, latest_articles_file
+from image_cache import IMAGE_CACHE_DIR, ImageCache
+from image_probe import MAX_WORKERS, MIN_HEIGHT, MIN_WIDTH, PROBE_CACHE, ImageProbeCache, probe_images
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Report image coverage of scraped articles")
+    parser.add_argument("path", nargs="?", type=Path, default=None,
+                        help="Scraper output file (default: newest scraped_articles.*)")
+    parser.add_argument("--probe", action="store_true",
+                        help="Fetch the start of every image to find broken or tiny ones")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS,
+                        help=f"Concurrent probes (default: {MAX_WORKERS})")
+    parser.add_argument("--min-width", type=int, default=MIN_WIDTH,
+                        help=f"Flag images narrower than this (default: {MIN_WIDTH})")
+    parser.add_argument("--min-height", type=int, default=MIN_HEIGHT,
+                        help=f"Flag images shorter than this (default: {MIN_HEIGHT})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Probe every URL even if a recent result is cached")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    path = args.path or latest_articles_file(Path('.'))
+
+    # Stats by source, collected in one streaming pass
+    stats = defaultdict(lambda: {'total': 0, 'with_img': 0})
+    rows = []
+    for a in iter_articles(path):
+        stats[a.source]['total'] += 1
+        if a.image:
+            stats[a.source]['with_img'] += 1
+        rows.append((a.source, a.title, a.image or ''))
+
+    print(f'Total: {len(rows)} articles')
+    print(f'With images: {sum(s["with_img"] for s in stats.values())}')
+    print()
+
+    print('Images by source:')
+    for src, s in sorted(stats.items()):
+        print(f'  {src}: {s["with_img"]}/{s["total"]}')
+
+    print('\nAll articles:')
+    for src, _, img in rows:
+        print(f'{src:18} | {img[:50]}')
+
+    if not args.probe:
+        return 0
+
+    cache = None if args.no_cache else ImageProbeCache(PROBE_CACHE)
+    started = time.monotonic()
+    image_cache = ImageCache(IMAGE_CACHE_DIR)
+    probes = probe_images((img for _, _, img in rows), cache=cache, image_cache=image_cache,
+                          max_workers=args.workers)
+    elapsed = time.monotonic() - started
+    if cache is not None:
+        cache.save()
+
+    problems = defaultdict(int)
+    print('\nBroken or small images:')
+    for src, title, img in rows:
+        if not img:
+            continue
+        problem = probes[img].problem(args.min_width, args.min_height)
+        if problem:
+            problems[src] += 1
+            print(f'  {src:18} | {title[:40]:40} | {problem}')
+
+    cached = f', {cache.hits} cached' if cache is not None else ''
+    print(f'\nProbed {len(probes)} image URLs in {elapsed:.1f}s{cached}')
+    print(f'Flagged: {sum(problems.values())}')
+    for src, count in sorted(problems.items()):
+        print(f'  {src}: {count}/{stats[src]["with_img"]}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
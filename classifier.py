@@ -0,0 +1,207 @@
+"""
+Keyword category classifier.
+Python port of the scrape-news edge function's classifier.ts, reading the same
+keyword lists from its config.ts. All keywords are compiled into a single
+Aho-Corasick automaton over word tokens, so an article's title and description
+are each scanned once however many keywords there are. Matching is on whole
+words ('ev' does not match "every"), title matches score 2 and description
+matches 1, and the best-scoring subcategory decides the category.
+"""
+
+import re
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+# Keyword lists shared with the edge function
+KEYWORDS_FILE = Path(__file__).parent / "supabase" / "functions" / "scrape-news" / "config.ts"
+
+# Points per keyword found in each field (presence, not count)
+TITLE_WEIGHT = 2
+DESCRIPTION_WEIGHT = 1
+
+# Matched terms reported per result
+MAX_MATCHED_TERMS = 10
+
+# Words: letters and digits, with '&' and '+' kept inside a word (s&p, m&a)
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+(?:[&+][a-z0-9]+)*')
+
+# config.ts structure: CATEGORY_KEYWORDS = { category: { subcategory: ['keyword', ...] } }
+KEYWORDS_BLOCK_PATTERN = re.compile(r'CATEGORY_KEYWORDS\b[^=]*=\s*\{(.*?)\n\};', re.DOTALL)
+KEYWORDS_ENTRY_PATTERN = re.compile(r"(\w+)\s*:\s*([{\[])|'((?:[^'\\]|\\.)*)'|([}\]])")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens of a text."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def load_category_keywords(path: Path = KEYWORDS_FILE) -> dict[str, dict[str, list[str]]]:
+    """
+    Read CATEGORY_KEYWORDS from the edge function's config.ts.
+
+    Returns:
+        {category: {subcategory: [keyword, ...]}}
+
+    Raises:
+        OSError: The file can't be read
+        ValueError: The file has no CATEGORY_KEYWORDS object
+    """
+    source = Path(path).read_text(encoding='utf-8')
+    block = KEYWORDS_BLOCK_PATTERN.search(source)
+    if block is None:
+        raise ValueError(f"CATEGORY_KEYWORDS not found in {path}")
+
+    keywords = {}
+    category = subcategory = None
+    for match in KEYWORDS_ENTRY_PATTERN.finditer(block.group(1)):
+        name, opener, keyword, closer = match.groups()
+        if opener == '{':
+            category = name
+            keywords[category] = {}
+        elif opener == '[':
+            subcategory = name
+            keywords[category][subcategory] = []
+        elif keyword is not None and subcategory is not None:
+            keywords[category][subcategory].append(keyword.replace("\\'", "'"))
+        elif closer == ']':
+            subcategory = None
+        elif closer == '}':
+            category = None
+    return keywords
+
+
+@dataclass(slots=True)
+class Classification:
+    """Classifier verdict for one article."""
+
+    category: str | None
+    sub_category: str | None
+    confidence: float
+    matched_terms: tuple[str, ...] = ()
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over word tokens, built from a set of keyword phrases."""
+
+    def __init__(self, phrases):
+        # State 0 is the root; each state has token transitions, a failure
+        # link and the phrases (as indexes) that end there
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        self.phrases = []
+        for phrase in phrases:
+            self._add(phrase)
+        self._link()
+
+    def _add(self, phrase: str):
+        tokens = tokenize(phrase)
+        if not tokens:
+            return
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] += (len(self.phrases),)
+        self.phrases.append(phrase)
+
+    def _link(self):
+        """Set failure links breadth-first and merge outputs along them."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(token, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def find(self, tokens) -> set[int]:
+        """Indexes into self.phrases of every phrase occurring in a token sequence."""
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+        for token in tokens:
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class KeywordClassifier:
+    """Scores articles against per-category keyword lists in one pass per field."""
+
+    def __init__(self, keywords: dict[str, dict[str, list[str]]]):
+        # Each distinct phrase maps to every (category, subcategory) listing it
+        groups = {}
+        for category, subcategories in keywords.items():
+            for subcategory, phrases in subcategories.items():
+                for phrase in phrases:
+                    groups.setdefault(phrase.lower(), []).append((category, subcategory))
+        self.automaton = KeywordAutomaton(groups)
+        self._groups = [tuple(groups[phrase]) for phrase in self.automaton.phrases]
+
+    def classify(self, title: str, description: str = "", default: str | None = None) -> Classification:
+        """
+        Category of an article from its title and description.
+
+        Confidence follows classifier.ts: 0.5 plus half the winning margin
+        over the runner-up, raised for high absolute scores, capped at 0.99.
+
+        Args:
+            title: Article title
+            description: Article description (plain text)
+            default: Category reported, with confidence 0, when nothing matches
+
+        Returns:
+            The best-scoring category, its subcategory, confidence and the
+            keywords it matched
+        """
+        title_hits = self.automaton.find(tokenize(title or ""))
+        description_hits = self.automaton.find(tokenize(description or "")) if description else set()
+        if not title_hits and not description_hits:
+            return Classification(default, None, 0.0)
+
+        scores = {}
+        matches = {}
+        for hits, weight in ((title_hits, TITLE_WEIGHT), (description_hits, DESCRIPTION_WEIGHT)):
+            for index in hits:
+                for group in self._groups[index]:
+                    scores[group] = scores.get(group, 0) + weight
+                    matches.setdefault(group, {})[index] = None
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        (category, subcategory), top = ranked[0]
+        second = ranked[1][1] if len(ranked) > 1 else 0
+
+        confidence = min(0.99, 0.5 + (top - second) / (top + second + 1) * 0.5)
+        if top >= 5:
+            confidence = min(0.99, confidence + 0.1)
+        if top >= 10:
+            confidence = min(0.99, confidence + 0.1)
+
+        terms = tuple(self.automaton.phrases[i] for i in sorted(matches[category, subcategory]))
+        return Classification(category, subcategory, round(confidence, 2), terms[:MAX_MATCHED_TERMS])
+
+
+@lru_cache(maxsize=1)
+def default_classifier() -> KeywordClassifier:
+    """Classifier built from the edge function's keyword lists (built once per process)."""
+    return KeywordClassifier(load_category_keywords())
+
+
+def classify(title: str, description: str = "", default: str | None = None) -> Classification:
+    """Classify an article with the default keyword lists."""
+    return default_classifier().classify(title, description, default)
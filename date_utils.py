@@ -0,0 +1,137 @@
+"""
+Date handling shared by the scrapers and seed scripts.
+Feed items carry RFC 822 dates (RSS pubDate) or ISO 8601 ones (Atom,
+dc:date) in assorted time zones. parse_timestamp() turns either into UTC
+epoch seconds, with a hand-written fast path for the common RFC 822 shape and
+a cache in front (polls and re-runs see the same strings over and over), and
+format_timestamp() writes the one canonical form articles are stored in.
+"""
+
+import calendar
+import re
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_tz
+from functools import lru_cache
+
+# Distinct date strings remembered by parse_timestamp()
+DATE_CACHE_SIZE = 16384
+
+# Canonical stored form: UTC ISO 8601 to the second
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+# "Tue, 07 Oct 2026 14:03:00 +0000" and the GMT / named-zone variants
+RFC822_PATTERN = re.compile(
+    r'(?:[A-Za-z]+,\s*)?(\d{1,2})\s+([A-Za-z]{3})[a-z]*\s+(\d{2,4})\s+'
+    r'(\d{1,2}):(\d{2})(?::(\d{2}))?\s*([+-]\d{4}|[A-Za-z]{1,4})?\s*$'
+)
+
+MONTHS = {name: index for index, name in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), start=1)}
+
+# Zone names RFC 822 allows, as offsets from UTC in hours
+ZONE_OFFSETS = {
+    'UT': 0, 'UTC': 0, 'GMT': 0, 'Z': 0,
+    'EST': -5, 'EDT': -4, 'CST': -6, 'CDT': -5,
+    'MST': -7, 'MDT': -6, 'PST': -8, 'PDT': -7,
+}
+
+# Days per month outside leap years
+DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# Suffixes accepted by parse_duration(), in seconds
+DURATION_UNITS = {'': 1, 's': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 7 * 86400}
+DURATION_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([smhdw]?)\s*$', re.IGNORECASE)
+
+
+def _parse_rfc822(value: str) -> float | None:
+    """Fast path for the usual RSS date shape; None means "try the slow path"."""
+    match = RFC822_PATTERN.match(value)
+    if match is None:
+        return None
+    day, month, year, hour, minute, second, zone = match.groups()
+    month = MONTHS.get(month.lower())
+    if month is None:
+        return None
+    year = int(year)
+    if year < 100:
+        year += 2000 if year < 70 else 1900
+
+    if zone is None:
+        offset = 0
+    elif zone[0] in '+-':
+        offset = (int(zone[1:3]) * 3600 + int(zone[3:5]) * 60) * (-1 if zone[0] == '-' else 1)
+    elif zone.upper() in ZONE_OFFSETS:
+        offset = ZONE_OFFSETS[zone.upper()] * 3600
+    else:
+        return None
+    fields = (year, month, int(day), int(hour), int(minute), int(second or 0))
+    if not _in_range(fields):
+        return None
+    return float(calendar.timegm(fields) - offset)
+
+
+def _in_range(fields: tuple) -> bool:
+    """Whether (year, month, day, hour, minute, second) is a real moment (timegm would roll it over)."""
+    year, month, day, hour, minute, second = fields
+    if not 1 <= month <= 12:
+        return False
+    days = 29 if month == 2 and calendar.isleap(year) else DAYS_IN_MONTH[month - 1]
+    return 1 <= day <= days and hour < 24 and minute < 60 and second < 61
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_timestamp(value: str | None) -> float | None:
+    """
+    UTC epoch seconds of an RFC 822 or ISO 8601 date string.
+
+    Dates without a time zone are taken as UTC.
+
+    Returns:
+        Seconds since the epoch, or None if the value isn't a date
+    """
+    if not value:
+        return None
+    value = value.strip()
+    parsed = _parse_rfc822(value)
+    if parsed is not None:
+        return parsed
+
+    try:
+        moment = datetime.fromisoformat(value[:-1] + '+00:00' if value[-1:] in 'Zz' else value)
+    except ValueError:
+        fields = parsedate_tz(value)
+        if fields is None or not _in_range(fields[:6]):
+            return None
+        return float(calendar.timegm(fields[:6]) - (fields[9] or 0))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    try:
+        return moment.timestamp()
+    except (OverflowError, ValueError):
+        return None
+
+
+def format_timestamp(epoch: float) -> str:
+    """Canonical UTC ISO 8601 form of epoch seconds, e.g. 2026-10-07T14:03:00Z."""
+    return time.strftime(TIMESTAMP_FORMAT, time.gmtime(epoch))
+
+
+def normalize_date(value: str | None) -> str | None:
+    """A date string in canonical UTC form; text that isn't a date is returned unchanged."""
+    epoch = parse_timestamp(value)
+    return value if epoch is None else format_timestamp(epoch)
+
+
+def parse_duration(value: str) -> float | None:
+    """
+    Seconds in an age like "90m", "48h", "7d" or "2w" (a bare number is
+    seconds).
+
+    Returns:
+        Seconds, or None if the value isn't a duration
+    """
+    match = DURATION_PATTERN.match(value)
+    if match is None:
+        return None
+    return float(match.group(1)) * DURATION_UNITS[match.group(2).lower()]
@@ -3,9 +3,10 @@
 Deploy affiliate SQL to Supabase
 """
 
-import requests
 import json
 
+from http_session import get_session
+
 # Supabase credentials
 SUPABASE_URL = "https://jmhtzyctxntaojuovrtf.supabase.co"
 SERVICE_KEY = "nNa-u$-JLY*mgV7"
@@ -18,7 +19,7 @@ def exec_sql(sql):
         "Content-Type": "application/json"
     }
     
-    response = requests.post(
+    response = get_session().post(
         f"{SUPABASE_URL}/rest/v1/rpc/pg_query",
         headers=headers,
         json={"query": sql},
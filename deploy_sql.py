@@ -3,9 +3,10 @@
 Deploy affiliate SQL to Supabase via REST API
 """
 
-import requests
 import json
 
+from http_session import get_session
+
 # Supabase credentials from .env
 SUPABASE_URL = "https://jmhtzyctxntaojuovrtf.supabase.co"
 SUPABASE_KEY = "nNa-u$-JLY*mgV7"  # service role key
@@ -42,7 +43,7 @@ def execute_sql(sql_file):
             payload = {"query": stmt}
             
             try:
-                response = requests.post(endpoint, headers=headers, json=payload, timeout=30)
+                response = get_session().post(endpoint, headers=headers, json=payload, timeout=30)
                 if response.status_code in [200, 201, 204, 400]:
                     results.append(f"Statement {i+1}: OK")
                 else:
@@ -0,0 +1,93 @@
+"""
+Conditional GET cache for feed polling.
+Remembers each feed's ETag / Last-Modified validators on disk so repeat polls
+are answered with 304 Not Modified instead of a full download. The articles
+parsed from the last full response are kept alongside the validators, so a
+304 costs neither bandwidth nor parsing.
+"""
+
+import threading
+from pathlib import Path
+
+from article_schema import Article
+from json_store import load_json, save_json
+
+
+class FeedCache:
+    """Persistent validator cache keyed by feed URL."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.entries = load_json(self.path)
+        self.not_modified_count = 0
+        self.bytes_saved = 0
+        self.bytes_downloaded = 0
+
+    def request_headers(self, url: str) -> dict:
+        """Conditional request headers for a feed URL (empty if never seen)."""
+        with self._lock:
+            entry = self.entries.get(url)
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def not_modified(self, url: str) -> list[Article] | None:
+        """
+        Record a 304 response for a feed.
+
+        Returns:
+            Articles parsed from the last full response, or None if the
+            cache has nothing for this URL
+        """
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is None:
+                return None
+            self.not_modified_count += 1
+            self.bytes_saved += entry.get('size', 0)
+            records = entry.get('articles', [])
+        return [Article.from_dict(record) for record in records]
+
+    def store(self, url: str, headers, size: int, articles: list[Article], complete: bool = True):
+        """
+        Store validators and parsed articles from a full (200) response.
+
+        Feeds that send neither ETag nor Last-Modified are not cached. When
+        articles is not the whole feed (complete=False, e.g. reading stopped
+        at an item limit) only the download is counted, and the entry from
+        the last whole read is kept with its own validators.
+        """
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+
+        with self._lock:
+            self.bytes_downloaded += size
+            if not complete:
+                return
+            if not etag and not last_modified:
+                self.entries.pop(url, None)
+                return
+            self.entries[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'size': size,
+                'articles': [article.to_dict() for article in articles],
+            }
+
+    def save(self):
+        """Write the cache to disk atomically."""
+        with self._lock:
+            save_json(self.path, self.entries, ensure_ascii=False)
+
+    def summary(self) -> str:
+        """One-line report of cache effectiveness for this run."""
+        return (f"{self.not_modified_count} feeds not modified, "
+                f"{self.bytes_saved / 1024:.1f} KB saved, "
+                f"{self.bytes_downloaded / 1024:.1f} KB downloaded")
@@ -0,0 +1,262 @@
+"""
+Adaptive feed polling scheduler.
+Keeps every feed in a priority queue ordered by its next poll time. Each
+feed's interval follows its publish rate, learned from the timestamps of the
+items it returns, so a feed that posts every few minutes is polled every few
+minutes and one that posts weekly a few times a day. Errors and polls that
+bring nothing new back the interval off, and requests to the same host are
+spaced apart. Learned rates are kept on disk across restarts.
+"""
+
+import heapq
+import itertools
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Callable
+from urllib.parse import urlparse
+
+from article_schema import Article
+from date_utils import parse_timestamp
+from json_store import CACHE_DIR, load_json, save_json
+
+# Learned intervals and next poll times
+SCHEDULE_FILE = CACHE_DIR / "feed_schedule.json"
+
+# Poll interval bounds and the starting point for feeds without history (seconds)
+MIN_INTERVAL = 120
+MAX_INTERVAL = 6 * 3600
+INITIAL_INTERVAL = 900
+
+# Polls per average gap between items: higher finds new items sooner
+POLLS_PER_ITEM = 2
+
+# Newest items used to estimate a feed's publish rate
+RATE_SAMPLE_ITEMS = 20
+
+# Weight of the newest rate estimate against the running one
+RATE_SMOOTHING = 0.3
+
+# Interval multipliers per consecutive unchanged poll / error
+UNCHANGED_BACKOFF = 1.5
+ERROR_BACKOFF = 2.0
+
+# Minimum seconds between requests to the same host
+HOST_MIN_GAP = 10.0
+
+# Random spread on each interval so feeds don't fall into lockstep
+JITTER = 0.1
+
+# Feeds polled at once, and how often learned state is written to disk
+MAX_WORKERS = 8
+SAVE_INTERVAL = 60.0
+
+# Poll outcomes reported by the poll function
+FETCHED = "fetched"
+NOT_MODIFIED = "not_modified"
+ERROR = "error"
+
+
+def publish_gap(articles: list[Article], now: float) -> float | None:
+    """
+    Average seconds between items, from the newest RATE_SAMPLE_ITEMS
+    timestamps. The window runs up to now rather than the newest item, so a
+    feed that has gone quiet reads as slow.
+    """
+    stamps = sorted((t for t in map(parse_timestamp, (a.published for a in articles))
+                     if t is not None and t <= now), reverse=True)[:RATE_SAMPLE_ITEMS]
+    if len(stamps) < 2:
+        return None
+    return (now - stamps[-1]) / len(stamps)
+
+
+@dataclass(slots=True)
+class FeedState:
+    """Schedule and learned rate for one feed."""
+
+    name: str
+    url: str
+    category: str
+    next_poll: float = 0.0
+    interval: float = INITIAL_INTERVAL
+    item_gap: float | None = None
+    unchanged: int = 0
+    errors: int = 0
+    polls: int = 0
+    new_items: int = 0
+
+    def base_interval(self) -> float:
+        """Interval the publish rate alone calls for."""
+        if self.item_gap is None:
+            return INITIAL_INTERVAL
+        return min(MAX_INTERVAL, max(MIN_INTERVAL, self.item_gap / POLLS_PER_ITEM))
+
+
+class PollScheduler:
+    """
+    Polls feeds forever (or for a set time), each on its own learned interval.
+
+    Usage:
+        scheduler = PollScheduler(feeds, poll, emit)
+        scheduler.run()
+    """
+
+    def __init__(self, feeds: list[tuple[str, str, str]],
+                 poll: Callable[[str, str, str], tuple[list[Article], str]],
+                 emit: Callable[[list[Article]], int],
+                 state_path: Path = SCHEDULE_FILE,
+                 host_gap: float = HOST_MIN_GAP,
+                 checkpoint: Callable[[], None] | None = None):
+        """
+        Args:
+            feeds: (name, url, category) tuples
+            poll: Fetches one feed; returns its articles and FETCHED,
+                NOT_MODIFIED or ERROR. Called from worker threads.
+            emit: Handles a poll's articles and returns how many were new.
+                Called from the thread running the scheduler.
+            state_path: Where learned schedules are kept
+            host_gap: Minimum seconds between requests to one host
+            checkpoint: Called whenever the schedule is saved (optional)
+        """
+        self.poll = poll
+        self.emit = emit
+        self.state_path = Path(state_path)
+        self.host_gap = host_gap
+        self.checkpoint = checkpoint
+        self.host_ready = {}
+        self.requests = 0
+        self.outcomes = {FETCHED: 0, NOT_MODIFIED: 0, ERROR: 0}
+        self.new_articles = 0
+        self._queue = []
+        self._order = itertools.count()
+
+        saved = load_json(self.state_path)
+        known = {field.name for field in fields(FeedState)}
+        self.states = {}
+        for name, url, category in feeds:
+            entry = {k: v for k, v in saved.get(url, {}).items() if k in known}
+            entry.update(name=name, url=url, category=category)
+            self.states[url] = FeedState(**entry)
+            self._push(self.states[url])
+
+    def save(self):
+        """Write every feed's state to disk atomically."""
+        save_json(self.state_path, {url: asdict(state) for url, state in self.states.items()},
+                  indent=1)
+        if self.checkpoint is not None:
+            self.checkpoint()
+
+    def _push(self, state: FeedState):
+        heapq.heappush(self._queue, (state.next_poll, next(self._order), state.url))
+
+    def record(self, state: FeedState, articles: list[Article], outcome: str, now: float) -> int:
+        """
+        Update a feed's rate and next poll time after a poll.
+
+        Returns:
+            Number of new articles the poll produced
+        """
+        state.polls += 1
+        self.outcomes[outcome] += 1
+        new = 0
+        if outcome == ERROR:
+            state.errors += 1
+            state.interval = state.base_interval() * ERROR_BACKOFF ** min(state.errors, 16)
+        else:
+            state.errors = 0
+            if outcome == FETCHED:
+                gap = publish_gap(articles, now)
+                if gap is not None:
+                    state.item_gap = gap if state.item_gap is None else (
+                        RATE_SMOOTHING * gap + (1 - RATE_SMOOTHING) * state.item_gap)
+                new = self.emit(articles)
+            if new:
+                self.new_articles += new
+                state.unchanged = 0
+                state.new_items += new
+                state.interval = state.base_interval()
+            else:
+                state.unchanged += 1
+                state.interval = state.base_interval() * UNCHANGED_BACKOFF ** min(state.unchanged, 16)
+
+        state.interval = min(MAX_INTERVAL, state.interval)
+        state.next_poll = now + state.interval * random.uniform(1 - JITTER, 1 + JITTER)
+        self._push(state)
+        return new
+
+    def _next_due(self, now: float) -> FeedState | None:
+        """Pop the next feed due now whose host may be contacted, if any."""
+        while self._queue and self._queue[0][0] <= now:
+            _, _, url = heapq.heappop(self._queue)
+            state = self.states[url]
+            host = urlparse(url).netloc.lower()
+            ready = self.host_ready.get(host, 0.0)
+            if ready > now:
+                # Too soon for this host: requeue at the host's next free moment
+                state.next_poll = ready
+                self._push(state)
+                continue
+            self.host_ready[host] = now + self.host_gap
+            return state
+        return None
+
+    def run(self, duration: float | None = None, max_workers: int = MAX_WORKERS):
+        """
+        Poll feeds as they come due until interrupted or duration runs out.
+
+        Args:
+            duration: Seconds to run (default: until KeyboardInterrupt)
+            max_workers: Feeds polled at once
+        """
+        stop_at = time.time() + duration if duration is not None else None
+        next_save = time.time() + SAVE_INTERVAL
+        running = {}
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            while stop_at is None or time.time() < stop_at:
+                now = time.time()
+                while len(running) < max_workers:
+                    state = self._next_due(now)
+                    if state is None:
+                        break
+                    self.requests += 1
+                    running[executor.submit(self.poll, state.name, state.url, state.category)] = state
+
+                # Sleep until a poll finishes, the next feed is due, or it's time to stop
+                wake_at = [stop_at] if stop_at is not None else []
+                if self._queue and len(running) < max_workers:
+                    wake_at.append(self._queue[0][0])
+                timeout = max(0.0, min(wake_at) - now) if wake_at else None
+                if running:
+                    done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                else:
+                    done = ()
+                    time.sleep(timeout if timeout is not None else SAVE_INTERVAL)
+
+                for future in done:
+                    state = running.pop(future)
+                    articles, outcome = future.result()
+                    now = time.time()
+                    new = self.record(state, articles, outcome, now)
+                    print(f"  {state.name}: {outcome.replace('_', ' ')}, {new} new, "
+                          f"next in {(state.next_poll - now) / 60:.1f} min")
+
+                if time.time() >= next_save:
+                    self.save()
+                    next_save = time.time() + SAVE_INTERVAL
+        except KeyboardInterrupt:
+            print("\nStopping scheduler...")
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            for future, state in running.items():
+                if future.done() and not future.cancelled():
+                    self.record(state, *future.result(), time.time())
+            self.save()
+
+    def summary(self) -> str:
+        """One-line report of requests made and what they returned."""
+        return (f"{self.requests} requests ({self.outcomes[FETCHED]} fetched, "
+                f"{self.outcomes[NOT_MODIFIED]} not modified, {self.outcomes[ERROR]} errors), "
+                f"{self.new_articles} new articles")
@@ -1,69 +1,238 @@
 #!/usr/bin/env python3
-"""Generate MANUAL_ARTICLE_SEED.sql with image URLs"""
-import json
+"""
+Generate MANUAL_ARTICLE_SEED.sql with image URLs
+
+--format insert (default) writes a single INSERT ... VALUES script for the
+Supabase SQL editor. --format copy writes psql scripts instead: a staging
+table, one or more COPY ... FROM STDIN (CSV) data files, and a merge that
+upserts the staged rows into articles by slug.
+"""
+import argparse
 import re
+import sys
+import time
 from datetime import datetime
+from pathlib import Path
 
-def slugify(text):
-    """Create URL-friendly slug"""
-    text = text.lower()[:60]
-    text = re.sub(r'[^a-z0-9]+', '-', text)
-    text = text.strip('-')
-    return text
+from article_io import iter_articles, latest_articles_file
+from article_schema import Article
+from date_utils import format_timestamp, parse_timestamp
+
+OUTPUT_FILE = Path('MANUAL_ARTICLE_SEED.sql')
+COPY_OUTPUT_DIR = Path('seed_copy')
 
-with open('scraped_articles.json') as f:
-    articles = json.load(f)
+# Files write_copy_seed() writes (and clears from an earlier run)
+COPY_FILE_PATTERNS = ('00_stage.sql', '01_data_*.sql', '99_merge.sql')
 
-sql = """-- =====================================================
+# Seed columns, in the order rows are built
+COLUMNS = ('title', 'original_url', 'summary', 'content_text', 'source_name',
+           'image_url', 'published_at', 'status', 'slug')
+
+# Unlogged: the staged rows only live until the merge
+STAGING_TABLE = 'articles_seed_staging'
+
+HEADER = """-- =====================================================
 -- MANUAL ARTICLE SEED - Run in Supabase SQL Editor
--- Generated: """ + datetime.now().strftime('%Y-%m-%d %H:%M') + """
+-- Generated: {generated}
 -- Open: https://jmhtzyctxntaojuovrtf.supabase.co/sql
 -- =====================================================
 
 -- Add columns if they don't exist
 ALTER TABLE articles ADD COLUMN IF NOT EXISTS source_name VARCHAR(100);
 ALTER TABLE articles ADD COLUMN IF NOT EXISTS image_url TEXT;
+"""
 
--- Get source IDs
+# Columns where an empty value loads as NULL rather than ''
+NULLABLE_COLUMNS = ('image_url', 'published_at')
+
+STAGE_SQL = f"""
+-- Staging table for COPY (same column types as articles); merged by the last file
+CREATE UNLOGGED TABLE IF NOT EXISTS {STAGING_TABLE} AS
+    SELECT {', '.join(COLUMNS)} FROM articles WITH NO DATA;
+TRUNCATE {STAGING_TABLE};
 """
 
-# Get/create source mapping
-sources = {}
-for a in articles:
-    src = a['source_name']
-    if src not in sources:
-        sources[src] = f"'{src}'"
+UPDATE_ASSIGNMENTS = ',\n'.join(f'    {c} = EXCLUDED.{c}' for c in COLUMNS if c != 'slug')
 
-sql += "-- Source mapping (replace with actual UUIDs from sources table)\n"
-for src, placeholder in sources.items():
-    sql += f"-- {src}: {placeholder}\n"
+MERGE_SQL = f"""-- Merge staged rows: one per slug, skipping URLs another article already has
+INSERT INTO articles ({', '.join(COLUMNS)})
+SELECT DISTINCT ON (s.slug) {', '.join('s.' + c for c in COLUMNS)}
+FROM {STAGING_TABLE} s
+WHERE NOT EXISTS (
+    SELECT 1 FROM articles a WHERE a.original_url = s.original_url AND a.slug <> s.slug
+)
+ORDER BY s.slug
+ON CONFLICT (slug) DO UPDATE SET
+{UPDATE_ASSIGNMENTS};
 
-sql += """
--- Insert articles
-INSERT INTO articles (title, original_url, summary, content_text, source_name, image_url, published_at, status, slug) VALUES
-"""
+DROP TABLE {STAGING_TABLE};
 
-values = []
-for a in articles:
-    title = a['title'].replace("'", "''")[:450]
-    url = a['url'].replace("'", "''")
-    summary = (a.get('summary', '') or a.get('content', '')[:500]).replace("'", "''")
-    content = (a.get('content', '') or a['summary'][:2000]).replace("'", "''")
-    src = a['source_name']
-    img = (a.get('image_url') or '').replace("'", "''")
-    published = a['published_at'][:19].replace('T', ' ') + 'Z' if 'T' in a['published_at'] else a['published_at'][:19]
-    slug = slugify(a['title'])
-    
-    values.append(f"('{title}', '{url}', '{summary}', '{content}', '{src}', '{img}', '{published}', 'published', '{slug}')")
-
-sql += ',\n'.join(values) + ';\n\n-- Verify'
-sql += """
+-- Verify
 SELECT COUNT(*) as articles_inserted FROM articles;
 SELECT source_name, COUNT(*) FROM articles GROUP BY source_name;
 """
 
-with open('MANUAL_ARTICLE_SEED.sql', 'w', encoding='utf-8') as f:
-    f.write(sql)
 
-print(f"Generated MANUAL_ARTICLE_SEED.sql with {len(articles)} articles")
-print(f"With images: {sum(1 for a in articles if a.get('image_url'))}")
+def slugify(text):
+    """Create URL-friendly slug"""
+    text = text.lower()[:60]
+    text = re.sub(r'[^a-z0-9]+', '-', text)
+    text = text.strip('-')
+    return text
+
+
+def seed_row(a: Article) -> tuple:
+    """Column values (unescaped) for one article, in COLUMNS order."""
+    summary = a.description or (a.content or '')[:500]
+    content = a.content or (a.description or '')[:2000]
+    published = parse_timestamp(a.published)
+    if published is None:
+        published = parse_timestamp(a.scraped_at) or time.time()
+    return (a.title[:450], a.link, summary, content, a.source, a.image or '',
+            format_timestamp(published), 'published', slugify(a.title))
+
+
+def sql_literal(value: str) -> str:
+    """Single-quoted SQL string literal."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def csv_field(value: str) -> str:
+    """
+    Quoted CSV field. Every field is quoted, so no value can read as the
+    COPY end marker (\\.), and an empty value is "" rather than NULL.
+    """
+    return '"' + value.replace('"', '""') + '"'
+
+
+def write_insert_seed(articles, path: Path) -> tuple[int, int]:
+    """
+    Write the INSERT ... VALUES seed script.
+
+    Returns:
+        (articles written, articles with images)
+    """
+    sources = {}
+    values = []
+    with_images = 0
+    for a in articles:
+        row = seed_row(a)
+        sources.setdefault(a.source, f"'{a.source}'")
+        if row[5]:
+            with_images += 1
+        values.append('(' + ', '.join(map(sql_literal, row)) + ')')
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(HEADER.format(generated=datetime.now().strftime('%Y-%m-%d %H:%M')))
+        f.write("\n-- Get source IDs\n")
+        f.write("-- Source mapping (replace with actual UUIDs from sources table)\n")
+        for src, placeholder in sources.items():
+            f.write(f"-- {src}: {placeholder}\n")
+        f.write(f"\n-- Insert articles\nINSERT INTO articles ({', '.join(COLUMNS)}) VALUES\n")
+        f.write(',\n'.join(values))
+        f.write(""";
+
+-- Verify
+SELECT COUNT(*) as articles_inserted FROM articles;
+SELECT source_name, COUNT(*) FROM articles GROUP BY source_name;
+""")
+    return len(values), with_images
+
+
+def write_copy_seed(articles, directory: Path, chunk_rows: int | None = None) -> tuple[int, int, list[Path]]:
+    """
+    Write the seed as psql scripts using COPY ... FROM STDIN (CSV).
+
+    Files, to be run in name order in one psql session:
+        00_stage.sql         column additions and the staging table
+        01_data_NNNN.sql     COPY data, at most chunk_rows rows each
+        99_merge.sql         upsert from staging into articles, then cleanup
+
+    Rows are streamed straight to the data files. An empty image or date
+    loads as NULL; other empty fields load as ''. Files of these names left
+    in the directory by an earlier run are replaced; nothing else there is
+    touched.
+
+    Returns:
+        (articles written, articles with images, files written)
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    for pattern in COPY_FILE_PATTERNS:
+        for old in directory.glob(pattern):
+            old.unlink()
+
+    stage_path = directory / '00_stage.sql'
+    with open(stage_path, 'w', encoding='utf-8') as f:
+        f.write(HEADER.format(generated=datetime.now().strftime('%Y-%m-%d %H:%M')))
+        f.write(STAGE_SQL)
+    files = [stage_path]
+
+    copy_line = (f"COPY {STAGING_TABLE} ({', '.join(COLUMNS)}) FROM STDIN "
+                 f"WITH (FORMAT csv, FORCE_NULL ({', '.join(NULLABLE_COLUMNS)}));\n")
+    count = 0
+    with_images = 0
+    f = None
+    try:
+        for a in articles:
+            if f is None or (chunk_rows and count % chunk_rows == 0):
+                if f is not None:
+                    f.write('\\.\n')
+                    f.close()
+                path = directory / f'01_data_{len(files):04d}.sql'
+                files.append(path)
+                f = open(path, 'w', encoding='utf-8', newline='')
+                f.write(copy_line)
+            row = seed_row(a)
+            if row[5]:
+                with_images += 1
+            f.write(','.join(map(csv_field, row)) + '\n')
+            count += 1
+        if f is not None:
+            f.write('\\.\n')
+    finally:
+        if f is not None:
+            f.close()
+
+    merge_path = directory / '99_merge.sql'
+    with open(merge_path, 'w', encoding='utf-8') as f:
+        f.write(MERGE_SQL)
+    files.append(merge_path)
+    return count, with_images, files
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Generate an article seed for Supabase")
+    parser.add_argument("path", nargs="?", type=Path, default=None,
+                        help="Scraper output file (default: newest scraped_articles.*)")
+    parser.add_argument("--format", choices=["insert", "copy"], default="insert",
+                        help=f"insert: one {OUTPUT_FILE} script; copy: COPY FROM STDIN "
+                             f"scripts in {COPY_OUTPUT_DIR}/")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Output file (insert) or directory (copy)")
+    parser.add_argument("--chunk-rows", type=int, default=None,
+                        help="copy: rows per data file (default: all in one)")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    path = args.path or latest_articles_file(Path('.'))
+    articles = iter_articles(path)
+
+    if args.format == "copy":
+        directory = args.output or COPY_OUTPUT_DIR
+        count, with_images, files = write_copy_seed(articles, directory, args.chunk_rows)
+        print(f"Generated {len(files)} files in {directory}/ with {count} articles")
+        print(f"With images: {with_images}")
+        print(f"Load with: cat {directory}/*.sql | psql --single-transaction \"$DATABASE_URL\"")
+    else:
+        output = args.output or OUTPUT_FILE
+        count, with_images = write_insert_seed(articles, output)
+        print(f"Generated {output} with {count} articles")
+        print(f"With images: {with_images}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
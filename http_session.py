@@ -0,0 +1,264 @@
+"""
+Shared HTTP transport for the scrapers and scripts.
+Every request goes through one pooled requests.Session per process, so
+connections (and TLS sessions) to a host are kept alive and reused instead
+of being opened per call. The session negotiates compressed responses (gzip,
+deflate, and brotli/zstd when their packages are installed), applies one
+timeout and retry policy, and caches DNS lookups for its own connections.
+Callers can time the DNS lookups and connects behind their requests with
+connection_timings().
+"""
+
+import socket
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+from urllib3.util import connection
+from urllib3.util.retry import Retry
+
+USER_AGENT = 'SIFT-NewsBot/1.0 (https://sifted-insight.lovable.app)'
+
+# Seconds to connect, and to wait between bytes, when the caller gives no timeout
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+
+# Hosts kept in the pool, and keep-alive connections per host (threads
+# beyond this still work but open short-lived extra connections)
+POOL_HOSTS = 64
+POOL_PER_HOST = 16
+
+# Retries for connection errors and these statuses on idempotent requests.
+# Delays double from RETRY_BACKOFF; a Retry-After header is honoured up to
+# MAX_RETRY_AFTER seconds so one slow host can't stall a whole run.
+RETRIES = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_RETRY_AFTER = 10.0
+
+# How long resolved addresses are reused
+DNS_TTL = 300
+
+
+class CappedRetry(Retry):
+    """urllib3 Retry that waits at most MAX_RETRY_AFTER for a Retry-After header."""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, MAX_RETRY_AFTER)
+
+
+def retry_policy(retries: int = RETRIES) -> Retry:
+    """The shared retry policy. Exhausted status retries return the last response."""
+    return CappedRetry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        raise_on_status=False,
+    )
+
+
+class DnsCache:
+    """getaddrinfo results per (host, port), reused for DNS_TTL seconds."""
+
+    def __init__(self, ttl: float = DNS_TTL):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, host: str, port: int) -> list[str]:
+        """Addresses for a host, from cache or a fresh lookup."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((host, port))
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        infos = socket.getaddrinfo(host, port, connection.allowed_gai_family(), socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self._entries[host, port] = (now + self.ttl, addresses)
+        return addresses
+
+    def forget(self, host: str, port: int):
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+
+DNS_CACHE = DnsCache()
+
+# The timings dict of the innermost connection_timings() block, per thread
+_timings = threading.local()
+
+
+@contextmanager
+def connection_timings() -> Iterator[dict[str, float]]:
+    """
+    Time the connections this thread opens inside the block.
+
+    Yields {"dns": seconds, "connect": seconds}, added to as connections
+    are opened. A request on a reused keep-alive connection adds nothing,
+    and a cached lookup counts only its (tiny) cache time.
+    """
+    timings = {'dns': 0.0, 'connect': 0.0}
+    outer = getattr(_timings, 'current', None)
+    _timings.current = timings
+    try:
+        yield timings
+    finally:
+        _timings.current = outer
+
+
+def _record(stage: str, started: float):
+    timings = getattr(_timings, 'current', None)
+    if timings is not None:
+        timings[stage] += time.perf_counter() - started
+
+
+def _is_ip_address(host: str) -> bool:
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, host.strip('[]'))
+            return True
+        except OSError:
+            continue
+    return False
+
+
+class _CachedDnsConnection:
+    """
+    Mixin for urllib3 connections that resolves host names through
+    dns_cache, trying each cached address in turn. Errors are raised as the
+    same urllib3 exceptions HTTPConnection._new_conn raises. Lookup and
+    connect times go to connection_timings() (for IP literals and
+    localhost, which skip the cache, all of it counts as connect).
+    """
+
+    dns_cache = DNS_CACHE
+
+    def _new_conn(self) -> socket.socket:
+        host = self.host
+        if _is_ip_address(host) or host == 'localhost':
+            started = time.perf_counter()
+            try:
+                return super()._new_conn()
+            finally:
+                _record('connect', started)
+        started = time.perf_counter()
+        try:
+            addresses = self.dns_cache.resolve(host, self.port)
+        except socket.gaierror as e:
+            raise NameResolutionError(host, self, e) from e
+        finally:
+            _record('dns', started)
+
+        started = time.perf_counter()
+        try:
+            return self._connect_to(host, addresses)
+        finally:
+            _record('connect', started)
+
+    def _connect_to(self, host: str, addresses: list[str]) -> socket.socket:
+        """A socket to the first of addresses that accepts a connection."""
+        error = None
+        for ip in addresses:
+            try:
+                sock = connection.create_connection((ip, self.port), self.timeout,
+                                                    source_address=self.source_address,
+                                                    socket_options=self.socket_options)
+            except socket.timeout as e:
+                error = ConnectTimeoutError(
+                    self, f"Connection to {host} timed out. (connect timeout={self.timeout})")
+                error.__cause__ = e
+            except OSError as e:
+                error = NewConnectionError(self, f"Failed to establish a new connection: {e}")
+                error.__cause__ = e
+            else:
+                sys.audit("http.client.connect", self, host, self.port)
+                return sock
+        # Every cached address failed: the records may have changed
+        self.dns_cache.forget(host, self.port)
+        raise error from error.__cause__
+
+
+class CachedDnsHTTPConnection(_CachedDnsConnection, HTTPConnection):
+    pass
+
+
+class CachedDnsHTTPSConnection(_CachedDnsConnection, HTTPSConnection):
+    pass
+
+
+class CachedDnsHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = CachedDnsHTTPConnection
+
+
+class CachedDnsHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = CachedDnsHTTPSConnection
+
+
+class PooledAdapter(HTTPAdapter):
+    """
+    HTTPAdapter with the shared pool sizes, retry policy and default
+    timeout, whose connections resolve host names through DNS_CACHE.
+    """
+
+    def __init__(self, pool_maxsize: int = POOL_PER_HOST, retries: int = RETRIES,
+                 timeout: tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT)):
+        self.timeout = timeout
+        super().__init__(pool_connections=POOL_HOSTS, pool_maxsize=pool_maxsize,
+                         max_retries=retry_policy(retries))
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        # Only this adapter's pools; urllib3's module-level resolver is left alone
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CachedDnsHTTPConnectionPool,
+            "https": CachedDnsHTTPSConnectionPool,
+        }
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=timeout if timeout is not None else self.timeout, **kwargs)
+
+
+def make_session(pool_maxsize: int = POOL_PER_HOST, headers: dict | None = None,
+                 retries: int = RETRIES) -> requests.Session:
+    """
+    New session with the shared transport settings.
+
+    Args:
+        pool_maxsize: Keep-alive connections per host (size it to the
+            number of threads sharing the session)
+        headers: Extra default headers (e.g. API keys)
+        retries: Retries for connection errors and retryable statuses
+    """
+    session = requests.Session()
+    adapter = PooledAdapter(pool_maxsize=pool_maxsize, retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    session.headers['Accept-Encoding'] = urllib3.util.make_headers(accept_encoding=True)['accept-encoding']
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+@lru_cache(maxsize=1)
+def get_session() -> requests.Session:
+    """The process-wide shared session (created on first use)."""
+    return make_session()
@@ -0,0 +1,136 @@
+"""
+Local image cache shared by the video pipeline and the image tools.
+Images are stored under a name derived from the SHA-256 of their URL, written
+by streaming to a temporary file and renaming, and evicted least recently
+used first once the cache grows past its size limit. A cached image costs no
+network I/O however many times it is used.
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+
+from http_session import get_session
+from image_formats import image_format
+from json_store import CACHE_DIR
+from lru_store import LruFileStore
+
+# Default location and size limit
+IMAGE_CACHE_DIR = CACHE_DIR / "images"
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+
+DOWNLOAD_TIMEOUT = 10
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Extensions kept on cached files (ffmpeg picks its image demuxer by extension)
+IMAGE_SUFFIXES = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif', '.bmp'}
+DEFAULT_SUFFIX = '.jpg'
+
+
+class ImageCache(LruFileStore):
+    """Content-addressed image store with LRU eviction by total size."""
+
+    def __init__(self, directory: Path = IMAGE_CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES,
+                 session: requests.Session | None = None):
+        super().__init__(directory, max_bytes)
+        self.session = session or get_session()
+        # [lock, callers holding or waiting for it] per URL being downloaded,
+        # so concurrent callers share a download
+        self._downloads = {}
+        self.hits = 0
+        self.misses = 0
+        self.bytes_downloaded = 0
+
+    def path_for(self, url: str) -> Path:
+        """Cache location for a URL: <first two hex digits>/<sha256><suffix>."""
+        digest = hashlib.sha256(url.encode()).hexdigest()
+        suffix = Path(urlparse(url).path).suffix.lower()
+        if suffix not in IMAGE_SUFFIXES:
+            suffix = DEFAULT_SUFFIX
+        return self.directory / digest[:2] / f"{digest}{suffix}"
+
+    def get(self, url: str) -> Path | None:
+        """Cached file for a URL, or None. Marks the file as recently used."""
+        path = self.path_for(url)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def fetch(self, url: str, timeout: float = DOWNLOAD_TIMEOUT) -> Path:
+        """
+        Cached file for a URL, downloading it first if needed.
+
+        Raises:
+            requests.RequestException: The download failed
+            ValueError: The URL is not http(s) or the response is not an image
+        """
+        path = self.get(url)
+        if path is not None:
+            return path
+
+        with self._lock:
+            download = self._downloads.setdefault(url, [threading.Lock(), 0])
+            download[1] += 1
+        try:
+            with download[0]:
+                # Another thread may have finished the download meanwhile
+                path = self.get(url)
+                if path is not None:
+                    return path
+                with self._lock:
+                    self.misses += 1
+                return self._download(url, timeout)
+        finally:
+            # The lock is dropped with its last user; anyone arriving later
+            # finds the file on disk
+            with self._lock:
+                download[1] -= 1
+                if not download[1]:
+                    del self._downloads[url]
+
+    def _download(self, url: str, timeout: float) -> Path:
+        """Stream a URL into the cache and evict if over the size limit."""
+        if urlparse(url).scheme not in ('http', 'https'):
+            raise ValueError(f"not an http(s) URL: {url[:80]}")
+
+        path = self.path_for(url)
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.part")
+        size = 0
+        try:
+            headers = {"User-Agent": "Mozilla/5.0"}
+            with self.session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+                response.raise_for_status()
+                # Servers often send images as application/octet-stream (or
+                # with no type), so anything but image/* is judged by its
+                # first bytes instead
+                content_type = response.headers.get('Content-Type', '')
+                sniff = not content_type.startswith('image/')
+                with open(tmp_path, 'wb') as f:
+                    for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        if sniff and not size and image_format(chunk) is None:
+                            raise ValueError(f"not an image ({content_type.split(';')[0] or 'no type'})")
+                        f.write(chunk)
+                        size += len(chunk)
+            tmp_path.replace(path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        with self._lock:
+            self.bytes_downloaded += size
+        self._stored(size)
+        return path
+
+    def summary(self) -> str:
+        """One-line report of cache effectiveness for this run."""
+        return (f"{self.hits} cached, {self.misses} downloaded "
+                f"({self.bytes_downloaded / 1024:.1f} KB), "
+                f"{self.total_bytes / 1024 / 1024:.1f} MB on disk")
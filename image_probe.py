@@ -0,0 +1,217 @@
+"""
+Image URL probe.
+Checks article image URLs concurrently with ranged GETs over a pooled
+session, reading only the first few kilobytes of each response to get the
+content type and pixel dimensions (PNG, GIF, JPEG, WebP). Results are kept in
+an on-disk cache with a TTL so repeat runs never re-probe a URL, and images
+already in the shared image_cache are read from disk instead.
+"""
+
+import mimetypes
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+
+from http_session import make_session as make_http_session
+from image_cache import ImageCache
+from image_formats import image_size
+from json_store import CACHE_DIR, load_json, save_json
+
+# Default cache location and how long results stay valid
+PROBE_CACHE = CACHE_DIR / "image_probe.json"
+PROBE_TTL = 7 * 86400
+# Network errors may be transient, so they are retried sooner
+ERROR_TTL = 3600
+
+# Concurrency: total, and per image host
+MAX_WORKERS = 32
+PER_HOST_LIMIT = 16
+
+PROBE_TIMEOUT = 10
+
+# Bytes requested per image; enough for the header of every format we parse
+# (JPEG dimensions come after EXIF data, which can be large)
+PROBE_BYTES = 32 * 1024
+# Reading a local file is cheap, so look further for the JPEG frame header
+LOCAL_PROBE_BYTES = 256 * 1024
+
+# Images smaller than this are flagged (tracking pixels, spacers, icons)
+MIN_WIDTH = 200
+MIN_HEIGHT = 100
+
+@dataclass(slots=True)
+class ImageProbe:
+    """What a probe found out about one image URL."""
+
+    url: str
+    checked_at: float
+    status: int | None = None
+    content_type: str | None = None
+    format: str | None = None
+    width: int | None = None
+    height: int | None = None
+    error: str | None = None
+
+    def problem(self, min_width: int = MIN_WIDTH, min_height: int = MIN_HEIGHT) -> str | None:
+        """Why the image is unusable, or None if it looks fine."""
+        if self.error:
+            return self.error
+        if self.status is not None and self.status >= 400:
+            return f"HTTP {self.status}"
+        if self.format is None and not (self.content_type or '').startswith('image/'):
+            return f"not an image ({self.content_type or 'unknown type'})"
+        if self.width is not None and (self.width < min_width or self.height < min_height):
+            return f"too small ({self.width}x{self.height})"
+        return None
+
+
+class ImageProbeCache:
+    """Persistent probe results keyed by image URL, with TTL."""
+
+    def __init__(self, path: Path = PROBE_CACHE, ttl: float = PROBE_TTL, error_ttl: float = ERROR_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self._lock = threading.Lock()
+        self.entries = load_json(self.path)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, url: str) -> ImageProbe | None:
+        """Cached result for a URL, or None if missing or expired."""
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is not None:
+                ttl = self.error_ttl if entry.get('status') is None and entry.get('error') else self.ttl
+                if time.time() - entry['checked_at'] < ttl:
+                    self.hits += 1
+                    return ImageProbe(**entry)
+            self.misses += 1
+            return None
+
+    def put(self, probe: ImageProbe):
+        with self._lock:
+            self.entries[probe.url] = asdict(probe)
+
+    def save(self):
+        """Write the cache to disk atomically, dropping expired entries."""
+        now = time.time()
+        with self._lock:
+            self.entries = {
+                url: entry for url, entry in self.entries.items()
+                if now - entry['checked_at'] < max(self.ttl, self.error_ttl)
+            }
+            save_json(self.path, self.entries)
+
+
+def make_session(pool_size: int = MAX_WORKERS) -> requests.Session:
+    """Shared-transport session with a connection pool large enough for every worker."""
+    return make_http_session(pool_maxsize=pool_size)
+
+
+def probe_image(url: str, session: requests.Session, timeout: float = PROBE_TIMEOUT) -> ImageProbe:
+    """
+    Probe one image URL with a ranged GET, reading at most PROBE_BYTES.
+
+    Servers that ignore the Range header are cut off after PROBE_BYTES too.
+    """
+    probe = ImageProbe(url=url, checked_at=time.time())
+    if urlparse(url).scheme not in ('http', 'https'):
+        probe.error = "not an http(s) URL"
+        return probe
+
+    try:
+        headers = {'Range': f'bytes=0-{PROBE_BYTES - 1}', 'Accept': 'image/*'}
+        with session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+            probe.status = response.status_code
+            probe.content_type = response.headers.get('Content-Type', '').split(';')[0].strip() or None
+            if response.status_code >= 400:
+                return probe
+            data = bytearray()
+            for chunk in response.iter_content(8192):
+                data += chunk
+                if len(data) >= PROBE_BYTES or image_size(bytes(data)):
+                    break
+        size = image_size(bytes(data))
+        if size is not None:
+            probe.format, probe.width, probe.height = size
+    except requests.exceptions.RequestException as e:
+        probe.error = f"request failed: {type(e).__name__}"
+    return probe
+
+
+def probe_file(url: str, path: Path) -> ImageProbe:
+    """Probe an image already downloaded to a local file."""
+    probe = ImageProbe(url=url, checked_at=time.time(), content_type=mimetypes.guess_type(path.name)[0])
+    with open(path, 'rb') as f:
+        size = image_size(f.read(LOCAL_PROBE_BYTES))
+    if size is not None:
+        probe.format, probe.width, probe.height = size
+    return probe
+
+
+def probe_images(urls, cache: ImageProbeCache | None = None,
+                 image_cache: ImageCache | None = None,
+                 session: requests.Session | None = None,
+                 max_workers: int = MAX_WORKERS,
+                 per_host: int = PER_HOST_LIMIT,
+                 timeout: float = PROBE_TIMEOUT) -> dict[str, ImageProbe]:
+    """
+    Probe image URLs concurrently, skipping ones with a fresh cached result.
+
+    Args:
+        urls: Image URLs (duplicates are probed once)
+        cache: Result cache (optional)
+        image_cache: Downloaded images to read instead of the network (optional)
+        session: Pooled session (optional, one is created)
+        max_workers: Maximum probes at once
+        per_host: Maximum probes at once against the same host
+        timeout: Request timeout in seconds
+
+    Returns:
+        Probe result for every distinct URL (a probe that raised has the
+        exception as its error)
+    """
+    results = {}
+    pending = []
+    for url in dict.fromkeys(u for u in urls if u):
+        cached = cache.get(url) if cache is not None else None
+        local = image_cache.get(url) if cached is None and image_cache is not None else None
+        if cached is not None:
+            results[url] = cached
+        elif local is not None:
+            results[url] = probe_file(url, local)
+            if cache is not None:
+                cache.put(results[url])
+        else:
+            pending.append(url)
+    if not pending:
+        return results
+
+    session = session or make_session(max_workers)
+    host_slots = {}
+    for url in pending:
+        host = urlparse(url).netloc.lower()
+        if host not in host_slots:
+            host_slots[host] = threading.BoundedSemaphore(per_host)
+
+    def run(url: str) -> ImageProbe:
+        with host_slots[urlparse(url).netloc.lower()]:
+            try:
+                return probe_image(url, session, timeout)
+            except Exception as e:
+                # One bad URL or response must not abort the whole run
+                return ImageProbe(url=url, checked_at=time.time(),
+                                  error=f"probe failed: {type(e).__name__}: {e}")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for probe in executor.map(run, pending):
+            results[probe.url] = probe
+            if cache is not None:
+                cache.put(probe)
+    return results
@@ -1,23 +1,49 @@
 #!/usr/bin/env python3
 """
 Insert scraped articles into Supabase
+
+Articles are upserted in batches: each request carries a JSON array of rows
+and PostgREST merges rows whose url already exists. Batches are sent
+concurrently over one pooled session, with a bounded number in flight and a
+retry for batches that fail on the network or with a server error.
 """
 
-import json
+import argparse
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+
 import requests
 
+from article_io import iter_articles, latest_articles_file
+from article_schema import Article
+from date_utils import normalize_date
+from http_session import MAX_RETRY_AFTER, make_session as make_http_session
+
 SUPABASE_URL = "https://jmhtzyctxntaojuovrtf.supabase.co"
 SERVICE_KEY = "nNa-u$-JLY*mgV7"
 
-headers = {
-    "apikey": SERVICE_KEY,
-    "Authorization": f"Bearer {SERVICE_KEY}",
-    "Content-Type": "application/json"
-}
+# Rows per upsert request
+BATCH_SIZE = 500
+
+# Batch requests in flight at once (also the connection pool size)
+MAX_CONCURRENT_BATCHES = 4
+
+# Attempts per batch, and the base delay between them (doubled each retry).
+# A Retry-After header is honoured up to http_session.MAX_RETRY_AFTER seconds.
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 1.0
 
-# Load articles
-with open("scraped_articles.json", "r") as f:
-    articles = json.load(f)
+REQUEST_TIMEOUT = 30
+
+# Unique column PostgREST merges on
+CONFLICT_KEY = "url"
+
+# Statuses worth retrying; other errors would fail the same way again
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
 
 # First, create the articles table if it doesn't exist
 create_table_sql = """
@@ -34,40 +60,192 @@ CREATE TABLE IF NOT EXISTS articles (
 );
 """
 
-# Create table
-resp = requests.post(
-    f"{SUPABASE_URL}/rest/v1/rpc/exec_sql",
-    headers=headers,
-    json={"query": create_table_sql},
-    timeout=30
-)
-print(f"Table creation: {resp.status_code}")
-
-# Insert articles in batches
-inserted = 0
-for article in articles[:20]:  # First 20 for testing
-    payload = {
-        "title": article.get("title", "")[:500],
-        "url": article.get("url", ""),
-        "summary": article.get("summary", "")[:2000],
-        "content": article.get("content", "")[:5000],
-        "source_name": article.get("source_name", ""),
-        "published_at": article.get("published_at"),
-        "status": article.get("status", "published")
+
+def make_session(service_key: str = SERVICE_KEY, pool_size: int = MAX_CONCURRENT_BATCHES) -> requests.Session:
+    """
+    Shared-transport session with auth headers and a connection pool sized
+    for the batch workers. Transport retries are off: upsert_batch retries
+    whole batches itself.
+    """
+    return make_http_session(pool_maxsize=pool_size, retries=0, headers={
+        "apikey": service_key,
+        "Authorization": f"Bearer {service_key}",
+        "Content-Type": "application/json",
+    })
+
+
+def article_row(article: Article) -> dict:
+    """articles table row for an article."""
+    return {
+        "title": article.title[:500],
+        "url": article.link,
+        "summary": article.description[:2000],
+        "content": article.content[:5000],
+        "source_name": article.source,
+        "published_at": normalize_date(article.published),
+        "status": "published",
     }
-    
-    resp = requests.post(
-        f"{SUPABASE_URL}/rest/v1/articles",
-        headers=headers,
-        json=payload,
-        timeout=30
-    )
-    
-    if resp.status_code in [200, 201]:
-        inserted += 1
-    elif resp.status_code == 409:
-        print(f"  Duplicate: {article.get('title', '?')[:50]}")
-    else:
-        print(f"  Error {resp.status_code}: {resp.text[:100]}")
-
-print(f"\nInserted {inserted} articles!")
+
+
+def iter_batches(articles: Iterable[Article], batch_size: int) -> Iterator[list[dict]]:
+    """
+    Rows in batches of batch_size.
+
+    Articles without a link, and repeats of a link already sent, are
+    skipped: PostgREST rejects a batch that hits the same conflict key twice.
+    """
+    seen_urls = set()
+    batch = []
+    for article in articles:
+        if not article.link or article.link in seen_urls:
+            continue
+        seen_urls.add(article.link)
+        batch.append(article_row(article))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def upsert_batch(session: requests.Session, base_url: str, rows: list[dict],
+                 attempts: int = MAX_ATTEMPTS, backoff: float = RETRY_BACKOFF,
+                 timeout: float = REQUEST_TIMEOUT) -> int:
+    """
+    Upsert one batch of rows, retrying transient failures.
+
+    Args:
+        session: Session from make_session()
+        base_url: Supabase (or PostgREST) base URL
+        rows: Rows for the articles table
+        attempts: Maximum number of requests for this batch
+        backoff: Delay before the first retry, doubled for each further one
+            (a Retry-After header overrides it, up to MAX_RETRY_AFTER)
+        timeout: Request timeout in seconds
+
+    Returns:
+        Number of rows upserted
+
+    Raises:
+        requests.RequestException: The batch still failed after all attempts,
+            or failed with a status that retrying won't fix
+    """
+    url = f"{base_url.rstrip('/')}/rest/v1/articles"
+    headers = {"Prefer": "resolution=merge-duplicates,return=minimal"}
+    params = {"on_conflict": CONFLICT_KEY}
+
+    for attempt in range(1, attempts + 1):
+        try:
+            resp = session.post(url, params=params, headers=headers, json=rows, timeout=timeout)
+            if resp.status_code not in RETRY_STATUSES:
+                resp.raise_for_status()
+                return len(rows)
+            error = requests.HTTPError(f"{resp.status_code}: {resp.text[:100]}", response=resp)
+            retry_after = resp.headers.get("Retry-After", "")
+            delay = (min(float(retry_after), MAX_RETRY_AFTER) if retry_after.isdigit()
+                     else backoff * 2 ** (attempt - 1))
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = e
+            delay = backoff * 2 ** (attempt - 1)
+        if attempt < attempts:
+            time.sleep(delay)
+    raise error
+
+
+def import_articles(articles: Iterable[Article], base_url: str = SUPABASE_URL,
+                    session: requests.Session | None = None,
+                    batch_size: int = BATCH_SIZE,
+                    max_concurrent: int = MAX_CONCURRENT_BATCHES,
+                    attempts: int = MAX_ATTEMPTS,
+                    backoff: float = RETRY_BACKOFF) -> tuple[int, int]:
+    """
+    Upsert articles in concurrent batches.
+
+    Batches are built lazily from `articles`; no more than max_concurrent
+    are in flight, so a large input is never fully buffered.
+
+    Returns:
+        (rows upserted, rows in batches that failed)
+    """
+    session = session or make_session(pool_size=max_concurrent)
+    upserted = 0
+    failed = 0
+
+    def collect(done):
+        nonlocal upserted, failed
+        for future in done:
+            rows = pending.pop(future)
+            try:
+                upserted += future.result()
+            except requests.RequestException as e:
+                failed += len(rows)
+                print(f"  Batch of {len(rows)} failed: {e}")
+
+    pending = {}
+    with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
+        for rows in iter_batches(articles, batch_size):
+            if len(pending) >= max_concurrent:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            future = executor.submit(upsert_batch, session, base_url, rows, attempts, backoff)
+            pending[future] = rows
+        collect(wait(pending).done)
+
+    return upserted, failed
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Upsert scraped articles into Supabase")
+    parser.add_argument("path", nargs="?", type=Path, default=None,
+                        help="Scraper output file (default: newest scraped_articles.*)")
+    parser.add_argument("--base-url", default=SUPABASE_URL,
+                        help="Supabase/PostgREST base URL")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help=f"Rows per upsert request (default: {BATCH_SIZE})")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENT_BATCHES,
+                        help=f"Batches in flight at once (default: {MAX_CONCURRENT_BATCHES})")
+    parser.add_argument("--attempts", type=int, default=MAX_ATTEMPTS,
+                        help=f"Attempts per batch (default: {MAX_ATTEMPTS})")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="Only import the first N articles")
+    parser.add_argument("--follow", action="store_true",
+                        help="Import the run the scraper is writing now as its articles "
+                             "arrive (uncompressed NDJSON output)")
+    parser.add_argument("--skip-create-table", action="store_true",
+                        help="Don't run CREATE TABLE IF NOT EXISTS first")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    path = args.path or latest_articles_file(Path("."))
+    session = make_session(pool_size=args.concurrency)
+
+    # Create table
+    if not args.skip_create_table:
+        resp = session.post(
+            f"{args.base_url.rstrip('/')}/rest/v1/rpc/exec_sql",
+            json={"query": create_table_sql},
+            timeout=REQUEST_TIMEOUT
+        )
+        print(f"Table creation: {resp.status_code}")
+
+    articles = iter_articles(path, follow=args.follow)
+    if args.limit is not None:
+        articles = islice(articles, args.limit)
+
+    started = time.monotonic()
+    upserted, failed = import_articles(articles, args.base_url, session, args.batch_size,
+                                       args.concurrency, args.attempts)
+    elapsed = time.monotonic() - started
+
+    print(f"\nUpserted {upserted} articles in {elapsed:.1f}s")
+    if failed:
+        print(f"Failed: {failed} articles")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
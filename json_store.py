@@ -0,0 +1,48 @@
+"""
+JSON state files shared by the caches and scripts.
+Each state file is read whole on start-up (missing or unreadable counts as
+empty) and written back atomically: to a temporary file next to it that is
+then renamed over it, so a crash mid-write never leaves half a file for the
+next run. CACHE_DIR is where those files, and the other caches, live.
+"""
+
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, TextIO
+
+# Default cache directory (shared by the scrapers, ignored by git)
+CACHE_DIR = Path(__file__).parent / ".cache"
+
+
+def load_json(path: Path, default=None):
+    """The JSON document in path, or default ({} if not given) if it is missing or unreadable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {} if default is None else default
+
+
+@contextmanager
+def atomic_write(path: Path) -> Iterator[TextIO]:
+    """
+    Open a text file that replaces path only once the block finishes
+    without error (creating path's directory if needed).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            yield f
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    tmp_path.replace(path)
+
+
+def save_json(path: Path, data, **dump_options):
+    """Write data to path as JSON, atomically. dump_options go to json.dump (e.g. indent)."""
+    with atomic_write(path) as f:
+        json.dump(data, f, **dump_options)
@@ -0,0 +1,54 @@
+"""
+Size-bounded file store with least recently used eviction.
+Shared by the on-disk caches (image_cache.ImageCache and the video
+pipeline's scripts/render_cache.RenderCache): entries are files one directory
+below the store root, a file's mtime is its last use, and once the total size
+passes the limit the least recently used files are deleted first.
+"""
+
+import threading
+from pathlib import Path
+
+
+class LruFileStore:
+    """Directory of <subdirectory>/<file> entries with LRU eviction by total size."""
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.total_bytes = sum(path.stat().st_size for path in self._files())
+
+    def _files(self) -> list[Path]:
+        """Stored files (temporary .part files being written are not entries)."""
+        return [path for path in self.directory.glob('*/*') if not path.name.endswith('.part')]
+
+    def _stored(self, size: int):
+        """Count a newly stored file of size bytes, evicting if that passes max_bytes."""
+        with self._lock:
+            self.total_bytes += size
+            over_limit = self.total_bytes > self.max_bytes
+        if over_limit:
+            self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used files until under max_bytes. Returns the number deleted."""
+        with self._lock:
+            files = []
+            for path in self._files():
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+            self.total_bytes = sum(size for _, size, _ in files)
+
+            removed = 0
+            for _, size, path in sorted(files):
+                if self.total_bytes <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                self.total_bytes -= size
+                removed += 1
+            return removed
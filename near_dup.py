@@ -0,0 +1,140 @@
+"""
+Near-duplicate story clustering.
+Finds articles whose titles are near-identical (the same wire story from
+several outlets, Google News "- Publisher" suffixes, light rewording) using
+MinHash signatures over word shingles and an LSH band index, so the cost is
+roughly linear in the number of articles. Candidate pairs are confirmed with
+an exact Jaccard check before they are merged.
+"""
+
+import dataclasses
+import hashlib
+import re
+import struct
+
+from article_schema import Article
+from text_utils import normalize_title
+
+# MinHash / LSH parameters. With 10 bands of 3 rows, pairs at 0.7 title
+# similarity share a bucket ~98% of the time (0.5: ~74%, 0.2: ~8%);
+# SIMILARITY_THRESHOLD then decides on the exact shingle sets.
+NUM_PERM = 30
+BANDS = 10
+ROWS = NUM_PERM // BANDS
+SIMILARITY_THRESHOLD = 0.5
+
+# Titles with fewer words are left to exact deduplication
+MIN_WORDS = 4
+
+# Cap on comparisons per bucket so generic titles can't go quadratic
+MAX_BUCKET_COMPARISONS = 50
+
+# One 64-byte BLAKE2b digest per shingle, read as NUM_PERM independent
+# 16-bit hash values. Hashing and the per-slot minimum both run in C.
+_unpack_hashes = struct.Struct(f'<{NUM_PERM}H').unpack
+
+# Trailing " - Publisher" / " | Publisher" added by aggregators
+PUBLISHER_SUFFIX_PATTERN = re.compile(r'\s+[-–—|]\s+[^-–—|]{2,40}$')
+
+
+def title_shingles(title: str) -> frozenset[str]:
+    """Word unigrams and bigrams of a title, publisher suffix removed."""
+    title = PUBLISHER_SUFFIX_PATTERN.sub('', title or '')
+    words = normalize_title(title).split()
+    if len(words) < MIN_WORDS:
+        return frozenset()
+    shingles = set(words)
+    shingles.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+    return frozenset(shingles)
+
+
+def minhash(shingles: frozenset[str]) -> tuple[int, ...]:
+    """MinHash signature of a shingle set."""
+    hashes = [
+        _unpack_hashes(hashlib.blake2b(shingle.encode(), digest_size=2 * NUM_PERM).digest())
+        for shingle in shingles
+    ]
+    return tuple(map(min, zip(*hashes)))
+
+
+def jaccard(first: frozenset[str], second: frozenset[str]) -> float:
+    """Exact Jaccard similarity of two shingle sets."""
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def cluster_near_duplicates(titles: list[str],
+                            threshold: float = SIMILARITY_THRESHOLD) -> list[list[int]]:
+    """
+    Group titles that describe the same story.
+
+    Args:
+        titles: Article titles
+        threshold: Minimum Jaccard similarity of title shingles
+
+    Returns:
+        Clusters of indices into `titles`, each in input order, ordered by
+        their first member. Titles without near-duplicates form their own
+        single-member cluster.
+    """
+    parent = list(range(len(titles)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    shingle_sets = [title_shingles(title) for title in titles]
+    buckets = {}
+
+    for i, shingles in enumerate(shingle_sets):
+        if not shingles:
+            continue
+        signature = minhash(shingles)
+        for band in range(BANDS):
+            key = (band, signature[band * ROWS:(band + 1) * ROWS])
+            members = buckets.setdefault(key, [])
+            for j in members[:MAX_BUCKET_COMPARISONS]:
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j and jaccard(shingles, shingle_sets[j]) >= threshold:
+                    # Keep the earliest article as the root
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+            members.append(i)
+
+    clusters = {}
+    for i in range(len(titles)):
+        clusters.setdefault(find(i), []).append(i)
+    return list(clusters.values())
+
+
+def merge_near_duplicates(articles: list[Article],
+                          threshold: float = SIMILARITY_THRESHOLD) -> list[Article]:
+    """
+    Collapse each near-duplicate cluster into its first article.
+
+    The kept (canonical) article gets an "alternate_sources" list with the
+    source, title and link of every other article in its cluster.
+
+    Args:
+        articles: Articles (already exact-deduplicated)
+        threshold: Minimum Jaccard similarity of title shingles
+
+    Returns:
+        One article per story, in input order
+    """
+    merged = []
+    for cluster in cluster_near_duplicates([a.title for a in articles], threshold):
+        canonical = articles[cluster[0]]
+        if len(cluster) > 1:
+            canonical = dataclasses.replace(canonical, alternate_sources=[
+                {
+                    "source": articles[i].source,
+                    "title": articles[i].title,
+                    "link": articles[i].link,
+                }
+                for i in cluster[1:]
+            ])
+        merged.append(canonical)
+    return merged
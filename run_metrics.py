@@ -0,0 +1,216 @@
+"""
+Scrape run instrumentation.
+Collects per-feed timings split by stage (DNS lookup, connecting, waiting
+for the response, downloading the body, XML parsing, field extraction) with
+byte and item counts, plus run-level stage timers and counters. A run is
+exported as a JSON report and in Prometheus text format (for node_exporter's
+textfile collector), and per-feed latencies are kept across runs so slow
+feeds show up as percentiles rather than one-off outliers.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from json_store import CACHE_DIR, atomic_write, load_json, save_json
+
+# Where run reports go, and the per-feed latency history
+METRICS_DIR = CACHE_DIR / "metrics"
+LATENCY_HISTORY_FILE = METRICS_DIR / "feed_latency.json"
+
+# Latencies kept per feed, and the percentiles reported from them
+HISTORY_RUNS = 50
+PERCENTILES = (0.5, 0.9, 0.99)
+
+# Stages of a feed fetch, in order
+FEED_STAGES = ('dns', 'connect', 'wait', 'download', 'parse', 'extract')
+
+METRIC_PREFIX = "sift_scrape"
+
+
+@dataclass(slots=True)
+class FeedMetrics:
+    """
+    Timings and counts for one feed fetch.
+
+    Stages: dns and connect are the host name lookup and TCP connect of a
+    new connection (zero on a reused keep-alive one, see
+    http_session.connection_timings), wait is the rest of the time to the
+    response headers (TLS and server time), download is time spent reading
+    the body, parse is XML parsing and extract is building articles from
+    parsed items. bytes counts the body as sent, before decompression.
+    """
+
+    name: str
+    url: str
+    category: str
+    outcome: str | None = None
+    status: int | None = None
+    parser: str | None = None
+    bytes: int = 0
+    items: int = 0
+    articles: int = 0
+    total: float = 0.0
+    stages: dict[str, float] = field(default_factory=lambda: dict.fromkeys(FEED_STAGES, 0.0))
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def _label(value) -> str:
+    """Prometheus label value, escaped."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class RunMetrics:
+    """Metrics for one scraper run. Feed records may be added from any thread."""
+
+    def __init__(self, job: str = "scrape_rss"):
+        self.job = job
+        self.started_at = time.time()
+        self.feeds = []
+        self.stages = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def add_feed(self, feed: FeedMetrics):
+        with self._lock:
+            self.feeds.append(feed)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block as a run stage (repeated stages add up)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    def count(self, name: str, value: int | float):
+        """Set a run-level counter, e.g. articles after deduplication."""
+        with self._lock:
+            self.counters[name] = value
+
+    def report(self) -> dict:
+        """The run as a JSON-serializable dict."""
+        with self._lock:
+            feeds = [asdict(feed) for feed in self.feeds]
+            stage_totals = dict.fromkeys(FEED_STAGES, 0.0)
+            for feed in self.feeds:
+                for stage, seconds in feed.stages.items():
+                    stage_totals[stage] += seconds
+            return {
+                "job": self.job,
+                "started_at": datetime.fromtimestamp(self.started_at).isoformat(),
+                "duration": time.time() - self.started_at,
+                "stages": dict(self.stages),
+                "counters": dict(self.counters),
+                "feed_stage_totals": stage_totals,
+                "bytes": sum(feed['bytes'] for feed in feeds),
+                "feeds": feeds,
+            }
+
+    def prometheus(self, latency: dict[str, dict[str, float]] | None = None) -> str:
+        """
+        The run in Prometheus text exposition format.
+
+        Args:
+            latency: Per-feed latency percentiles across runs (optional,
+                see LatencyHistory.percentiles)
+        """
+        report = self.report()
+        p = METRIC_PREFIX
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples):
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{_label(val)}"' for key, val in labels.items())
+                lines.append(f"{p}_{name}{{{label_text}}} {value}" if label_text
+                             else f"{p}_{name} {value}")
+
+        job = {"job": self.job}
+        metric("run_timestamp_seconds", "gauge", "Start time of the last run.",
+               [(job, self.started_at)])
+        metric("run_duration_seconds", "gauge", "Wall time of the last run.",
+               [(job, report["duration"])])
+        metric("stage_seconds", "gauge", "Wall time per run stage.",
+               [({**job, "stage": name}, seconds) for name, seconds in report["stages"].items()])
+        metric("count", "gauge", "Run counters (articles per pipeline step, feeds by outcome).",
+               [({**job, "name": name}, value) for name, value in report["counters"].items()])
+
+        feeds = report["feeds"]
+        metric("feed_seconds", "gauge", "Time per feed fetch and stage.",
+               [({**job, "feed": f["name"], "stage": stage}, seconds)
+                for f in feeds for stage, seconds in [("total", f["total"]), *f["stages"].items()]])
+        metric("feed_bytes", "gauge", "Response bytes per feed, before decompression.",
+               [({**job, "feed": f["name"]}, f["bytes"]) for f in feeds])
+        metric("feed_items", "gauge", "Items parsed per feed.",
+               [({**job, "feed": f["name"]}, f["items"]) for f in feeds])
+        metric("feed_articles", "gauge", "Articles built per feed.",
+               [({**job, "feed": f["name"]}, f["articles"]) for f in feeds])
+        metric("feed_up", "gauge", "1 if the feed was fetched or not modified, 0 on error.",
+               [({**job, "feed": f["name"], "outcome": f["outcome"]}, int(f["outcome"] != "error"))
+                for f in feeds])
+        if latency:
+            metric("feed_latency_seconds", "gauge", "Feed fetch time across recent runs.",
+                   [({**job, "feed": name, "quantile": quantile}, seconds)
+                    for name, quantiles in latency.items() for quantile, seconds in quantiles.items()])
+        return '\n'.join(lines) + '\n'
+
+    def write(self, directory: Path = METRICS_DIR,
+              latency: dict[str, dict[str, float]] | None = None) -> tuple[Path, Path]:
+        """
+        Write <job>.json and <job>.prom to a directory (atomically, so a
+        collector never reads half a file).
+
+        Returns:
+            (JSON report path, Prometheus file path)
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        json_path = directory / f"{self.job}.json"
+        prom_path = directory / f"{self.job}.prom"
+        report = self.report()
+        if latency:
+            report["latency_percentiles"] = latency
+        save_json(json_path, report, indent=2)
+        with atomic_write(prom_path) as f:
+            f.write(self.prometheus(latency))
+        return json_path, prom_path
+
+
+class LatencyHistory:
+    """Recent fetch times per feed, kept on disk across runs."""
+
+    def __init__(self, path: Path = LATENCY_HISTORY_FILE, keep: int = HISTORY_RUNS):
+        self.path = Path(path)
+        self.keep = keep
+        self.entries = load_json(self.path)
+
+    def add_run(self, metrics: RunMetrics):
+        """Append this run's fetch times (failed fetches included)."""
+        for feed in metrics.feeds:
+            samples = self.entries.setdefault(feed.name, [])
+            samples.append(round(feed.total, 4))
+            del samples[:-self.keep]
+
+    def percentiles(self) -> dict[str, dict[str, float]]:
+        """{feed: {"0.5": seconds, "0.9": ..., "0.99": ...}} over the kept runs."""
+        return {
+            name: {str(fraction): percentile(samples, fraction) for fraction in PERCENTILES}
+            for name, samples in self.entries.items() if samples
+        }
+
+    def save(self):
+        save_json(self.path, self.entries)
@@ -1,16 +1,30 @@
 #!/usr/bin/env python3
 """
 RSS News Scraper with Image Extraction
-Fetches articles from 30+ tech news sources with featured images.
-Deduplicates by normalized title and saves to JSON.
+Fetches articles from 50+ news sources with featured images. This is the
+project's one scraper engine (scrape_news.py runs it too): each feed is
+parsed by the fastest backend that can handle it (see feed_parsers), dates
+are normalized to UTC while parsing and items older than --since are dropped
+before extraction. Deduplicates by normalized title, clusters near-duplicate
+stories, checks each feed's category against keyword lists and saves to
+JSON, newest first. With --daemon it keeps running instead, polling each
+feed at a rate learned from its items.
 """
 
-import json
-import re
+import argparse
+import dataclasses
 import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
+from functools import lru_cache
 from xml.etree import ElementTree
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
+from urllib.parse import urlparse
 
 try:
     import requests
@@ -18,9 +32,44 @@ except ImportError:
     print("Error: 'requests' library not installed. Run: pip install requests")
     sys.exit(1)
 
+from article_io import NdjsonWriter, write_articles_json
+from article_schema import Article
+from balancer import QuotaBalancer
+from classifier import default_classifier
+from date_utils import format_timestamp, parse_duration, parse_timestamp
+from feed_cache import FeedCache
+from feed_parsers import (AVAILABLE_PARSERS, ETREE, FEEDPARSER, PARSER_CHOICES_FILE, FeedParseError,
+                          ParserChoices, next_parser, parse_with_feedparser)
+from feed_scheduler import ERROR, FETCHED, HOST_MIN_GAP, NOT_MODIFIED, SCHEDULE_FILE, PollScheduler
+from http_session import connection_timings, make_session
+from json_store import CACHE_DIR
+from near_dup import merge_near_duplicates
+from run_metrics import LATENCY_HISTORY_FILE, METRICS_DIR, FeedMetrics, LatencyHistory, RunMetrics
+from seen_index import DEFAULT_TTL_DAYS, SEEN_DB, SeenIndex
+from text_utils import find_image_src, html_to_text, normalize_title
+
 # Output file
 OUTPUT_FILE = Path(__file__).parent / "scraped_articles.json"
 
+# ETag / Last-Modified cache for conditional polling
+CACHE_FILE = CACHE_DIR / "scrape_rss_feeds.json"
+
+# Concurrent fetch limits
+MAX_WORKERS = 16        # Feeds in flight across all hosts
+PER_HOST_LIMIT = 2      # Feeds in flight against a single host
+RUN_DEADLINE = 45.0     # Seconds before unfinished feeds are abandoned
+FETCH_TIMEOUT = 15      # Per-request timeout in seconds
+STREAM_CHUNK_SIZE = 64 * 1024  # Bytes fed to the XML parser at a time
+DESCRIPTION_LIMIT = 1000       # Max characters kept from a description
+FALLBACK_SPOOL_SIZE = 1024 * 1024  # Body bytes kept in memory for a parser fallback
+
+# Feeds listed in the end-of-run latency table
+SLOWEST_FEEDS_SHOWN = 5
+
+# Keyword classification overrides a feed's category only at this confidence
+# (one keyword found only in the description scores 0.75)
+CLASSIFY_MIN_CONFIDENCE = 0.8
+
 # XML Namespaces for Media RSS
 NAMESPACES = {
     'media': 'http://search.yahoo.com/mrss/',
@@ -33,9 +82,13 @@ NAMESPACES = {
 for prefix, uri in NAMESPACES.items():
     ElementTree.register_namespace(prefix, uri)
 
+# Elements that hold one article: RSS <item>, RSS 1.0 (RDF) <item> and Atom <entry>
+ITEM_TAGS = {'item', '{http://purl.org/rss/1.0/}item', '{http://www.w3.org/2005/Atom}entry', 'entry'}
+
 # =============================================================================
 # RSS FEEDS CONFIGURATION
 # Organized by category with all sources from the database + new requested feeds
+# (and the feeds scrape_news.py used to fetch on its own)
 # =============================================================================
 
 FEEDS = {
@@ -50,6 +103,14 @@ FEEDS = {
         ("MIT Technology Review", "https://www.technologyreview.com/feed/"),
         ("BBC Technology", "https://feeds.bbci.co.uk/news/technology/rss.xml"),
         ("Google News Tech", "https://news.google.com/rss/topics/CAAqJggKIiBDQkFTRWdvSUwyMHZNRGRqTVhZU0FtVnVHZ0pWVXlnQVAB"),
+        # Formerly scrape_news.py
+        ("Bloomberg Technology", "https://feeds.bloomberg.com/technology/news.rss"),
+        ("The Atlantic", "https://www.theatlantic.com/feed/channel/technology"),
+        ("Engadget", "https://www.engadget.com/rss.xml"),
+        ("VentureBeat", "https://venturebeat.com/feed/"),
+        ("TechRadar", "https://www.techradar.com/rss/news"),
+        ("CNET", "https://www.cnet.com/rss/news/"),
+        ("Gizmodo", "https://gizmodo.com/rss"),
     ],
     
     # =========================================================================
@@ -127,247 +188,611 @@ FEEDS = {
     ],
 }
 
-# Flatten feeds for easy iteration
+# Flatten feeds for easy iteration; a URL listed under two categories is
+# fetched once, under the first
 ALL_FEEDS = []
+_feed_urls = set()
 for category, feeds in FEEDS.items():
     for name, url in feeds:
-        ALL_FEEDS.append((name, url, category))
+        if url not in _feed_urls:
+            _feed_urls.add(url)
+            ALL_FEEDS.append((name, url, category))
 
 
-def normalize_title(title: str) -> str:
-    """
-    Normalize title for deduplication.
-    - Lowercase
-    - Remove special characters
-    - Collapse whitespace
-    """
-    if not title:
-        return ""
-    title = title.lower().strip()
-    title = re.sub(r'[^a-z0-9\s]', '', title)
-    title = re.sub(r'\s+', ' ', title)
-    return title.strip()
+# Single-pass field extraction (see extract_fields)
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+MEDIA_NS = '{http://search.yahoo.com/mrss/}'
+DC_NS = '{http://purl.org/dc/elements/1.1/}'
+RSS1_NS = '{http://purl.org/rss/1.0/}'
+CONTENT_ENCODED = '{http://purl.org/rss/1.0/modules/content/}encoded'
+ATOM_LINK = ATOM_NS + 'link'
 
+# Direct children of an entry -> field slot (first occurrence wins)
+CHILD_SLOTS = {
+    'title': 'title',
+    RSS1_NS + 'title': 'title',
+    ATOM_NS + 'title': 'atom_title',
+    'link': 'link',
+    RSS1_NS + 'link': 'link',
+    'guid': 'guid',
+    'enclosure': 'enclosure',
+    'description': 'description',
+    RSS1_NS + 'description': 'description',
+    'summary': 'summary',
+    CONTENT_ENCODED: 'content_encoded',
+    ATOM_NS + 'summary': 'atom_summary',
+    ATOM_NS + 'content': 'atom_content',
+    'pubDate': 'pubDate',
+    'published': 'published',
+    ATOM_NS + 'published': 'atom_published',
+    ATOM_NS + 'updated': 'atom_updated',
+    DC_NS + 'date': 'dc_date',
+    'author': 'author',
+    DC_NS + 'creator': 'dc_creator',
+}
 
-def extract_image_url(entry: ElementTree.Element) -> str | None:
+# Elements matched at any depth (like a './/' find())
+DESCENDANT_SLOTS = {
+    MEDIA_NS + 'content': 'media_content',
+    MEDIA_NS + 'thumbnail': 'media_thumbnail',
+    CONTENT_ENCODED: 'any_content_encoded',
+}
+
+# Fallback order for each text field
+IMAGE_HTML_SLOTS = ('description', 'summary', 'content_encoded', 'any_content_encoded')
+DESCRIPTION_SLOTS = ('description', 'summary', 'atom_summary', 'atom_content')
+DATE_SLOTS = ('pubDate', 'published', 'atom_published', 'atom_updated', 'dc_date')
+DATE_TAGS = {tag: slot for tag, slot in CHILD_SLOTS.items() if slot in DATE_SLOTS}
+
+
+def extract_fields(entry: ElementTree.Element) -> dict:
     """
-    Extract featured image URL from RSS entry using multiple methods.
+    Extract title, link, image, description, author and published date in
+    one walk over the entry's children.
     
-    Priority:
-    1. media:content tag (Media RSS)
-    2. media:thumbnail tag
-    3. enclosure with image type
-    4. img tag in description HTML
+    Each child is looked up once in CHILD_SLOTS / DESCENDANT_SLOTS instead
+    of every field running its own find() scans (bench/bench_extract.py
+    compares the two).
     """
+    found = {}
+    atom_links = []
     
-    # Method 1: <media:content> tag
-    media_content = entry.find('.//{http://search.yahoo.com/mrss/}content')
+    for child in entry:
+        tag = child.tag
+        slot = CHILD_SLOTS.get(tag)
+        if slot is not None:
+            found.setdefault(slot, child)
+        elif tag == ATOM_LINK:
+            atom_links.append(child)
+        
+        if len(child):
+            for elem in child.iter():
+                deep_slot = DESCENDANT_SLOTS.get(elem.tag)
+                if deep_slot is not None:
+                    found.setdefault(deep_slot, elem)
+        else:
+            deep_slot = DESCENDANT_SLOTS.get(tag)
+            if deep_slot is not None:
+                found.setdefault(deep_slot, child)
+    
+    # Title
+    title_elem = found.get('title')
+    if title_elem is None:
+        title_elem = found.get('atom_title')
+    title = title_elem.text.strip() if title_elem is not None and title_elem.text else None
+    
+    # Image: media:content, media:thumbnail, enclosure, then <img> in HTML
+    image = None
+    media_content = found.get('media_content')
     if media_content is not None:
         url = media_content.get('url')
         medium = media_content.get('medium', '')
-        mime_type = media_content.get('type', '')
-        if url and (medium == 'image' or 'image' in mime_type or not medium):
-            return url
-    
-    # Method 2: <media:thumbnail> tag
-    media_thumb = entry.find('.//{http://search.yahoo.com/mrss/}thumbnail')
-    if media_thumb is not None:
-        url = media_thumb.get('url')
-        if url:
-            return url
-    
-    # Method 3: <enclosure> with image type
-    enclosure = entry.find('enclosure')
-    if enclosure is not None:
-        url = enclosure.get('url')
-        mime_type = enclosure.get('type', '')
-        if url and 'image' in mime_type.lower():
-            return url
-    
-    # Method 4: Look in description for <img> tag
-    # Try different description element names
-    for desc_tag in ['description', 'summary', '{http://purl.org/rss/1.0/modules/content/}encoded']:
-        desc_elem = entry.find(desc_tag)
-        if desc_elem is not None and desc_elem.text:
-            # Extract first img src
-            img_match = re.search(r'<img[^>]+src=["\']([^"\']+)["\']', desc_elem.text, re.IGNORECASE)
-            if img_match:
-                return img_match.group(1)
-    
-    # Method 5: Check for image in content:encoded
-    content_encoded = entry.find('.//{http://purl.org/rss/1.0/modules/content/}encoded')
-    if content_encoded is not None and content_encoded.text:
-        img_match = re.search(r'<img[^>]+src=["\']([^"\']+)["\']', content_encoded.text, re.IGNORECASE)
-        if img_match:
-            return img_match.group(1)
-    
-    return None
-
-
-def extract_link(entry: ElementTree.Element) -> str | None:
-    """Extract article link from RSS entry."""
-    # Standard RSS <link> tag
-    link = entry.find('link')
-    if link is not None:
-        if link.text:
-            return link.text.strip()
-        # Atom-style link with href attribute
-        href = link.get('href')
-        if href:
-            return href.strip()
-    
-    # Atom feed link with rel="alternate"
-    for link_elem in entry.findall('{http://www.w3.org/2005/Atom}link'):
-        rel = link_elem.get('rel', 'alternate')
-        if rel == 'alternate':
-            href = link_elem.get('href')
-            if href:
-                return href.strip()
-    
-    # guid as fallback (sometimes it's the URL)
-    guid = entry.find('guid')
-    if guid is not None and guid.text and guid.text.startswith('http'):
-        return guid.text.strip()
-    
-    return None
-
-
-def extract_description(entry: ElementTree.Element) -> str | None:
-    """Extract description/summary from RSS entry."""
-    # Try different description element names
-    for desc_tag in ['description', 'summary', '{http://www.w3.org/2005/Atom}summary', 
-                     '{http://www.w3.org/2005/Atom}content']:
-        desc_elem = entry.find(desc_tag)
-        if desc_elem is not None and desc_elem.text:
-            # Strip HTML tags for clean summary
-            text = re.sub(r'<[^>]+>', '', desc_elem.text)
-            text = text.strip()
+        if url and (medium == 'image' or 'image' in media_content.get('type', '') or not medium):
+            image = url
+    if image is None:
+        media_thumb = found.get('media_thumbnail')
+        if media_thumb is not None and media_thumb.get('url'):
+            image = media_thumb.get('url')
+    if image is None:
+        enclosure = found.get('enclosure')
+        if enclosure is not None:
+            url = enclosure.get('url')
+            if url and 'image' in enclosure.get('type', '').lower():
+                image = url
+    if image is None:
+        for slot in IMAGE_HTML_SLOTS:
+            elem = found.get(slot)
+            if elem is None or not elem.text:
+                continue
+            # Usually the same element as content_encoded, already searched
+            if slot == 'any_content_encoded' and elem is found.get('content_encoded'):
+                continue
+            image = find_image_src(elem.text)
+            if image:
+                break
+    
+    # Link: <link>, Atom rel="alternate", then an http guid
+    link = None
+    link_elem = found.get('link')
+    if link_elem is not None:
+        if link_elem.text:
+            link = link_elem.text.strip()
+        elif link_elem.get('href'):
+            link = link_elem.get('href').strip()
+    if link is None:
+        for link_elem in atom_links:
+            if link_elem.get('rel', 'alternate') == 'alternate' and link_elem.get('href'):
+                link = link_elem.get('href').strip()
+                break
+    if link is None:
+        guid = found.get('guid')
+        if guid is not None and guid.text and guid.text.startswith('http'):
+            link = guid.text.strip()
+    
+    # Description
+    description = None
+    for slot in DESCRIPTION_SLOTS:
+        elem = found.get(slot)
+        if elem is not None and elem.text:
+            text = html_to_text(elem.text, limit=DESCRIPTION_LIMIT)
             if text:
-                return text[:1000]  # Limit to 1000 chars
+                description = text
+                break
+    
+    # Published date
+    published = None
+    for slot in DATE_SLOTS:
+        elem = found.get(slot)
+        if elem is not None and elem.text:
+            published = elem.text.strip()
+            break
+    
+    # Author: <author> (plain or with Atom <name>), then dc:creator
+    author = None
+    author_elem = found.get('author')
+    if author_elem is not None:
+        if author_elem.text:
+            author = author_elem.text.strip()
+        else:
+            name = author_elem.find(ATOM_NS + 'name')
+            if name is not None and name.text:
+                author = name.text.strip()
+    if author is None:
+        creator = found.get('dc_creator')
+        if creator is not None and creator.text:
+            author = creator.text.strip()
+    
+    return {
+        "title": title,
+        "link": link,
+        "image": image,
+        "description": description,
+        "author": author,
+        "published": published,
+    }
+
+
+def iter_feed_items(chunks: Iterable[bytes], limit: int | None = None) -> Iterator[ElementTree.Element]:
+    """
+    Incrementally parse a feed, yielding each <item>/<entry> as it closes.
+    
+    Each item is detached from its parent and cleared once the caller has
+    processed it, so memory stays flat regardless of feed size.
+    
+    Args:
+        chunks: Raw XML byte chunks (e.g. response.iter_content())
+        limit: Stop after this many items (None for no limit)
+        
+    Yields:
+        Item elements, in document order
+    """
+    parser = ElementTree.XMLPullParser(events=('start', 'end'))
+    stack = []
+    count = 0
+    
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if event == 'start':
+                stack.append(elem)
+                continue
+            
+            stack.pop()
+            if elem.tag not in ITEM_TAGS:
+                continue
+            
+            yield elem
+            count += 1
+            
+            # Drop the processed item from the tree
+            if stack:
+                stack[-1].remove(elem)
+            elem.clear()
+            
+            if limit is not None and count >= limit:
+                return
     
-    return None
+    parser.close()
 
 
-def extract_published_date(entry: ElementTree.Element) -> str | None:
-    """Extract publication date from RSS entry."""
-    for date_tag in ['pubDate', 'published', '{http://www.w3.org/2005/Atom}published', 
-                     '{http://www.w3.org/2005/Atom}updated', '{http://purl.org/dc/elements/1.1/}date']:
-        date_elem = entry.find(date_tag)
-        if date_elem is not None and date_elem.text:
-            return date_elem.text.strip()
+def item_date(item: ElementTree.Element) -> tuple[str | None, float | None]:
+    """
+    Published date of a feed item, found the way extract_fields() finds it
+    but without extracting anything else.
     
-    return None
+    Returns:
+        (date in canonical UTC form, or the raw text if it isn't a date;
+        UTC epoch seconds, or None)
+    """
+    found = {}
+    for child in item:
+        slot = DATE_TAGS.get(child.tag)
+        if slot is not None:
+            found.setdefault(slot, child)
+    for slot in DATE_SLOTS:
+        elem = found.get(slot)
+        if elem is not None and elem.text:
+            text = elem.text.strip()
+            epoch = parse_timestamp(text)
+            return (text if epoch is None else format_timestamp(epoch)), epoch
+    return None, None
+
 
+def is_stale(article: Article, since: float) -> bool:
+    """Whether an article was published before since (undated articles never are)."""
+    published = parse_timestamp(article.published)
+    return published is not None and published < since
 
-def extract_author(entry: ElementTree.Element) -> str | None:
-    """Extract author from RSS entry."""
-    # Standard author tag
-    author = entry.find('author')
-    if author is not None:
-        if author.text:
-            return author.text.strip()
-        # Atom-style with nested name
-        name = author.find('{http://www.w3.org/2005/Atom}name')
-        if name is not None and name.text:
-            return name.text.strip()
+
+def parse_item(item: ElementTree.Element, name: str, category: str,
+               since: float | None = None) -> Article | None:
+    """
+    Build an article from a feed item.
+    
+    The date is read first, so items published before since are dropped
+    without extracting anything else.
+    
+    Returns:
+        Article, or None if the item has no usable title or is too old
+    """
+    published, published_at = item_date(item)
+    if since is not None and published_at is not None and published_at < since:
+        return None
     
-    # dc:creator
-    creator = entry.find('{http://purl.org/dc/elements/1.1/}creator')
-    if creator is not None and creator.text:
-        return creator.text.strip()
+    fields = extract_fields(item)
+    title = fields["title"]
     
-    return None
+    # Skip invalid titles
+    if not title or title.startswith('<?') or len(title) < 10:
+        return None
+    
+    return Article(
+        title=title,
+        source=name,
+        category=category,
+        link=fields["link"] or "",
+        image=fields["image"],
+        description=fields["description"] or "",
+        author=fields["author"],
+        published=published,
+        scraped_at=datetime.now().isoformat(),
+    )
+
+
+@lru_cache(maxsize=1)
+def feed_session() -> requests.Session:
+    """
+    The session feeds are fetched with. Unlike the shared session it never
+    retries: a retried hung host would outlast the run deadline, and a feed
+    that fails is polled again next run anyway.
+    """
+    return make_session(pool_maxsize=MAX_WORKERS, retries=0)
 
 
-def fetch_feed(name: str, url: str, category: str) -> list[dict]:
+def poll_feed(name: str, url: str, category: str, timeout: float = FETCH_TIMEOUT,
+              cache: FeedCache | None = None, max_items: int | None = None,
+              metrics: RunMetrics | None = None,
+              since: float | None = None,
+              parsers: ParserChoices | None = None,
+              log: Callable[[str], None] = print) -> tuple[list[Article], str]:
     """
-    Fetch and parse a single RSS feed.
+    Fetch and parse a single RSS feed, reporting how the request went.
+    
+    With the etree backend the response body is streamed through
+    iter_feed_items(), so articles are built as each item arrives. A feed
+    etree can't parse is re-parsed from the same response by the next
+    backend (see feed_parsers), and parsers remembers that for later polls.
     
     Args:
         name: Source name (e.g., "TechCrunch")
         url: RSS feed URL
         category: Category for this feed
+        timeout: Request timeout in seconds
+        cache: Validator cache for conditional GET (optional)
+        max_items: Stop reading the feed after this many items (optional)
+        metrics: Run metrics to add this fetch's timings to (optional)
+        since: Drop items published before this UTC epoch time while
+            reading (optional; like max_items, a read filtered this way
+            doesn't replace the cached copy of the feed)
+        parsers: Backend choice per feed (default: fastest backend first,
+            falling back without remembering)
+        log: Where fetch and parse errors are reported
         
     Returns:
-        List of article dictionaries
+        (articles, outcome): outcome is FETCHED, NOT_MODIFIED (articles come
+        from the cache) or ERROR (articles is empty)
     """
+    feed = FeedMetrics(name, url, category)
+    started = time.perf_counter()
+    articles, outcome = _poll_feed(name, url, category, timeout, cache, max_items, since, parsers,
+                                   feed, log)
+    feed.total = time.perf_counter() - started
+    feed.outcome = outcome
+    feed.articles = len(articles)
+    if metrics is not None:
+        metrics.add_feed(feed)
+    return articles, outcome
+
+
+def _poll_feed(name: str, url: str, category: str, timeout: float, cache: FeedCache | None,
+               max_items: int | None, since: float | None, parsers: ParserChoices | None,
+               feed: FeedMetrics, log: Callable[[str], None]) -> tuple[list[Article], str]:
+    """poll_feed() without the bookkeeping; fills in feed's stage timings."""
     articles = []
+    stages = feed.stages
     
     try:
         headers = {
-            'User-Agent': 'SIFT-NewsBot/1.0 (https://sifted-insight.lovable.app)',
             'Accept': 'application/rss+xml, application/atom+xml, application/xml, text/xml',
         }
+        if cache is not None:
+            headers.update(cache.request_headers(url))
         
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        
-        # Parse XML
-        try:
-            root = ElementTree.fromstring(response.content)
-        except ElementTree.ParseError as e:
-            print(f"  XML parse error for {name}: {e}")
-            return []
-        
-        # Find all items (RSS) or entries (Atom)
-        items = root.findall('.//item')
-        if not items:
-            items = root.findall('.//{http://www.w3.org/2005/Atom}entry')
-        if not items:
-            items = root.findall('.//entry')
-        
-        for item in items:
-            # Extract title (required)
-            title_elem = item.find('title')
-            if title_elem is None:
-                title_elem = item.find('{http://www.w3.org/2005/Atom}title')
+        # DNS and connect times are split out of the wait for the headers,
+        # and kept when the request fails
+        started = time.perf_counter()
+        with connection_timings() as timings:
+            try:
+                response = feed_session().get(url, headers=headers, timeout=timeout, stream=True)
+            finally:
+                stages.update(timings)
+                stages['wait'] = time.perf_counter() - started - timings['dns'] - timings['connect']
+        with response:
+            feed.status = response.status_code
+            if response.status_code == 304 and cache is not None:
+                cached = cache.not_modified(url)
+                if cached is not None:
+                    if since is not None:
+                        cached = [article for article in cached if not is_stale(article, since)]
+                    return cached[:max_items], NOT_MODIFIED
+            response.raise_for_status()
             
-            if title_elem is None or not title_elem.text:
-                continue
-            
-            title = title_elem.text.strip()
-            
-            # Skip invalid titles
-            if not title or title.startswith('<?') or len(title) < 10:
-                continue
+            parser = parsers.parser_for(url) if parsers is not None else AVAILABLE_PARSERS[0]
+            # Keep the streamed body only if another backend may need it,
+            # spooled to disk past FALLBACK_SPOOL_SIZE so a large feed
+            # isn't held in memory just in case
+            can_fall_back = parser == ETREE and next_parser(ETREE) is not None and (
+                parsers is None or parsers.forced is None)
+            received = (tempfile.SpooledTemporaryFile(max_size=FALLBACK_SPOOL_SIZE)
+                        if can_fall_back else None)
+            body = response.iter_content(STREAM_CHUNK_SIZE)
             
-            # Extract other fields
-            image_url = extract_image_url(item)
-            link = extract_link(item)
-            description = extract_description(item)
-            published = extract_published_date(item)
-            author = extract_author(item)
+            def chunks() -> Iterator[bytes]:
+                while True:
+                    started = time.perf_counter()
+                    chunk = next(body, None)
+                    stages['download'] += time.perf_counter() - started
+                    if chunk is None:
+                        return
+                    feed.bytes = response.raw.tell()  # as sent, before decompression
+                    if received is not None:
+                        received.write(chunk)
+                    yield chunk
             
-            article = {
-                "title": title,
-                "source": name,
-                "category": category,
-                "link": link,
-                "image": image_url,
-                "description": description,
-                "author": author,
-                "published": published,
-                "scraped_at": datetime.now().isoformat()
-            }
+            # Parse as it downloads; parse time is what the loop spends
+            # outside downloading and article extraction
+            started = time.perf_counter()
+            try:
+                if parser == FEEDPARSER:
+                    articles, feed.items = parse_with_feedparser(
+                        b''.join(chunks()), name, category, DESCRIPTION_LIMIT, since, max_items)
+                else:
+                    for item in iter_feed_items(chunks(), limit=max_items):
+                        feed.items += 1
+                        extract_started = time.perf_counter()
+                        article = parse_item(item, name, category, since)
+                        stages['extract'] += time.perf_counter() - extract_started
+                        if article is not None:
+                            articles.append(article)
+                    if not feed.items and can_fall_back:
+                        # Well-formed, but in a dialect etree doesn't know the items of
+                        raise FeedParseError("no items found")
+            except (ElementTree.ParseError, FeedParseError) as e:
+                fallback = (parsers.fallback(url, parser) if parsers is not None
+                            else next_parser(parser))
+                if fallback != FEEDPARSER or received is None:
+                    log(f"  Parse error for {name}: {e}")
+                    return [], ERROR
+                log(f"  {parser} could not parse {name} ({e}), retrying with {fallback}")
+                parser = fallback
+                for _ in chunks():
+                    pass  # the rest of the body, spooled into received
+                received.seek(0)
+                feed.items = 0
+                try:
+                    articles, feed.items = parse_with_feedparser(
+                        received.read(), name, category, DESCRIPTION_LIMIT, since, max_items)
+                except FeedParseError as e:
+                    log(f"  Parse error for {name}: {e}")
+                    return [], ERROR
+            finally:
+                if received is not None:
+                    received.close()
+                feed.parser = parser
+                stages['parse'] = max(0.0, time.perf_counter() - started
+                                      - stages['download'] - stages['extract'])
             
-            articles.append(article)
+            if cache is not None:
+                # Only a whole, unfiltered feed may replace the cached one
+                cache.store(url, response.headers, feed.bytes, articles,
+                            complete=since is None and (max_items is None or feed.items < max_items))
     
     except requests.exceptions.Timeout:
-        print(f"  Timeout fetching {name}")
+        log(f"  Timeout fetching {name}")
+        return [], ERROR
     except requests.exceptions.RequestException as e:
-        print(f"  Error fetching {name}: {e}")
+        log(f"  Error fetching {name}: {e}")
+        return [], ERROR
     except Exception as e:
-        print(f"  Unexpected error for {name}: {e}")
+        log(f"  Unexpected error for {name}: {e}")
+        return [], ERROR
+    
+    return articles, FETCHED
+
+
+def fetch_feed(name: str, url: str, category: str, timeout: float = FETCH_TIMEOUT,
+               cache: FeedCache | None = None, max_items: int | None = None,
+               metrics: RunMetrics | None = None, since: float | None = None,
+               parsers: ParserChoices | None = None,
+               log: Callable[[str], None] = print) -> list[Article]:
+    """Fetch and parse a single RSS feed (see poll_feed). Returns its articles."""
+    return poll_feed(name, url, category, timeout, cache, max_items, metrics, since, parsers, log)[0]
+
+
+def fetch_all_feeds(feeds: list[tuple[str, str, str]],
+                    max_workers: int = MAX_WORKERS,
+                    per_host: int = PER_HOST_LIMIT,
+                    deadline: float = RUN_DEADLINE,
+                    cache: FeedCache | None = None,
+                    max_items: int | None = None,
+                    balancer: QuotaBalancer | None = None,
+                    metrics: RunMetrics | None = None,
+                    since: float | None = None,
+                    parsers: ParserChoices | None = None) -> list[list[Article]]:
+    """
+    Fetch feeds concurrently with global and per-host limits.
+    
+    Results are returned in the same order as `feeds`, so flattening them
+    gives exactly the list a serial run would produce. Feeds that have not
+    finished when the deadline expires contribute an empty list; their
+    threads run on until the request times out, but print nothing and add
+    nothing to metrics after this returns.
+    
+    With a balancer, feeds are started one at a time as workers free up,
+    always from the category furthest below its fetch goal, and feeds of
+    categories that have collected enough are never fetched.
+    
+    Args:
+        feeds: (name, url, category) tuples
+        max_workers: Maximum feeds fetched at once
+        per_host: Maximum feeds fetched at once from the same host
+        deadline: Seconds allowed for the whole run
+        cache: Validator cache for conditional GET (optional)
+        max_items: Per-feed item limit (optional)
+        balancer: Category quotas deciding fetch order (optional)
+        metrics: Run metrics to add each fetch's timings to (optional)
+        since: Drop items published before this UTC epoch time (optional)
+        parsers: Backend choice per feed (optional, see poll_feed)
+        
+    Returns:
+        One list of articles per feed, in input order
+    """
+    deadline_at = time.monotonic() + deadline
+    host_slots = {}
+    for _, url, _ in feeds:
+        host = urlparse(url).netloc.lower()
+        if host not in host_slots:
+            host_slots[host] = threading.BoundedSemaphore(per_host)
+    
+    # Fetches report through here and record into feed_metrics, which is
+    # copied to metrics when the run ends; abandoned fetches then go quiet
+    abandoned = False
+    reporting = threading.Lock()
+    feed_metrics = RunMetrics() if metrics is not None else None
+    
+    def report(message: str):
+        with reporting:
+            if not abandoned:
+                print(message)
+    
+    def run(name: str, url: str, category: str) -> list[Article]:
+        with host_slots[urlparse(url).netloc.lower()]:
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                report(f"  Skipped {name}: run deadline reached")
+                return []
+            articles = fetch_feed(name, url, category, timeout=min(FETCH_TIMEOUT, remaining),
+                                  cache=cache, max_items=max_items, metrics=feed_metrics,
+                                  since=since, parsers=parsers, log=report)
+        report(f"  {name} ({category}): {len(articles)} articles")
+        return articles
+    
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = {}
+    running = {}
+    pending = list(range(len(feeds)))
+    
+    def start(index: int):
+        future = executor.submit(run, *feeds[index])
+        futures[index] = future
+        running[future] = index
+    
+    if balancer is None:
+        for index in pending:
+            start(index)
+        pending = []
+    
+    timed_out = False
+    while True:
+        # Top up free workers from the categories that are furthest behind
+        while balancer is not None and pending and len(running) < max_workers:
+            choice = balancer.next_feed([feeds[index] for index in pending])
+            if choice is None:
+                break
+            index = pending.pop(choice)
+            balancer.started(feeds[index][2])
+            start(index)
+        if not running:
+            break
+        done, _ = wait(running, timeout=max(0.0, deadline_at - time.monotonic()),
+                       return_when=FIRST_COMPLETED)
+        if not done:
+            timed_out = True
+            break
+        for future in done:
+            index = running.pop(future)
+            if balancer is not None:
+                balancer.finished(feeds[index][2], len(future.result()))
+    executor.shutdown(wait=False, cancel_futures=True)
+    with reporting:
+        abandoned = True
+        if metrics is not None:
+            for feed in list(feed_metrics.feeds):
+                metrics.add_feed(feed)
     
-    return articles
+    results = []
+    for index, (name, _, category) in enumerate(feeds):
+        future = futures.get(index)
+        if future is not None and future.done() and not future.cancelled():
+            results.append(future.result())
+        elif future is None and not timed_out:
+            print(f"  Skipped {name}: {category} quota reached")
+            results.append([])
+        else:
+            print(f"  Deadline exceeded for {name}")
+            results.append([])
+    
+    return results
 
 
-def deduplicate(articles: list[dict]) -> list[dict]:
+def deduplicate(articles: list[Article], near_duplicates: bool = False) -> list[Article]:
     """
     Remove duplicate articles based on normalized title.
     
     Args:
-        articles: List of article dictionaries
+        articles: List of articles
+        near_duplicates: Also merge near-identical titles (see near_dup),
+            recording the merged copies under "alternate_sources"
         
     Returns:
         List of unique articles
@@ -377,8 +802,8 @@ def deduplicate(articles: list[dict]) -> list[dict]:
     unique = []
     
     for article in articles:
-        normalized = normalize_title(article['title'])
-        link = article.get('link', '')
+        normalized = normalize_title(article.title)
+        link = article.link
         
         # Skip if we've seen this title or link
         if normalized and normalized in seen_titles:
@@ -393,20 +818,223 @@ def deduplicate(articles: list[dict]) -> list[dict]:
         
         unique.append(article)
     
+    if near_duplicates:
+        unique = merge_near_duplicates(unique)
+    
     return unique
 
 
-def count_by_category(articles: list[dict]) -> dict[str, int]:
+def sort_newest_first(articles: list[Article]) -> list[Article]:
+    """Articles by publish time, newest first; undated ones follow in their original order."""
+    def key(article: Article) -> tuple[bool, float]:
+        published = parse_timestamp(article.published)
+        return published is None, -(published or 0.0)
+    
+    return sorted(articles, key=key)
+
+
+def since_cutoff(since: str | None) -> float | None:
+    """
+    UTC epoch cutoff for --since: an age (90m, 48h, 7d) counts back from
+    now, anything else is read as a date.
+    
+    Raises:
+        ValueError: since is neither an age nor a date
+    """
+    if since is None:
+        return None
+    age = parse_duration(since)
+    if age is not None:
+        return time.time() - age
+    cutoff = parse_timestamp(since)
+    if cutoff is None:
+        raise ValueError(f"--since: not an age (e.g. 48h) or a date: {since!r}")
+    return cutoff
+
+
+def classify_articles(articles: list[Article],
+                      min_confidence: float = CLASSIFY_MIN_CONFIDENCE) -> tuple[list[Article], int]:
+    """
+    Re-check each article's feed category against its keywords (see classifier).
+    
+    Args:
+        articles: List of articles
+        min_confidence: Confidence needed to replace the feed's category
+        
+    Returns:
+        (articles with categories applied, number whose category changed)
+    """
+    classifier = default_classifier()
+    classified = []
+    changed = 0
+    for article in articles:
+        result = classifier.classify(article.title, article.description, default=article.category)
+        if result.category != article.category and result.confidence >= min_confidence:
+            article = dataclasses.replace(article, category=result.category)
+            changed += 1
+        classified.append(article)
+    return classified, changed
+
+
+def count_by_category(articles: list[Article]) -> dict[str, int]:
     """Count articles by category."""
     counts = {}
     for article in articles:
-        cat = article.get('category', 'unknown')
+        cat = article.category or 'unknown'
         counts[cat] = counts.get(cat, 0) + 1
     return counts
 
 
-def main():
+def default_output_file(output_format: str, compress: bool) -> Path:
+    """Output path for a format: scraped_articles.json or .ndjson[.gz]."""
+    if output_format == "json":
+        return OUTPUT_FILE
+    suffix = ".ndjson.gz" if compress else ".ndjson"
+    return OUTPUT_FILE.with_name(OUTPUT_FILE.stem + suffix)
+
+
+def print_feed_timings(metrics: RunMetrics, latency: dict[str, dict[str, float]],
+                       limit: int = SLOWEST_FEEDS_SHOWN):
+    """Print where fetch time went this run and the slowest feeds across runs."""
+    report = metrics.report()
+    totals = report["feed_stage_totals"]
+    total = sum(totals.values()) or 1.0
+    print("\nFeed time by stage (summed over feeds):")
+    for stage, seconds in totals.items():
+        print(f"  {stage:<9} {seconds:7.2f}s ({seconds / total * 100:.0f}%)")
+    print(f"  {report['bytes'] / 1024:.1f} KB downloaded, "
+          f"{sum(feed.items for feed in metrics.feeds)} items parsed")
+    
+    this_run = {feed.name for feed in metrics.feeds}
+    slowest = sorted((name for name in latency if name in this_run),
+                     key=lambda name: latency[name]["0.9"], reverse=True)[:limit]
+    if slowest:
+        print("Slowest feeds (p50 / p90 / p99 over recent runs):")
+        for name in slowest:
+            q = latency[name]
+            print(f"  {name:<24} {q['0.5']:6.2f}s {q['0.9']:6.2f}s {q['0.99']:6.2f}s")
+
+
+def run_daemon(args: argparse.Namespace) -> int:
+    """
+    Poll feeds continuously, each on its own learned schedule (see
+    feed_scheduler), appending new articles to the NDJSON output as they
+    arrive. Runs until interrupted or --run-for seconds have passed.
+    """
+    cache = None if args.no_cache else FeedCache(CACHE_FILE)
+    parsers = ParserChoices(PARSER_CHOICES_FILE, forced=args.parser)
+    seen_index = SeenIndex(SEEN_DB, ttl_days=args.seen_ttl_days)
+    output_file = args.output or default_output_file("ndjson", args.gzip)
+    
+    def poll(name: str, url: str, category: str) -> tuple[list[Article], str]:
+        return poll_feed(name, url, category, cache=cache, max_items=args.max_items,
+                         since=since_cutoff(args.since), parsers=parsers)
+    
+    def emit(articles: list[Article]) -> int:
+        articles = deduplicate(articles)
+        if not args.no_classify:
+            articles, _ = classify_articles(articles, args.min_confidence)
+        new_articles = seen_index.filter_new(articles)
+        seen_index.mark_seen(articles)
+        return writer.write_many(new_articles)
+    
+    def checkpoint():
+        if cache is not None:
+            cache.save()
+        parsers.save()
+        seen_index.evict_expired()
+    
+    print(f"Polling {len(ALL_FEEDS)} feeds with {args.workers} workers, "
+          f"{args.host_gap:g}s between requests per host")
+    print(f"Appending new articles to {output_file}")
+    print()
+    
+    metadata = {"mode": "daemon", "feeds_scraped": len(ALL_FEEDS)}
+    try:
+        with NdjsonWriter(output_file, metadata) as writer:
+            scheduler = PollScheduler(ALL_FEEDS, poll, emit, SCHEDULE_FILE,
+                                      host_gap=args.host_gap, checkpoint=checkpoint)
+            scheduler.run(duration=args.run_for, max_workers=args.workers)
+    finally:
+        seen_index.close()
+    
+    print()
+    print(f"Scheduler: {scheduler.summary()}")
+    if cache is not None:
+        print(f"Feed cache: {cache.summary()}")
+    return 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="SIFT RSS News Scraper")
+    parser.add_argument("--serial", action="store_true",
+                        help="Fetch feeds one at a time")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS,
+                        help=f"Feeds fetched concurrently (default: {MAX_WORKERS})")
+    parser.add_argument("--per-host", type=int, default=PER_HOST_LIMIT,
+                        help=f"Concurrent feeds per host (default: {PER_HOST_LIMIT})")
+    parser.add_argument("--deadline", type=float, default=RUN_DEADLINE,
+                        help=f"Seconds allowed for all fetches (default: {RUN_DEADLINE:g})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore stored ETag/Last-Modified validators and download every feed")
+    parser.add_argument("--max-items", type=int, default=None,
+                        help="Stop reading each feed after this many items")
+    parser.add_argument("--parser", choices=AVAILABLE_PARSERS, default=None,
+                        help="Parse every feed with this backend (default: fastest first, "
+                             "falling back per feed when it can't parse one)")
+    parser.add_argument("--since", default=None,
+                        help="Drop items published before this, while parsing: an age (90m, 48h, "
+                             "7d) or a date (2026-10-01, RFC 822, ISO 8601). Undated items are kept")
+    parser.add_argument("--no-near-dup", action="store_true",
+                        help="Only drop exact title/link duplicates")
+    parser.add_argument("--target", type=int, default=None,
+                        help="Articles wanted: fetch categories by quota deficit, skip feeds "
+                             "of categories that have enough, and trim output to the target "
+                             "mix (default: no quotas)")
+    parser.add_argument("--no-classify", action="store_true",
+                        help="Keep each feed's category instead of classifying by keywords")
+    parser.add_argument("--min-confidence", type=float, default=CLASSIFY_MIN_CONFIDENCE,
+                        help=f"Classifier confidence needed to change a feed's category "
+                             f"(default: {CLASSIFY_MIN_CONFIDENCE})")
+    parser.add_argument("--new-only", action="store_true",
+                        help="Emit only articles no earlier --new-only run or daemon emitted "
+                             "(give an --output to keep the full scraped_articles.json)")
+    parser.add_argument("--seen-ttl-days", type=float, default=DEFAULT_TTL_DAYS,
+                        help=f"Days an article stays in the seen index after it was last "
+                             f"in a feed (default: {DEFAULT_TTL_DAYS})")
+    parser.add_argument("--format", choices=["json", "ndjson"], default="json",
+                        help="json rewrites scraped_articles.json; ndjson appends one "
+                             "article per line to scraped_articles.ndjson")
+    parser.add_argument("--gzip", action="store_true",
+                        help="Compress ndjson output (scraped_articles.ndjson.gz)")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Write to this file instead of the default for the format")
+    parser.add_argument("--metrics-dir", type=Path, default=METRICS_DIR,
+                        help="Where the run report (scrape_rss.json / .prom) and feed latency "
+                             "history are written (default: .cache/metrics)")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Keep running, polling each feed at its own learned rate and "
+                             "appending new articles to scraped_articles.ndjson")
+    parser.add_argument("--run-for", type=float, default=None,
+                        help="daemon: stop after this many seconds (default: run until interrupted)")
+    parser.add_argument("--host-gap", type=float, default=HOST_MIN_GAP,
+                        help=f"daemon: minimum seconds between requests to one host "
+                             f"(default: {HOST_MIN_GAP:g})")
+    args = parser.parse_args(argv)
+    try:
+        since_cutoff(args.since)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+
+def main(argv: list[str] | None = None):
     """Main function to scrape all RSS feeds."""
+    args = parse_args(argv)
+    if args.daemon:
+        return run_daemon(args)
+    
     print("=" * 60)
     print("SIFT RSS News Scraper")
     print("=" * 60)
@@ -415,24 +1043,96 @@ def main():
     print()
     
     all_articles = []
+    cache = None if args.no_cache else FeedCache(CACHE_FILE)
+    parsers = ParserChoices(PARSER_CHOICES_FILE, forced=args.parser)
+    metrics = RunMetrics()
+    since = since_cutoff(args.since)
+    if since is not None:
+        print(f"Skipping items published before {format_timestamp(since)}")
+    
+    balancer = None
+    if args.target is not None:
+        balancer = QuotaBalancer(args.target)
+        print(f"Target: {args.target} articles ({', '.join(f'{c} {q}' for c, q in balancer.quotas.items())})")
     
     # Scrape each feed
-    for name, url, category in ALL_FEEDS:
-        print(f"Fetching {name} ({category})...")
-        articles = fetch_feed(name, url, category)
-        print(f"  Found {len(articles)} articles")
-        all_articles.extend(articles)
+    with metrics.stage("fetch"):
+        if args.serial:
+            pending = list(ALL_FEEDS)
+            while pending:
+                index = 0 if balancer is None else balancer.next_feed(pending)
+                if index is None:
+                    print(f"Skipped {len(pending)} feeds: category quotas reached")
+                    break
+                name, url, category = pending.pop(index)
+                print(f"Fetching {name} ({category})...")
+                articles = fetch_feed(name, url, category, cache=cache, max_items=args.max_items,
+                                      metrics=metrics, since=since, parsers=parsers)
+                print(f"  Found {len(articles)} articles")
+                if balancer is not None:
+                    balancer.started(category)
+                    balancer.finished(category, len(articles))
+                all_articles.extend(articles)
+        else:
+            print(f"Fetching with {args.workers} workers, {args.per_host} per host, "
+                  f"{args.deadline:g}s deadline...")
+            started = time.monotonic()
+            for articles in fetch_all_feeds(ALL_FEEDS, args.workers, args.per_host, args.deadline,
+                                            cache, args.max_items, balancer, metrics, since, parsers):
+                all_articles.extend(articles)
+            fetched = len(ALL_FEEDS) if balancer is None else balancer.feeds_done
+            print(f"Fetched {fetched} feeds in {time.monotonic() - started:.1f}s")
+    
+    if cache is not None:
+        cache.save()
+        print(f"Feed cache: {cache.summary()}")
+    parsers.save()
+    print(f"Parsers: {parsers.summary()}")
+    if balancer is not None:
+        print(f"Quotas: {balancer.summary()}")
     
     print()
     print("-" * 60)
     
     # Deduplicate
-    unique_articles = deduplicate(all_articles)
+    with metrics.stage("dedup"):
+        unique_articles = deduplicate(all_articles, near_duplicates=not args.no_near_dup)
     duplicates_removed = len(all_articles) - len(unique_articles)
+    merged_stories = sum(1 for a in unique_articles if a.alternate_sources)
     
     print(f"Total articles scraped: {len(all_articles)}")
     print(f"Duplicates removed: {duplicates_removed}")
+    print(f"Stories with alternate sources: {merged_stories}")
     print(f"Unique articles: {len(unique_articles)}")
+    
+    # Keyword classification on top of the feed buckets
+    if not args.no_classify:
+        with metrics.stage("classify"):
+            unique_articles, reclassified = classify_articles(unique_articles, args.min_confidence)
+        print(f"Reclassified by keywords: {reclassified} "
+              f"({metrics.stages['classify']:.2f}s)")
+        metrics.count("articles_reclassified", reclassified)
+    
+    # Newest first, so quota trimming keeps each source's latest stories
+    unique_articles = sort_newest_first(unique_articles)
+    
+    # With --new-only, drop articles already emitted by earlier runs
+    seen_index = None
+    current_articles = unique_articles
+    if args.new_only:
+        with metrics.stage("seen_filter"):
+            seen_index = SeenIndex(SEEN_DB, ttl_days=args.seen_ttl_days)
+            expired = seen_index.evict_expired()
+            unique_articles = seen_index.filter_new(current_articles)
+        print(f"Seen in earlier runs: {len(current_articles) - len(unique_articles)} "
+              f"({expired} expired index keys evicted)")
+        print(f"New articles: {len(unique_articles)}")
+    
+    # Trim to the target mix; held-back articles stay unseen for a later run
+    held_back = []
+    if balancer is not None:
+        unique_articles, held_back = balancer.trim(unique_articles)
+        print(f"Held back over quota: {len(held_back)}")
     print()
     
     # Category breakdown
@@ -443,24 +1143,51 @@ def main():
         print(f"  {cat}: {count} ({pct:.1f}%)")
     
     # Count articles with images
-    with_images = sum(1 for a in unique_articles if a.get('image'))
+    with_images = sum(1 for a in unique_articles if a.image)
     print(f"\nArticles with images: {with_images} ({with_images/len(unique_articles)*100:.1f}%)" if unique_articles else "")
     
-    # Save to JSON
-    output = {
-        "scraped_at": datetime.now().isoformat(),
-        "total_articles": len(unique_articles),
-        "category_counts": category_counts,
-        "feeds_scraped": len(ALL_FEEDS),
-        "articles": unique_articles
-    }
+    # Save output
+    output_file = args.output or default_output_file(args.format, args.gzip)
+    with metrics.stage("write"):
+        if args.format == "ndjson":
+            metadata = {"scraped_at": datetime.now().isoformat(), "feeds_scraped": len(ALL_FEEDS)}
+            with NdjsonWriter(output_file, metadata) as writer:
+                writer.write_many(unique_articles)
+                writer.footer["category_counts"] = category_counts
+        else:
+            metadata = {
+                "scraped_at": datetime.now().isoformat(),
+                "total_articles": len(unique_articles),
+                "category_counts": category_counts,
+                "feeds_scraped": len(ALL_FEEDS),
+            }
+            write_articles_json(output_file, unique_articles, metadata)
+    
+    if seen_index is not None:
+        with metrics.stage("seen_mark"):
+            held_back_ids = set(map(id, held_back))
+            seen_index.mark_seen([a for a in current_articles if id(a) not in held_back_ids])
+            seen_index.close()
     
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    # Run report and per-feed latency across runs
+    outcomes = Counter(feed.outcome for feed in metrics.feeds)
+    for outcome in (FETCHED, NOT_MODIFIED, ERROR):
+        metrics.count(f"feeds_{outcome}", outcomes[outcome])
+    metrics.count("articles_scraped", len(all_articles))
+    metrics.count("articles_unique", len(current_articles))
+    metrics.count("articles_written", len(unique_articles))
+    metrics.count("articles_held_back", len(held_back))
+    history = LatencyHistory(args.metrics_dir / LATENCY_HISTORY_FILE.name)
+    history.add_run(metrics)
+    history.save()
+    latency = history.percentiles()
+    report_path, prom_path = metrics.write(args.metrics_dir, latency)
+    print_feed_timings(metrics, latency)
     
     print()
     print("=" * 60)
-    print(f"Saved to: {OUTPUT_FILE}")
+    print(f"Saved to: {output_file}")
+    print(f"Run report: {report_path} (Prometheus: {prom_path.name})")
     print("=" * 60)
     
     return 0
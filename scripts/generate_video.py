@@ -4,10 +4,14 @@ Auto-Video Pipeline - Generates Codie-style short videos from articles
 Uses: GLM-4.7-Flash + ElevenLabs + ffmpeg
 """
 
-import json
+import argparse
 import os
+import queue
+import subprocess
 import sys
-from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import date, datetime
+from itertools import islice
 from pathlib import Path
 import requests
 
@@ -17,20 +21,54 @@ load_dotenv()
 
 # Paths
 WORKSPACE = Path(__file__).parent.parent
-ARTICLES_FILE = WORKSPACE / "scraped_articles.json"
+sys.path.insert(0, str(WORKSPACE))
+
+from article_io import iter_articles, latest_articles_file
+from http_session import get_session
+from image_cache import ImageCache
+from render_cache import RenderCache
+
+ARTICLES_FILE = latest_articles_file(WORKSPACE)
 OUTPUT_DIR = WORKSPACE / "videos"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
 # GLM Config
-GLM_API_URL = "https://open.bigmodel.cn/api/paas/v4/chat/completions"
+GLM_API_URL = os.getenv("GLM_API_URL", "https://open.bigmodel.cn/api/paas/v4/chat/completions")
 GLM_MODEL = "glm-4.7-flash"  # Use Flash for cost savings
+GLM_TEMPERATURE = 0.7
+GLM_MAX_TOKENS = 200
 
 # ElevenLabs Config
-ELEVENLABS_API_URL = "https://api.elevenlabs.io/v1/text-to-speech"
+ELEVENLABS_API_URL = os.getenv("ELEVENLABS_API_URL", "https://api.elevenlabs.io/v1/text-to-speech")
 ELEVENLABS_VOICE_ID = os.getenv("ELEVENLABS_VOICE_ID", "56AoDkrOh6qfVPDXZ7Pt")
+ELEVENLABS_MODEL_ID = "eleven_monolingual_v1"
+VOICE_SETTINGS = {
+    "stability": 0.5,
+    "similarity_boost": 0.75
+}
+
+# Pipeline sizing: concurrent GLM/ElevenLabs/image requests, ffmpeg processes,
+# and prepared articles allowed to wait for an encoder
+NETWORK_WORKERS = 4
+ENCODE_WORKERS = os.cpu_count() or 2
+PREPARED_QUEUE_SIZE = 4
+
+DEFAULT_ARTICLE_COUNT = 3
 
-def call_glm(prompt):
-    """Call GLM-4.7-Flash for narrative script."""
+# THE DAILY 3 compilation: vertical frame, frame rate and x264 settings.
+# Fast mode trades resolution and size for encode speed.
+COMPILATION_SIZE = (1080, 1920)
+COMPILATION_FPS = 30
+COMPILATION_PRESET = "veryfast"
+COMPILATION_CRF = 23
+FAST_SIZE = (720, 1280)
+FAST_FPS = 15
+FAST_PRESET = "ultrafast"
+FAST_CRF = 28
+
+def call_glm(prompt, post=None):
+    """Call GLM-4.7-Flash for narrative script. `post` is the HTTP call (default: the shared session's; replaceable in tests)."""
+    post = post or get_session().post
     headers = {
         "Authorization": f"Bearer {os.getenv('GLM_API_KEY')}",
         "Content-Type": "application/json"
@@ -38,10 +76,11 @@ def call_glm(prompt):
     data = {
         "model": GLM_MODEL,
         "messages": [{"role": "user", "content": prompt}],
-        "temperature": 0.7,
-        "max_tokens": 200
+        "temperature": GLM_TEMPERATURE,
+        "max_tokens": GLM_MAX_TOKENS
     }
-    response = requests.post(GLM_API_URL, headers=headers, json=data)
+    response = post(GLM_API_URL, headers=headers, json=data, timeout=60)
+    response.raise_for_status()
     return response.json()["choices"][0]["message"]["content"]
 
 def detect_tone(title, summary):
@@ -58,9 +97,9 @@ def detect_tone(title, summary):
     else:
         return "witty"
 
-def generate_script(article):
-    """Generate Codie-style script using GLM."""
-    tone = detect_tone(article["title"], article.get("summary", ""))
+def generate_script(article, render_cache=None, post=None):
+    """Generate Codie-style script using GLM (cached by prompt and model if render_cache is given)."""
+    tone = detect_tone(article.title, article.description)
     
     tone_instructions = {
         "respectful": "Keep it dignified and informative. No humor.",
@@ -77,16 +116,20 @@ Write a SHORT script (2-3 sentences max):
 - Context: Explain the article simply
 - Insight: One interesting takeaway
 
-Article: {article['title']}
-{'Summary: ' + article.get('summary', '')[:200] if article.get('summary') else ''}
+Article: {article.title}
+{'Summary: ' + article.description[:200] if article.description else ''}
 
 Keep it under 50 words. Conversational tone.
 """
     
-    return call_glm(prompt)
+    if render_cache is None:
+        return call_glm(prompt, post)
+    key = (prompt, GLM_MODEL, GLM_TEMPERATURE, GLM_MAX_TOKENS)
+    return render_cache.memoize("script", key, lambda: call_glm(prompt, post).encode()).decode()
 
-def generate_audio(script, output_path, voice_id=ELEVENLABS_VOICE_ID):
-    """Generate TTS audio using ElevenLabs."""
+def request_audio(script, voice_id=ELEVENLABS_VOICE_ID, post=None):
+    """Call ElevenLabs TTS and return the MP3 bytes."""
+    post = post or get_session().post
     headers = {
         "Accept": "audio/mpeg",
         "Content-Type": "application/json",
@@ -94,49 +137,62 @@ def generate_audio(script, output_path, voice_id=ELEVENLABS_VOICE_ID):
     }
     data = {
         "text": script,
-        "model_id": "eleven_monolingual_v1",
-        "voice_settings": {
-            "stability": 0.5,
-            "similarity_boost": 0.75
-        }
+        "model_id": ELEVENLABS_MODEL_ID,
+        "voice_settings": VOICE_SETTINGS
     }
     
-    response = requests.post(
+    response = post(
         f"{ELEVENLABS_API_URL}/{voice_id}",
         headers=headers,
-        json=data
+        json=data,
+        timeout=120
     )
+    response.raise_for_status()
+    return response.content
+
+def generate_audio(script, output_path, voice_id=ELEVENLABS_VOICE_ID, render_cache=None, post=None):
+    """Generate TTS audio using ElevenLabs (cached by text and voice if render_cache is given)."""
+    if render_cache is None:
+        audio = request_audio(script, voice_id, post)
+    else:
+        key = (script, voice_id, ELEVENLABS_MODEL_ID, VOICE_SETTINGS)
+        audio = render_cache.memoize("audio", key, lambda: request_audio(script, voice_id, post))
     
     with open(output_path, "wb") as f:
-        f.write(response.content)
+        f.write(audio)
 
-def download_image(url, output_path):
-    """Download article image or return False."""
+def download_image(url, image_cache):
+    """Article image from the shared image cache (downloaded on first use), or None."""
     if not url:
-        return False
+        print("  Warning: Article has no image")
+        return None
     
     try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code == 200:
-            with open(output_path, "wb") as f:
-                f.write(response.content)
-            return True
-    except:
-        pass
-    return False
+        return image_cache.fetch(url)
+    except (requests.RequestException, ValueError, OSError) as e:
+        print(f"  Warning: Image download failed: {e}")
+        return None
+
+def audio_duration(audio_path):
+    """Duration of an audio file in seconds, from ffprobe."""
+    probe = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "default=noprint_wrappers=1:nokey=1", audio_path],
+        capture_output=True, text=True
+    )
+    return float(probe.stdout.strip())
 
 def create_video(image_path, audio_path, output_path, duration=None):
-    """Create video from image + audio using ffmpeg."""
-    import subprocess
+    """
+    Create video from image + audio using ffmpeg.
     
+    Runs in a worker process, so it only takes paths and returns the output path.
+    
+    Raises:
+        RuntimeError: ffmpeg failed
+    """
     # Get audio duration if not specified
     if not duration:
-        probe = subprocess.run(
-            ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "default=noprint_wrappers=1:nokey=1", audio_path],
-            capture_output=True, text=True
-        )
-        duration = float(probe.stdout.strip())
+        duration = audio_duration(audio_path)
     
     # Build ffmpeg command
     cmd = [
@@ -152,50 +208,225 @@ def create_video(image_path, audio_path, output_path, duration=None):
         output_path
     ]
     
-    subprocess.run(cmd, capture_output=True)
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg exited with {result.returncode}: {result.stderr.strip()[-200:]}")
+    return output_path
+
+def compilation_command(segments, durations, output_path, preset=None, threads=0, fast=False):
+    """
+    ffmpeg command that renders every segment into one video in a single pass.
+    
+    Each (image, audio) segment becomes a still-image input looped for its
+    audio's duration; the filter graph scales and pads every image to the
+    same frame, normalises the audio, and concatenates them all.
+    """
+    width, height = FAST_SIZE if fast else COMPILATION_SIZE
+    fps = FAST_FPS if fast else COMPILATION_FPS
+    
+    cmd = ["ffmpeg", "-y"]
+    filters = []
+    streams = ""
+    for n, ((image_path, audio_path), duration) in enumerate(zip(segments, durations)):
+        cmd += ["-loop", "1", "-framerate", str(fps), "-t", f"{duration:.3f}", "-i", image_path,
+                "-i", audio_path]
+        filters.append(
+            f"[{2 * n}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,format=yuv420p[v{n}]"
+        )
+        filters.append(f"[{2 * n + 1}:a]aresample=44100,aformat=channel_layouts=stereo[a{n}]")
+        streams += f"[v{n}][a{n}]"
+    filters.append(f"{streams}concat=n={len(segments)}:v=1:a=1[v][a]")
+    
+    cmd += [
+        "-filter_complex", ";".join(filters),
+        "-map", "[v]", "-map", "[a]",
+        "-c:v", "libx264",
+        "-preset", preset or (FAST_PRESET if fast else COMPILATION_PRESET),
+        "-tune", "stillimage",
+        "-crf", str(FAST_CRF if fast else COMPILATION_CRF),
+        "-r", str(fps),
+        "-threads", str(threads),
+        "-c:a", "aac",
+        "-b:a", "128k",
+        "-movflags", "+faststart",
+        str(output_path)
+    ]
+    return cmd
+
+def create_compilation(segments, output_path, preset=None, threads=0, fast=False):
+    """
+    Render THE DAILY 3 from (image_path, audio_path) segments with one ffmpeg run.
+    
+    Args:
+        segments: (image_path, audio_path) per story, in order
+        output_path: Video to write
+        preset: x264 preset (default: veryfast, or ultrafast in fast mode)
+        threads: ffmpeg threads (0 lets ffmpeg pick)
+        fast: Smaller frame, lower frame rate and quicker encode
+    
+    Raises:
+        RuntimeError: ffmpeg failed
+    """
+    # Probing is cheap; run the probes side by side
+    with ThreadPoolExecutor() as executor:
+        durations = list(executor.map(audio_duration, [audio for _, audio in segments]))
+    
+    cmd = compilation_command(segments, durations, output_path, preset, threads, fast)
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg exited with {result.returncode}: {result.stderr.strip()[-200:]}")
+    return output_path
+
+def prepare_article(i, article, image_cache, render_cache=None):
+    """
+    Network stage for one article: script, tone, audio and image.
+    
+    Returns:
+        (i, image_path, audio_path) ready for create_video
+    """
+    script = generate_script(article, render_cache)
+    tone = detect_tone(article.title, article.description)
+    
+    audio_path = OUTPUT_DIR / f"audio_{i}.mp3"
+    generate_audio(script, str(audio_path), render_cache=render_cache)
+    
+    # Download image (reused from the cache on re-runs)
+    image_path = download_image(article.image, image_cache)
+    if image_path is None:
+        print(f"  Warning: No image, using placeholder")
+        image_path = OUTPUT_DIR / f"image_{i}.jpg"
+    
+    print(f"[{i}] {article.title[:50]}...")
+    print(f"  Script ({tone}): {script[:80]}...")
+    print(f"  Audio: {audio_path}")
+    return i, str(image_path), str(audio_path)
+
+def run_pipeline(articles, network_workers=NETWORK_WORKERS, encode_workers=ENCODE_WORKERS,
+                 queue_size=PREPARED_QUEUE_SIZE):
+    """
+    Render videos with the network and encode stages overlapping.
+    
+    Script, audio and image requests run in a thread pool and hand finished
+    articles to a bounded queue; ffmpeg encodes run in a process pool. When
+    the encoders fall behind, the queue fills and the network workers wait.
+    
+    Returns:
+        Paths of the videos created, in article order
+    """
+    image_cache = ImageCache()
+    render_cache = RenderCache()
+    prepared = queue.Queue(maxsize=queue_size)
+    date = datetime.now().strftime('%Y-%m-%d')
+    
+    def prepare(i, article):
+        try:
+            job = prepare_article(i, article, image_cache, render_cache)
+        except Exception as e:
+            print(f"[{i}] Failed to prepare {article.title[:50]}: {e}")
+            job = None
+        prepared.put(job)
+    
+    videos = {}
+    
+    def collect(done):
+        for future in done:
+            i = encodes.pop(future)
+            try:
+                videos[i] = future.result()
+                print(f"[{i}] Video: {videos[i]}")
+            except Exception as e:
+                print(f"[{i}] Encode failed: {e}")
+    
+    encodes = {}
+    with ThreadPoolExecutor(network_workers) as network, ProcessPoolExecutor(encode_workers) as encoders:
+        for i, article in enumerate(articles, 1):
+            network.submit(prepare, i, article)
+        
+        for _ in range(len(articles)):
+            job = prepared.get()
+            if job is None:
+                continue
+            if len(encodes) >= encode_workers:
+                done, _ = wait(encodes, return_when=FIRST_COMPLETED)
+                collect(done)
+            i, image_path, audio_path = job
+            video_path = OUTPUT_DIR / f"video_{date}_{i}.mp4"
+            encodes[encoders.submit(create_video, image_path, audio_path, str(video_path))] = i
+        collect(wait(encodes).done)
+    
+    print(f"Images: {image_cache.summary()}")
+    print(f"API cache: {render_cache.summary()}")
+    return [videos[i] for i in sorted(videos)]
 
-def main():
+def render_daily3(articles, network_workers=NETWORK_WORKERS, preset=None, threads=0, fast=False):
+    """
+    Prepare every article concurrently, then render the_daily_3_<date>.mp4 in one pass.
+    
+    Returns:
+        Path of the compilation, or None if no article could be prepared
+    """
+    image_cache = ImageCache()
+    render_cache = RenderCache()
+    
+    def prepare(i, article):
+        try:
+            return prepare_article(i, article, image_cache, render_cache)
+        except Exception as e:
+            print(f"[{i}] Failed to prepare {article.title[:50]}: {e}")
+            return None
+    
+    with ThreadPoolExecutor(network_workers) as network:
+        jobs = [job for job in network.map(prepare, range(1, len(articles) + 1), articles) if job]
+    
+    print(f"Images: {image_cache.summary()}")
+    print(f"API cache: {render_cache.summary()}")
+    if not jobs:
+        return None
+    
+    output_path = OUTPUT_DIR / f"the_daily_3_{date.today()}.mp4"
+    segments = [(image_path, audio_path) for _, image_path, audio_path in jobs]
+    return create_compilation(segments, output_path, preset, threads, fast)
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Generate short videos from scraped articles")
+    parser.add_argument("--limit", type=int, default=DEFAULT_ARTICLE_COUNT,
+                        help=f"Number of top articles to render (default: {DEFAULT_ARTICLE_COUNT})")
+    parser.add_argument("--network-workers", type=int, default=NETWORK_WORKERS,
+                        help=f"Concurrent GLM/ElevenLabs/image requests (default: {NETWORK_WORKERS})")
+    parser.add_argument("--encode-workers", type=int, default=ENCODE_WORKERS,
+                        help=f"Concurrent ffmpeg encodes (default: {ENCODE_WORKERS})")
+    parser.add_argument("--compilation", action="store_true",
+                        help="Render one the_daily_3_<date>.mp4 instead of a clip per article")
+    parser.add_argument("--preset", default=None,
+                        help=f"x264 preset for the compilation (default: {COMPILATION_PRESET}, "
+                             f"{FAST_PRESET} with --fast)")
+    parser.add_argument("--threads", type=int, default=0,
+                        help="ffmpeg threads for the compilation (default: 0 = auto)")
+    parser.add_argument("--fast", action="store_true",
+                        help=f"Quick compilation render: {FAST_SIZE[0]}x{FAST_SIZE[1]} at {FAST_FPS} fps")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main pipeline."""
+    args = parse_args(argv)
     print("=" * 50)
     print("Auto-Video Pipeline")
     print("=" * 50)
     
     # Load articles
-    with open(ARTICLES_FILE, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    
-    articles = data.get("articles", [])[:3]  # Top 3
+    articles = list(islice(iter_articles(ARTICLES_FILE), args.limit))
     
     print(f"Processing {len(articles)} articles...")
-    
-    for i, article in enumerate(articles):
-        print(f"\n[{i+1}] {article['title'][:50]}...")
-        
-        # Generate script
-        script = generate_script(article)
-        print(f"  Script: {script[:80]}...")
-        
-        # Detect tone
-        tone = detect_tone(article["title"], article.get("summary", ""))
-        print(f"  Tone: {tone}")
-        
-        # Generate audio
-        audio_path = OUTPUT_DIR / f"audio_{i+1}.mp3"
-        generate_audio(script, str(audio_path))
-        print(f"  Audio: {audio_path}")
-        
-        # Download image
-        image_path = OUTPUT_DIR / f"image_{i+1}.jpg"
-        if not download_image(article.get("image"), str(image_path)):
-            print(f"  Warning: No image, using placeholder")
-        
-        # Create video
-        video_path = OUTPUT_DIR / f"video_{datetime.now().strftime('%Y-%m-%d')}_{i+1}.mp4"
-        create_video(str(image_path), str(audio_path), str(video_path))
-        print(f"  Video: {video_path}")
+    if args.compilation:
+        video = render_daily3(articles, args.network_workers, args.preset, args.threads, args.fast)
+        videos = [video] if video else []
+    else:
+        videos = run_pipeline(articles, args.network_workers, args.encode_workers)
     
     print("\n" + "=" * 50)
-    print(f"Done! Videos saved to: {OUTPUT_DIR}")
+    print(f"Done! {len(videos)} videos saved to: {OUTPUT_DIR}")
     print("=" * 50)
 
 if __name__ == "__main__":
@@ -0,0 +1,80 @@
+"""
+Persistent cache for the video pipeline's paid API calls.
+GLM scripts and ElevenLabs audio are stored under a SHA-256 of everything
+that determines the result (prompt, model, voice and its settings), so a
+re-run for an article that was already rendered makes no API call. The cache
+is bounded in size and evicts least recently used entries first.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Callable
+
+from json_store import CACHE_DIR
+from lru_store import LruFileStore
+
+# Default location and size limit
+RENDER_CACHE_DIR = CACHE_DIR / "render"
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+
+def cache_key(*parts) -> str:
+    """Hex digest identifying a call by its JSON-serializable inputs."""
+    encoded = json.dumps(parts, sort_keys=True, ensure_ascii=False).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class RenderCache(LruFileStore):
+    """Content-hash keyed store for API results, with LRU eviction by total size."""
+
+    def __init__(self, directory: Path = RENDER_CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES):
+        super().__init__(directory, max_bytes)
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def path_for(self, kind: str, key: str) -> Path:
+        return self.directory / kind / key
+
+    def memoize(self, kind: str, key_parts: tuple, compute: Callable[[], bytes]) -> bytes:
+        """
+        Cached result for a call, running compute() only on a miss.
+
+        Args:
+            kind: Result type, e.g. "script" or "audio" (kept in its own directory)
+            key_parts: Every input that affects the result
+            compute: Makes the real call and returns its result as bytes
+
+        Returns:
+            The cached or freshly computed bytes
+        """
+        path = self.path_for(kind, cache_key(kind, *key_parts))
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            data = None
+        if data is not None:
+            os.utime(path)
+            with self._lock:
+                self.hits[kind] += 1
+            return data
+
+        with self._lock:
+            self.misses[kind] += 1
+        data = compute()
+
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.part")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+        self._stored(len(data))
+        return data
+
+    def summary(self) -> str:
+        """One-line report of hits and misses per result type."""
+        kinds = sorted(set(self.hits) | set(self.misses))
+        counts = ", ".join(f"{kind} {self.hits[kind]} hit / {self.misses[kind]} miss" for kind in kinds)
+        return f"{counts or 'no calls'}; {self.total_bytes / 1024:.1f} KB on disk"
@@ -1,26 +1,58 @@
 #!/usr/bin/env python3
 """
 YouTube Auto-Uploader for THE DAILY 3
+
+Uploads are resumable and sent in chunks. The session URI of an unfinished
+upload is saved, so a run that dies partway through picks up where it
+stopped instead of re-sending the whole file.
 """
 
+import functools
+import http.client
 import os
 import json
+import random
+import sys
+import time
+from datetime import date
 from pathlib import Path
+import httplib2
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaFileUpload
 
 # Paths
 WORKSPACE = Path(__file__).parent.parent
+sys.path.insert(0, str(WORKSPACE))
+
+from json_store import CACHE_DIR, load_json, save_json
+
 ENV_FILE = WORKSPACE / ".env"
 TOKEN_FILE = WORKSPACE / "youtube_token.json"
 CLIENT_SECRETS = WORKSPACE / "youtube_client_secrets.json"
 
+# Resume URIs of unfinished uploads, keyed by file
+UPLOAD_STATE_FILE = CACHE_DIR / "youtube_uploads.json"
+
 # YouTube API scopes
 SCOPES = ["https://www.googleapis.com/auth/youtube.upload"]
 
+# Override the API host, e.g. to point at a local fake of the upload endpoint
+API_ENDPOINT = os.getenv("YOUTUBE_API_ENDPOINT")
+
+# Upload chunk size (must be a multiple of 256 KB)
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# Retry policy for a failed chunk: attempts, and the cap on the random
+# exponential backoff between them
+MAX_RETRIES = 8
+MAX_BACKOFF = 64
+RETRIABLE_STATUS_CODES = {500, 502, 503, 504}
+RETRIABLE_EXCEPTIONS = (httplib2.HttpLib2Error, IOError, http.client.HTTPException)
+
 def get_client_secrets():
     """Get YouTube client secrets from .env."""
     secrets = {}
@@ -52,8 +84,9 @@ def create_client_secrets_file():
     
     return CLIENT_SECRETS
 
+@functools.lru_cache(maxsize=1)
 def get_authenticated_service():
-    """Get authenticated YouTube service."""
+    """Get authenticated YouTube service (built once and reused for every upload)."""
     creds = None
     
     # Load existing credentials
@@ -73,11 +106,111 @@ def get_authenticated_service():
         with open(TOKEN_FILE, "w") as f:
             f.write(creds.to_json())
     
-    return build("youtube", "v3", credentials=creds)
+    client_options = {"api_endpoint": API_ENDPOINT} if API_ENDPOINT else None
+    return build("youtube", "v3", credentials=creds, client_options=client_options)
+
+def load_upload_state():
+    """Saved resume URIs, keyed by upload_key()."""
+    return load_json(UPLOAD_STATE_FILE)
+
+def save_upload_state(state):
+    save_json(UPLOAD_STATE_FILE, state, indent=2)
 
-def upload_video(video_path, title, description, tags=None, category_id="22", privacy_status="public"):
-    """Upload video to YouTube."""
-    youtube = get_authenticated_service()
+def upload_key(video_path):
+    """Identifies a file's contents well enough to resume it: path, size and mtime."""
+    stat = os.stat(video_path)
+    return f"{Path(video_path).resolve()}:{stat.st_size}:{int(stat.st_mtime)}"
+
+def query_upload_progress(request, resumable_uri, total_bytes):
+    """
+    Ask the upload endpoint how much of an earlier upload it has received.
+    
+    Returns:
+        (bytes received, the API response if the upload had already
+        finished, else None)
+    
+    Raises:
+        HttpError: The endpoint refused the query (404/410: the upload
+            session has expired)
+    """
+    headers = {"Content-Range": f"bytes */{total_bytes}", "Content-Length": "0"}
+    resp, content = request.http.request(resumable_uri, "PUT", headers=headers)
+    if resp.status in (200, 201):
+        return total_bytes, request.postproc(resp, content)
+    if resp.status == 308:
+        received = resp.get("range")
+        return (int(received.split("-")[1]) + 1 if received else 0), None
+    raise HttpError(resp, content, uri=resumable_uri)
+
+def run_resumable_upload(request, key, total_bytes):
+    """
+    Send a resumable upload chunk by chunk, retrying failed chunks.
+    
+    The session URI is saved after the first chunk and removed on success.
+    After an error, next_chunk() itself asks the server how much it
+    received and continues from there.
+    
+    Returns:
+        The API response for the finished upload
+    """
+    state = load_upload_state()
+    response = None
+    retry = 0
+    started = time.monotonic()
+    start_progress = None
+    
+    while response is None:
+        error = None
+        try:
+            status, response = request.next_chunk()
+            retry = 0
+            if request.resumable_uri and state.get(key) != request.resumable_uri:
+                state[key] = request.resumable_uri
+                save_upload_state(state)
+            if status:
+                progress = status.resumable_progress
+                if start_progress is None:
+                    start_progress = progress - min(progress, request.resumable.chunksize())
+                rate = (progress - start_progress) / max(time.monotonic() - started, 1e-6)
+                print(f"  {progress / total_bytes:.0%} ({progress / 1e6:.1f}/{total_bytes / 1e6:.1f} MB) "
+                      f"{rate / 1e6:.1f} MB/s")
+        except HttpError as e:
+            if e.resp.status in (404, 410):
+                # Upload session expired; the next run starts over
+                state.pop(key, None)
+                save_upload_state(state)
+                raise
+            if e.resp.status not in RETRIABLE_STATUS_CODES:
+                raise
+            error = f"HTTP {e.resp.status}"
+        except RETRIABLE_EXCEPTIONS as e:
+            error = f"{type(e).__name__}: {e}"
+        
+        if error is not None:
+            retry += 1
+            if retry > MAX_RETRIES:
+                raise RuntimeError(f"Upload failed after {MAX_RETRIES} retries: {error}")
+            delay = random.random() * min(2 ** retry, MAX_BACKOFF)
+            print(f"  {error}; retry {retry}/{MAX_RETRIES} in {delay:.1f}s")
+            time.sleep(delay)
+    
+    elapsed = time.monotonic() - started
+    sent = total_bytes - (start_progress or 0)
+    print(f"  Uploaded {sent / 1e6:.1f} MB in {elapsed:.1f}s ({sent / 1e6 / max(elapsed, 1e-6):.1f} MB/s)")
+    state.pop(key, None)
+    save_upload_state(state)
+    return response
+
+def upload_video(video_path, title, description, tags=None, category_id="22", privacy_status="public",
+                 chunk_size=CHUNK_SIZE, youtube=None):
+    """
+    Upload video to YouTube, resuming an earlier interrupted upload of the same file.
+    
+    Args:
+        chunk_size: Bytes per upload request (multiple of 256 KB)
+        youtube: Service to use (default: the cached authenticated service)
+    """
+    youtube = youtube or get_authenticated_service()
     
     tags = tags or []
     
@@ -97,7 +230,7 @@ def upload_video(video_path, title, description, tags=None, category_id="22", pr
         }
     }
     
-    media = MediaFileUpload(video_path, chunksize=-1, resumable=True)
+    media = MediaFileUpload(video_path, chunksize=chunk_size, resumable=True)
     
     request = youtube.videos().insert(
         part="snippet,status",
@@ -105,20 +238,39 @@ def upload_video(video_path, title, description, tags=None, category_id="22", pr
         media_body=media
     )
     
-    response = request.execute()
+    key = upload_key(video_path)
+    state = load_upload_state()
+    saved_uri = state.get(key)
+    if saved_uri:
+        try:
+            progress, response = query_upload_progress(request, saved_uri, media.size())
+        except HttpError as e:
+            if e.resp.status not in (404, 410):
+                raise
+            print("  Earlier upload expired; starting over")
+            state.pop(key, None)
+            save_upload_state(state)
+        else:
+            if response is not None:
+                state.pop(key, None)
+                save_upload_state(state)
+                return response
+            print(f"  Resuming earlier upload at {progress / 1e6:.1f} MB")
+            request.resumable_uri = saved_uri
+            request.resumable_progress = progress
     
-    return response
+    return run_resumable_upload(request, key, media.size())
 
 def upload_daily3(video_path=None):
     """Upload THE DAILY 3 video."""
     if video_path is None:
-        video_path = WORKSPACE / "videos" / f"the_daily_3_{os.date.today()}.mp4"
+        video_path = WORKSPACE / "videos" / f"the_daily_3_{date.today()}.mp4"
     
     if not Path(video_path).exists():
         print(f"Video not found: {video_path}")
         return None
     
-    date_str = os.date.today().strftime("%B %d, %Y")
+    date_str = date.today().strftime("%B %d, %Y")
     
     title = f"THE DAILY 3 - {date_str}"
     description = f"""Your daily news update for {date_str}.
@@ -143,7 +295,8 @@ Follow for tomorrow's update!
 if __name__ == "__main__":
     import sys
     if len(sys.argv) > 1:
-        video_path = sys.argv[1]
-        upload_daily3(video_path)
+        # Several videos share one authenticated service
+        for video_path in sys.argv[1:]:
+            upload_daily3(video_path)
     else:
         upload_daily3()
@@ -0,0 +1,109 @@
+"""
+Persistent index of articles already emitted by earlier scrape runs.
+Each article is recorded as two 64-bit keys, one for its normalized link and
+one for its normalized title, in a small SQLite table. Keys expire after a
+TTL counted from the last time the article appeared in a feed, so stories
+that stay in a feed stay suppressed while the table stays bounded.
+"""
+
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+
+from article_schema import Article
+from json_store import CACHE_DIR
+from text_utils import normalize_link, normalize_title
+
+# Default database location and retention
+SEEN_DB = CACHE_DIR / "seen_articles.sqlite3"
+DEFAULT_TTL_DAYS = 14
+
+# SQLite limits the number of bound parameters per statement
+QUERY_CHUNK = 500
+
+
+def _key(kind: str, value: str) -> int:
+    """Signed 64-bit hash of a normalized value (SQLite INTEGER range)."""
+    digest = hashlib.blake2b(f"{kind}:{value}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+def article_keys(article: Article) -> list[int]:
+    """
+    Index keys for an article: its link and title, plus those of any
+    alternate sources merged into it by near-duplicate clustering.
+    """
+    keys = []
+    entries = [(article.link, article.title)]
+    entries.extend((alt.get('link'), alt.get('title')) for alt in article.alternate_sources)
+    for link, title in entries:
+        link = normalize_link(link or '')
+        if link:
+            keys.append(_key('link', link))
+        title = normalize_title(title or '')
+        if title:
+            keys.append(_key('title', title))
+    return keys
+
+
+class SeenIndex:
+    """SQLite-backed set of article keys with TTL eviction."""
+
+    def __init__(self, path: Path = SEEN_DB, ttl_days: float = DEFAULT_TTL_DAYS):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_days * 86400
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            " key INTEGER PRIMARY KEY,"
+            " last_seen INTEGER NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS seen_last_seen ON seen (last_seen)")
+
+    def _known(self, keys: list[int]) -> set[int]:
+        """Subset of keys already in the index."""
+        known = set()
+        for start in range(0, len(keys), QUERY_CHUNK):
+            chunk = keys[start:start + QUERY_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(f"SELECT key FROM seen WHERE key IN ({placeholders})", chunk)
+            known.update(key for (key,) in rows)
+        return known
+
+    def filter_new(self, articles: list[Article]) -> list[Article]:
+        """
+        Articles whose link and title have not been seen before.
+
+        Does not modify the index; call mark_seen() once the articles have
+        been written out.
+        """
+        keyed = [(article, article_keys(article)) for article in articles]
+        known = self._known([key for _, keys in keyed for key in keys])
+        return [article for article, keys in keyed if not known.intersection(keys)]
+
+    def mark_seen(self, articles: list[Article]):
+        """Record articles (new or already known) as seen now."""
+        now = int(time.time())
+        rows = [(key, now) for article in articles for key in article_keys(article)]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO seen (key, last_seen) VALUES (?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET last_seen = excluded.last_seen",
+                rows,
+            )
+
+    def evict_expired(self) -> int:
+        """Delete keys not seen within the TTL. Returns the number removed."""
+        cutoff = int(time.time() - self.ttl_seconds)
+        with self.conn:
+            cursor = self.conn.execute("DELETE FROM seen WHERE last_seen < ?", (cutoff,))
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
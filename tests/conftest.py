@@ -0,0 +1,10 @@
+"""
+The scripts are flat modules at the repository root and in scripts/; make
+them importable.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "scripts")]
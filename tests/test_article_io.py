@@ -0,0 +1,56 @@
+import gzip
+import threading
+
+import pytest
+
+from article_io import ALL_RUNS, NdjsonWriter, iter_articles
+from article_schema import Article
+
+
+def write_run(path, *titles, fail=False):
+    try:
+        with NdjsonWriter(path) as writer:
+            for title in titles:
+                writer.write(Article(title=title))
+            if fail:
+                raise RuntimeError("scraper crashed")
+    except RuntimeError:
+        pass
+
+
+def titles(articles):
+    return [article.title for article in articles]
+
+
+@pytest.mark.parametrize("name", ["articles.ndjson", "articles.ndjson.gz"])
+def test_latest_complete_run_is_read_by_default(tmp_path, name):
+    path = tmp_path / name
+    write_run(path, "old one", "old two")
+    write_run(path, "new one", "new two")
+    write_run(path, "partial", fail=True)
+
+    assert titles(iter_articles(path)) == ["new one", "new two"]
+    assert titles(iter_articles(path, run=ALL_RUNS)) == ["old one", "old two", "new one",
+                                                         "new two", "partial"]
+
+
+def test_follow_waits_for_the_run_in_progress(tmp_path):
+    path = tmp_path / "articles.ndjson"
+    write_run(path, "old")
+    writer = NdjsonWriter(path).__enter__()
+    writer.write_many([Article(title="first")])
+
+    def finish():
+        writer.write_many([Article(title="second")])
+        writer.__exit__(None, None, None)
+
+    threading.Timer(0.2, finish).start()
+    assert titles(iter_articles(path, follow=True)) == ["first", "second"]
+
+
+def test_unframed_ndjson_is_read_whole(tmp_path):
+    path = tmp_path / "articles.ndjson.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write('{"title": "one"}\n{"title": "two"}\n')
+
+    assert titles(iter_articles(path)) == ["one", "two"]
@@ -0,0 +1,35 @@
+from article_schema import Article
+from generate_seed import COLUMNS, seed_row, write_copy_seed
+
+
+def test_seed_row_for_sparse_article():
+    article = Article(title="Chipmaker announces a new fabrication plant", description=None,
+                      published="Tue, 06 Oct 2026 14:03:00 +0000")
+
+    row = dict(zip(COLUMNS, seed_row(article)))
+
+    assert row["summary"] == ""
+    assert row["content_text"] == ""
+    assert row["image_url"] == ""
+    assert row["published_at"] == "2026-10-06T14:03:00Z"
+    assert row["slug"] == "chipmaker-announces-a-new-fabrication-plant"
+
+
+def test_write_copy_seed_only_replaces_its_own_files(tmp_path):
+    unrelated = tmp_path / "schema.sql"
+    unrelated.write_text("-- not ours\n")
+    stale_chunk = tmp_path / "01_data_0009.sql"
+    stale_chunk.write_text("-- from a run with more chunks\n")
+    articles = [Article(title=f"Article number {i} about chips", link=f"https://example.com/{i}")
+                for i in range(5)]
+
+    count, _, files = write_copy_seed(articles, tmp_path, chunk_rows=2)
+
+    assert count == 5
+    assert [f.name for f in files] == ["00_stage.sql", "01_data_0001.sql", "01_data_0002.sql",
+                                       "01_data_0003.sql", "99_merge.sql"]
+    assert unrelated.read_text() == "-- not ours\n"
+    assert not stale_chunk.exists()
+    data = "".join(f.read_text() for f in files[1:-1])
+    assert data.count("https://example.com/") == 5
+    assert data.count("\\.\n") == 3
@@ -0,0 +1,92 @@
+import contextlib
+import http.server
+import socket
+import threading
+import time
+
+import pytest
+import requests
+from urllib3.util import connection
+
+import http_session
+from http_session import DNS_CACHE, connection_timings, make_session
+
+TEST_HOST = "feeds.example.test"
+
+
+class OkHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@contextlib.contextmanager
+def local_port():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.server_address[1]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_session_resolves_through_dns_cache_without_patching_urllib3(monkeypatch):
+    lookups = []
+    real_getaddrinfo = socket.getaddrinfo
+
+    def getaddrinfo(host, port, *args, **kwargs):
+        if host == TEST_HOST:
+            lookups.append(host)
+            return real_getaddrinfo("127.0.0.1", port, *args, **kwargs)
+        return real_getaddrinfo(host, port, *args, **kwargs)
+
+    monkeypatch.setattr(http_session.socket, "getaddrinfo", getaddrinfo)
+    create_connection = connection.create_connection
+    with local_port() as port:
+        DNS_CACHE.forget(TEST_HOST, port)
+        # Separate sessions, so the second request opens a new connection
+        for _ in range(2):
+            with make_session() as session:
+                response = session.get(f"http://{TEST_HOST}:{port}/")
+                assert response.text == "ok"
+
+    assert lookups == [TEST_HOST]
+    assert connection.create_connection is create_connection
+
+
+def test_unreachable_cached_address_is_forgotten(monkeypatch):
+    with local_port() as port:
+        pass  # closed again: nothing listens on port any more
+    monkeypatch.setattr(DNS_CACHE, "resolve", lambda host, port: ["127.0.0.1"])
+    forgotten = []
+    monkeypatch.setattr(DNS_CACHE, "forget", lambda host, port: forgotten.append((host, port)))
+
+    with make_session(retries=0) as session, pytest.raises(requests.exceptions.ConnectionError):
+        session.get(f"http://{TEST_HOST}:{port}/")
+    assert forgotten == [(TEST_HOST, port)]
+
+
+def test_connection_timings_split_dns_from_connect(monkeypatch):
+    def slow_resolve(host, port):
+        time.sleep(0.05)
+        return ["127.0.0.1"]
+
+    monkeypatch.setattr(DNS_CACHE, "resolve", slow_resolve)
+    with local_port() as port, make_session() as session:
+        with connection_timings() as first:
+            session.get(f"http://{TEST_HOST}:{port}/")
+        with connection_timings() as reused:
+            session.get(f"http://{TEST_HOST}:{port}/")
+
+    assert first["dns"] >= 0.05
+    assert 0 < first["connect"] < 0.05
+    assert reused == {"dns": 0.0, "connect": 0.0}
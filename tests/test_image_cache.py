@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from image_cache import ImageCache
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+URL = "https://images.example.com/photo"
+
+
+class FakeResponse:
+    def __init__(self, body, content_type):
+        self.body = body
+        self.headers = {"Content-Type": content_type}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        yield self.body
+
+
+class FakeSession:
+    """Serves body; the first `failing` calls raise. Call n waits for gates[n] if there is one."""
+
+    def __init__(self, body=PNG, content_type="image/png", failing=0, gates=()):
+        self.body = body
+        self.content_type = content_type
+        self.failing = failing
+        self.gates = list(gates)
+        self.started = [threading.Event() for _ in self.gates]
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        call = self.calls
+        self.calls += 1
+        if call < len(self.gates):
+            self.started[call].set()
+            self.gates[call].wait()
+        if call < self.failing:
+            raise requests.ConnectionError("reset")
+        return FakeResponse(self.body, self.content_type)
+
+
+def test_octet_stream_image_is_kept_and_html_is_not(tmp_path):
+    images = ImageCache(tmp_path, session=FakeSession(content_type="application/octet-stream"))
+    assert images.fetch(URL).read_bytes() == PNG
+
+    pages = ImageCache(tmp_path / "pages", session=FakeSession(b"<!doctype html>", "text/html"))
+    with pytest.raises(ValueError, match="not an image"):
+        pages.fetch(URL)
+    assert pages.get(URL) is None
+
+
+def test_late_caller_waits_for_the_download_in_progress(tmp_path):
+    gates = [threading.Event(), threading.Event()]
+    session = FakeSession(failing=1, gates=gates)
+    cache = ImageCache(tmp_path, session=session)
+    results = {}
+
+    def fetch(name):
+        try:
+            results[name] = cache.fetch(URL)
+        except requests.ConnectionError:
+            results[name] = None
+
+    threads = {name: threading.Thread(target=fetch, args=(name,)) for name in ("first", "second", "third")}
+    threads["first"].start()
+    session.started[0].wait()
+    threads["second"].start()
+    time.sleep(0.05)  # second waits for first's download
+
+    # First fails and second retries the download; a third caller arrives meanwhile
+    gates[0].set()
+    session.started[1].wait()
+    threads["third"].start()
+    time.sleep(0.05)
+    gates[1].set()
+    for thread in threads.values():
+        thread.join()
+
+    assert session.calls == 2
+    assert results == {"first": None, "second": cache.path_for(URL), "third": cache.path_for(URL)}
+    assert cache._downloads == {}
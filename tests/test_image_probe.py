@@ -0,0 +1,37 @@
+import struct
+
+from image_probe import probe_images
+
+PNG = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR" + struct.pack(">II", 640, 360)
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {"Content-Type": "image/png"}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def iter_content(self, chunk_size):
+        yield PNG
+
+
+class FakeSession:
+    def get(self, url, **kwargs):
+        if "broken" in url:
+            raise UnicodeError("label too long")
+        return FakeResponse()
+
+
+def test_unexpected_error_is_recorded_for_its_url_only():
+    good = "https://images.example.com/good.png"
+    broken = "https://broken.example.com/x.png"
+
+    results = probe_images([good, broken], session=FakeSession())
+
+    assert results[good].problem() is None
+    assert (results[good].width, results[good].height) == (640, 360)
+    assert results[broken].problem() == "probe failed: UnicodeError: label too long"
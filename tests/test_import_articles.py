@@ -0,0 +1,119 @@
+import contextlib
+import http.server
+import json
+import threading
+
+import import_articles as importer
+import scrape_rss
+from article_schema import Article
+from http_session import MAX_RETRY_AFTER
+from import_articles import article_row, import_articles, iter_batches, make_session
+
+ITEM_WITHOUT_DESCRIPTION = b"""<rss><channel><item>
+<title>Chipmaker announces a new fabrication plant</title>
+<link>https://example.com/fab</link>
+<pubDate>Tue, 06 Oct 2026 14:03:00 +0000</pubDate>
+</item></channel></rss>"""
+
+
+def test_article_row_for_item_without_description():
+    item = next(scrape_rss.iter_feed_items([ITEM_WITHOUT_DESCRIPTION]))
+    article = scrape_rss.parse_item(item, "Example", "tech")
+
+    row = article_row(article)
+
+    assert row["summary"] == ""
+    assert row["content"] == ""
+    assert row["url"] == "https://example.com/fab"
+    assert row["published_at"] == "2026-10-06T14:03:00Z"
+
+
+def test_article_row_for_null_description_in_old_output():
+    article = Article.from_dict({"title": "Older scraper output", "url": "https://example.com/old",
+                                 "summary": None})
+
+    assert article_row(article)["summary"] == ""
+
+
+class PostgrestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Records upsert requests; answers each with the next status in statuses
+    (then 201), sending retry_after as Retry-After if it is set.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server.lock:
+            status = self.server.statuses.pop(0) if self.server.statuses else 201
+            self.server.requests.append((self.path, self.headers.get("Prefer"), body, status))
+        self.send_response(status)
+        if self.server.retry_after is not None:
+            self.send_header("Retry-After", self.server.retry_after)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@contextlib.contextmanager
+def postgrest(statuses=(), retry_after=None):
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), PostgrestHandler)
+    server.lock = threading.Lock()
+    server.statuses = list(statuses)
+    server.retry_after = retry_after
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def articles(count):
+    return [Article(title=f"Article number {i} about chips", link=f"https://example.com/{i}")
+            for i in range(count)]
+
+
+def test_iter_batches_skips_articles_without_or_with_repeated_links():
+    rows = [row for batch in iter_batches(articles(5) + articles(3) + [Article(title="No link")], 2)
+            for row in batch]
+
+    assert [row["url"] for row in rows] == [f"https://example.com/{i}" for i in range(5)]
+
+
+def test_batches_are_upserted_on_url_and_retried():
+    with postgrest(statuses=[503]) as (server, base_url):
+        upserted, failed = import_articles(articles(7), base_url, make_session("test-key"),
+                                           batch_size=3, max_concurrent=2, backoff=0)
+
+    assert (upserted, failed) == (7, 0)
+    assert len(server.requests) == 4  # 3 batches, one of them sent twice
+    assert {path for path, *_ in server.requests} == {"/rest/v1/articles?on_conflict=url"}
+    assert {prefer for _, prefer, *_ in server.requests} == {"resolution=merge-duplicates,return=minimal"}
+    stored = [row["url"] for _, _, body, status in server.requests if status == 201 for row in body]
+    assert sorted(stored) == sorted(f"https://example.com/{i}" for i in range(7))
+
+
+def test_batch_rejected_by_the_server_is_counted_as_failed():
+    with postgrest(statuses=[400]) as (server, base_url):
+        upserted, failed = import_articles(articles(4), base_url, make_session("test-key"),
+                                           batch_size=2, max_concurrent=1, backoff=0)
+
+    assert (upserted, failed) == (2, 2)
+    assert len(server.requests) == 2  # a 400 is not retried
+
+
+def test_retry_after_is_capped(monkeypatch):
+    delays = []
+    monkeypatch.setattr(importer.time, "sleep", delays.append)
+    with postgrest(statuses=[429], retry_after="86400") as (server, base_url):
+        upserted, failed = import_articles(articles(2), base_url, make_session("test-key"),
+                                           batch_size=2, max_concurrent=1)
+
+    assert (upserted, failed) == (2, 0)
+    assert delays == [MAX_RETRY_AFTER]
@@ -0,0 +1,24 @@
+import pytest
+
+from json_store import atomic_write, load_json, save_json
+
+
+def test_missing_or_corrupt_file_loads_as_default(tmp_path):
+    corrupt = tmp_path / "corrupt.json"
+    corrupt.write_text('{"half": ')
+
+    assert load_json(tmp_path / "missing.json") == {}
+    assert load_json(corrupt, default=[]) == []
+
+
+def test_failed_write_keeps_the_previous_file(tmp_path):
+    path = tmp_path / "state" / "entries.json"
+    save_json(path, {"kept": 1})
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(path) as f:
+            f.write('{"partial": ')
+            raise RuntimeError("crashed mid-write")
+
+    assert load_json(path) == {"kept": 1}
+    assert [p.name for p in path.parent.iterdir()] == ["entries.json"]
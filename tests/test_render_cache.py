@@ -0,0 +1,36 @@
+import os
+
+from render_cache import RenderCache, cache_key
+
+
+def test_memoize_hits_on_same_inputs(tmp_path):
+    cache = RenderCache(tmp_path)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return b"script text"
+
+    assert cache.memoize("script", ("prompt", "glm-4"), compute) == b"script text"
+    assert cache.memoize("script", ("prompt", "glm-4"), compute) == b"script text"
+    assert len(calls) == 1
+    # A different input is a different entry, and survives a new process
+    assert RenderCache(tmp_path).memoize("script", ("prompt", "glm-5"), compute) == b"script text"
+    assert len(calls) == 2
+    assert cache.hits["script"] == 1
+    assert cache.misses["script"] == 1
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = RenderCache(tmp_path, max_bytes=25)
+    cache.memoize("audio", ("first",), lambda: b"a" * 10)
+    cache.memoize("audio", ("second",), lambda: b"b" * 10)
+    first = cache.path_for("audio", cache_key("audio", "first"))
+    second = cache.path_for("audio", cache_key("audio", "second"))
+    os.utime(second, (1, 1))  # "second" was used long ago, "first" just now
+
+    cache.memoize("audio", ("third",), lambda: b"c" * 10)
+
+    assert first.exists()
+    assert not second.exists()
+    assert cache.total_bytes == 20
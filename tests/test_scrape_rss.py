@@ -0,0 +1,170 @@
+import contextlib
+import gzip
+import http.server
+import socket
+import threading
+import time
+
+import scrape_rss
+from date_utils import parse_timestamp
+from feed_cache import FeedCache
+from feed_parsers import FEEDPARSER, ParserChoices
+from run_metrics import RunMetrics
+from scrape_rss import FETCHED, NOT_MODIFIED
+
+FEED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Example</title>
+<item><title>Newest story about the chip shortage</title><link>https://example.com/1</link>
+<pubDate>Tue, 06 Oct 2026 12:00:00 +0000</pubDate></item>
+<item><title>Middle story about the chip shortage</title><link>https://example.com/2</link>
+<pubDate>Mon, 05 Oct 2026 12:00:00 +0000</pubDate></item>
+<item><title>Oldest story about the chip shortage</title><link>https://example.com/3</link>
+<pubDate>Sun, 04 Oct 2026 12:00:00 +0000</pubDate></item>
+</channel></rss>"""
+
+# RSS 1.0: items and their fields are in the RSS 1.0 namespace
+RDF_FEED = b"""<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/"
+         xmlns:dc="http://purl.org/dc/elements/1.1/">
+<channel rdf:about="https://example.com/"><title>Example</title></channel>
+<item rdf:about="https://example.com/rdf"><title>Story from an RSS 1.0 feed about chips</title>
+<link>https://example.com/rdf</link><description>&lt;p&gt;Fabs &amp;amp; yields&lt;/p&gt;</description>
+<dc:date>2026-10-06T14:03:00+02:00</dc:date></item>
+</rdf:RDF>"""
+
+# RSS 0.90: well-formed, but etree knows none of its elements as items
+RSS090_FEED = b"""<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://my.netscape.com/rdf/simple/0.9/">
+<channel><title>Example</title><link>https://example.com/</link></channel>
+<item><title>Story from an RSS 0.90 feed about chips</title><link>https://example.com/090</link></item>
+</rdf:RDF>"""
+
+ETAG = '"v1"'
+
+
+class FeedHandler(http.server.BaseHTTPRequestHandler):
+    """Serves body with an ETag, and 304 to requests that send it back."""
+
+    protocol_version = "HTTP/1.1"
+    body = FEED
+    content_encoding = None
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("ETag", ETAG)
+        if self.content_encoding:
+            self.send_header("Content-Encoding", self.content_encoding)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@contextlib.contextmanager
+def feed_url(body=FEED, content_encoding=None):
+    handler = type("Handler", (FeedHandler,), {"body": body, "content_encoding": content_encoding})
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/feed.xml"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def links(articles):
+    return [article.link for article in articles]
+
+
+def test_cache_is_not_replaced_by_a_read_filtered_with_since(tmp_path):
+    cache = FeedCache(tmp_path / "feeds.json")
+    since = parse_timestamp("2026-10-05T00:00:00Z")
+    with feed_url() as url:
+        recent, outcome = scrape_rss.poll_feed("Example", url, "tech", cache=cache, since=since)
+        assert outcome == FETCHED
+        assert links(recent) == ["https://example.com/1", "https://example.com/2"]
+        # Old items were dropped while reading, so nothing was cached
+        everything, outcome = scrape_rss.poll_feed("Example", url, "tech", cache=cache)
+        assert outcome == FETCHED
+        assert len(everything) == 3
+
+        recent, outcome = scrape_rss.poll_feed("Example", url, "tech", cache=cache, since=since)
+        assert outcome == NOT_MODIFIED
+        assert links(recent) == ["https://example.com/1", "https://example.com/2"]
+
+
+def test_cache_is_not_replaced_by_a_truncated_read(tmp_path):
+    cache = FeedCache(tmp_path / "feeds.json")
+    with feed_url() as url:
+        first, outcome = scrape_rss.poll_feed("Example", url, "tech", cache=cache, max_items=1)
+        assert outcome == FETCHED
+        assert links(first) == ["https://example.com/1"]
+        # Nothing whole was cached, so this is a full fetch, not a 304
+        everything, outcome = scrape_rss.poll_feed("Example", url, "tech", cache=cache)
+        assert outcome == FETCHED
+        assert len(everything) == 3
+
+        limited, outcome = scrape_rss.poll_feed("Example", url, "tech", cache=cache, max_items=2)
+        assert outcome == NOT_MODIFIED
+        assert links(limited) == ["https://example.com/1", "https://example.com/2"]
+
+
+def test_bytes_are_counted_before_decompression(tmp_path):
+    cache = FeedCache(tmp_path / "feeds.json")
+    metrics = RunMetrics()
+    body = gzip.compress(FEED)
+    with feed_url(body, content_encoding="gzip") as url:
+        articles, outcome = scrape_rss.poll_feed("Example", url, "tech", cache=cache, metrics=metrics)
+
+    assert len(articles) == 3
+    assert metrics.feeds[0].bytes == len(body)
+    assert cache.bytes_downloaded == len(body)
+
+
+def test_rdf_items_are_parsed_by_etree():
+    item = next(scrape_rss.iter_feed_items([RDF_FEED]))
+    article = scrape_rss.parse_item(item, "Example", "tech")
+
+    assert article.title == "Story from an RSS 1.0 feed about chips"
+    assert article.link == "https://example.com/rdf"
+    assert article.description == "Fabs & yields"
+    assert article.published == "2026-10-06T12:03:00Z"
+
+
+def test_feed_without_known_items_falls_back_to_feedparser(tmp_path):
+    parsers = ParserChoices(tmp_path / "parsers.json")
+    with feed_url(RSS090_FEED) as url:
+        articles, outcome = scrape_rss.poll_feed("Example", url, "tech", parsers=parsers)
+
+    assert outcome == FETCHED
+    assert links(articles) == ["https://example.com/090"]
+    assert parsers.parser_for(url) == FEEDPARSER
+    assert parsers.summary() == "feeds on a fallback parser: 1 on feedparser (1 new this run)"
+
+
+def test_fetches_abandoned_at_the_deadline_stay_quiet(capsys, monkeypatch):
+    monkeypatch.setattr(scrape_rss, "FETCH_TIMEOUT", 0.5)
+    metrics = RunMetrics()
+    threads = threading.active_count()
+    # Accepts connections but never answers
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        url = f"http://127.0.0.1:{server.getsockname()[1]}/feed.xml"
+        started = time.monotonic()
+        results = scrape_rss.fetch_all_feeds([("Hung", url, "tech")], deadline=0.2, metrics=metrics)
+        assert time.monotonic() - started < 0.5
+        assert results == [[]]
+        assert capsys.readouterr().out == "  Deadline exceeded for Hung\n"
+
+        time.sleep(0.6)  # the abandoned request times out without retrying
+        assert threading.active_count() == threads
+    assert capsys.readouterr().out == ""
+    assert metrics.feeds == []
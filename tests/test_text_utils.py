@@ -0,0 +1,28 @@
+import html
+
+import pytest
+
+from text_utils import html_to_text
+
+
+@pytest.mark.parametrize("markup", [
+    "Fabs &amp; yields &#8220;up&#8221; 10&nbsp;%",
+    "&amp;lt;p&amp;gt; is escaped markup",
+    "&#38;amp; decodes once",
+    "legacy &ampfoo and &copy 2026",
+    "bare & and && stay",
+])
+def test_entities_decode_like_html_unescape(markup):
+    assert html_to_text(markup) == " ".join(html.unescape(markup).split())
+
+
+def test_tags_comments_and_block_breaks():
+    markup = "<p>First<br>line</p><!-- hidden --><script>x()</script><b>bold</b>&nbsp;end"
+    assert html_to_text(markup) == "First line bold end"
+
+
+def test_limit_on_long_markup():
+    markup = "<p>" + "word &amp; " * 500 + "</p>"
+    text = html_to_text(markup, limit=100)
+    assert len(text) == 100
+    assert text.startswith("word & word & ")
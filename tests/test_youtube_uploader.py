@@ -0,0 +1,81 @@
+import pytest
+
+pytest.importorskip("googleapiclient")
+pytest.importorskip("google_auth_oauthlib")
+
+from googleapiclient.discovery import build  # noqa: E402
+from googleapiclient.http import HttpMockSequence  # noqa: E402
+
+import youtube_uploader  # noqa: E402
+
+CHUNK = 256 * 1024
+SESSION_URI = "https://upload.example.test/session/1"
+
+
+@pytest.fixture
+def video(tmp_path, monkeypatch):
+    monkeypatch.setattr(youtube_uploader, "UPLOAD_STATE_FILE", tmp_path / "uploads.json")
+    monkeypatch.setattr(youtube_uploader.random, "random", lambda: 0.0)
+    path = tmp_path / "video.mp4"
+    path.write_bytes(b"v" * (CHUNK + CHUNK // 2))
+    return path
+
+
+def service(responses):
+    http = HttpMockSequence(responses)
+    return build("youtube", "v3", http=http, static_discovery=True), http
+
+
+def content_ranges(http):
+    return [headers.get("Content-Range") for _, method, _, headers in http.request_sequence
+            if method == "PUT"]
+
+
+def test_failed_chunk_is_retried_from_the_servers_progress(video):
+    size = video.stat().st_size
+    youtube, http = service([
+        ({"status": "200", "location": SESSION_URI}, ""),
+        ({"status": "308", "range": f"bytes=0-{CHUNK - 1}"}, ""),
+        ({"status": "503"}, ""),
+        ({"status": "308", "range": f"bytes=0-{CHUNK - 1}"}, ""),
+        ({"status": "200"}, '{"id": "abc123"}'),
+    ])
+
+    response = youtube_uploader.upload_video(str(video), "Title", "Description",
+                                             chunk_size=CHUNK, youtube=youtube)
+
+    assert response["id"] == "abc123"
+    assert content_ranges(http) == [f"bytes 0-{CHUNK - 1}/{size}", f"bytes {CHUNK}-{size - 1}/{size}",
+                                    f"bytes */{size}", f"bytes {CHUNK}-{size - 1}/{size}"]
+    assert youtube_uploader.load_upload_state() == {}
+
+
+def test_saved_upload_resumes_where_the_server_stopped(video):
+    size = video.stat().st_size
+    youtube_uploader.save_upload_state({youtube_uploader.upload_key(str(video)): SESSION_URI})
+    youtube, http = service([
+        ({"status": "308", "range": f"bytes=0-{CHUNK - 1}"}, ""),
+        ({"status": "200"}, '{"id": "abc123"}'),
+    ])
+
+    response = youtube_uploader.upload_video(str(video), "Title", "Description",
+                                             chunk_size=CHUNK, youtube=youtube)
+
+    assert response["id"] == "abc123"
+    assert [uri for uri, *_ in http.request_sequence] == [SESSION_URI, SESSION_URI]
+    assert content_ranges(http) == [f"bytes */{size}", f"bytes {CHUNK}-{size - 1}/{size}"]
+
+
+def test_expired_saved_upload_starts_over(video):
+    youtube_uploader.save_upload_state({youtube_uploader.upload_key(str(video)): SESSION_URI})
+    youtube, http = service([
+        ({"status": "404"}, ""),
+        ({"status": "200", "location": SESSION_URI + "-new"}, ""),
+        ({"status": "200"}, '{"id": "abc123"}'),
+    ])
+
+    response = youtube_uploader.upload_video(str(video), "Title", "Description",
+                                             chunk_size=2 * CHUNK, youtube=youtube)
+
+    assert response["id"] == "abc123"
+    assert http.request_sequence[-1][0] == SESSION_URI + "-new"
@@ -0,0 +1,160 @@
+"""
+Text processing shared by the scrapers.
+Compiled patterns for title normalization and <img> lookup, plus an
+HTML-to-text converter that decodes entities and CDATA and only converts as
+much markup as it needs to fill the requested length.
+"""
+
+import functools
+import html
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Title normalization
+NON_ALNUM_PATTERN = re.compile(r'[^a-z0-9\s]+')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# First <img src="..."> in an HTML fragment
+IMG_SRC_PATTERN = re.compile(r'<img[^>]+src=["\']([^"\']+)["\']', re.IGNORECASE)
+
+# HTML-to-text passes, applied in order
+CDATA_PATTERN = re.compile(r'<!\[CDATA\[(.*?)(?:\]\]>|$)', re.DOTALL)
+SKIPPED_PATTERN = re.compile(
+    r'<!--.*?(?:-->|$)|<(script|style)\b.*?(?:</\1\s*>|$)',
+    re.DOTALL | re.IGNORECASE,
+)
+BLOCK_TAG_PATTERN = re.compile(
+    r'</?(?:address|article|aside|blockquote|br|dd|div|dl|dt|figcaption|figure|'
+    r'footer|h[1-6]|header|hr|li|ol|p|pre|section|table|td|th|tr|ul)\b[^>]*>',
+    re.IGNORECASE,
+)
+TAG_PATTERN = re.compile(r'</?[A-Za-z][^>]*>|<[!?][^>]*>')
+
+# Character references, matched the same way html.unescape() does. The whole
+# reference is one group, so split() alternates text and references.
+ENTITY_PATTERN = re.compile(r'(&(?:#[0-9]+;?|#[xX][0-9a-fA-F]+;?|[^\t\n\f <&#;]{1,32};?))')
+
+# Query parameters that only track the click, not the article
+TRACKING_PARAM_PATTERN = re.compile(r'^(?:utm_\w+|fbclid|gclid|mc_cid|mc_eid|ocid|cmpid|smid|taid)$', re.IGNORECASE)
+
+# Longest entity name we expect to see, for cutting markup safely
+MAX_ENTITY_LENGTH = 40
+
+
+def normalize_title(title: str) -> str:
+    """
+    Normalize title for deduplication.
+    - Lowercase
+    - Remove special characters
+    - Collapse whitespace
+    """
+    if not title:
+        return ""
+    title = NON_ALNUM_PATTERN.sub('', title.lower())
+    return WHITESPACE_PATTERN.sub(' ', title).strip()
+
+
+def normalize_link(link: str) -> str:
+    """
+    Normalize an article URL for deduplication.
+    - Lowercase scheme and host, drop "www."
+    - Drop fragment, tracking parameters and trailing slash
+    """
+    if not link:
+        return ""
+    parts = urlsplit(link.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = urlencode([
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not TRACKING_PARAM_PATTERN.match(key)
+    ])
+    return urlunsplit((parts.scheme.lower(), host, parts.path.rstrip('/'), query, ''))
+
+
+def find_image_src(markup: str) -> str | None:
+    """Return the src of the first <img> tag in an HTML fragment."""
+    if not markup:
+        return None
+    img_match = IMG_SRC_PATTERN.search(markup)
+    return img_match.group(1) if img_match else None
+
+
+def html_to_text(markup: str, limit: int | None = None) -> str:
+    """
+    Convert an HTML fragment to plain text.
+
+    Comments and script/style blocks are dropped, block-level tags become
+    word breaks, other tags are removed, CDATA content is kept verbatim,
+    entities are decoded and whitespace is collapsed. With a limit, only
+    as much of the markup as is needed to fill it is converted.
+
+    Args:
+        markup: HTML fragment
+        limit: Maximum length of the returned text (optional)
+
+    Returns:
+        Plain text, at most `limit` characters
+    """
+    if not markup:
+        return ""
+    if limit is None:
+        return _convert(markup)
+
+    # Text is never longer than the markup it came from, so convert a
+    # growing prefix until it yields more than `limit` characters.
+    window = max(2 * limit, 256)
+    while window < len(markup):
+        text = _convert(markup[:_safe_cut(markup, window)])
+        if len(text) > limit:
+            return text[:limit]
+        window *= 4
+    return _convert(markup)[:limit]
+
+
+def _safe_cut(markup: str, cut: int) -> int:
+    """Move a cut point back so it does not split a tag or an entity."""
+    tag_open = markup.rfind('<', 0, cut)
+    if tag_open > markup.rfind('>', 0, cut):
+        cut = tag_open
+    amp = markup.rfind('&', max(0, cut - MAX_ENTITY_LENGTH), cut)
+    if amp != -1 and markup.find(';', amp, cut) == -1:
+        cut = amp
+    return cut
+
+
+def _convert(markup: str) -> str:
+    """Convert a complete (or safely cut) HTML fragment to text."""
+    if '<![CDATA[' not in markup:
+        return ' '.join(_strip_markup(markup).split())
+
+    parts = []
+    pos = 0
+    for section in CDATA_PATTERN.finditer(markup):
+        parts.append(_strip_markup(markup[pos:section.start()]))
+        parts.append(section.group(1))
+        pos = section.end()
+    parts.append(_strip_markup(markup[pos:]))
+    return ' '.join(''.join(parts).split())
+
+
+def _strip_markup(markup: str) -> str:
+    """Remove tags and decode entities, leaving whitespace as-is."""
+    if '<' in markup:
+        markup = SKIPPED_PATTERN.sub('', markup)
+        markup = BLOCK_TAG_PATTERN.sub(' ', markup)
+        markup = TAG_PATTERN.sub('', markup)
+    if '&' in markup:
+        # Decoding the split-out references in one map() avoids a Python
+        # callback per match, which is most of the cost on short descriptions
+        parts = ENTITY_PATTERN.split(markup)
+        parts[1::2] = map(_decode_entity, parts[1::2])
+        markup = ''.join(parts)
+    return markup
+
+
+@functools.lru_cache(maxsize=4096)
+def _decode_entity(entity: str) -> str:
+    """Decode one character reference (feeds reuse a small set of them)."""
+    return html.unescape(entity)